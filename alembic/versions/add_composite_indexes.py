@@ -0,0 +1,30 @@
+"""Add composite indexes for per-user listing queries
+
+Revision ID: add_composite_indexes_005
+Revises: add_bm25_indexed_004
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_composite_indexes_005'
+down_revision: Union[str, None] = 'add_bm25_indexed_004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_query_history_user_created', 'query_history', ['user_id', 'created_at'], unique=False)
+    op.create_index('ix_documents_user_uploaded', 'documents', ['user_id', 'uploaded_at'], unique=False)
+    op.create_index('ix_documents_user_status', 'documents', ['user_id', 'status'], unique=False)
+    op.create_index('ix_document_chunks_doc_index', 'document_chunks', ['document_id', 'chunk_index'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_document_chunks_doc_index', table_name='document_chunks')
+    op.drop_index('ix_documents_user_status', table_name='documents')
+    op.drop_index('ix_documents_user_uploaded', table_name='documents')
+    op.drop_index('ix_query_history_user_created', table_name='query_history')
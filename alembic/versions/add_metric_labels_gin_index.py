@@ -0,0 +1,32 @@
+"""Add GIN index on system_metrics.labels
+
+Revision ID: add_metric_labels_gin_006
+Revises: add_composite_indexes_005
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_metric_labels_gin_006'
+down_revision: Union[str, None] = 'add_composite_indexes_005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # jsonb_path_ops only supports @> but is much smaller than the default jsonb_ops
+    op.create_index(
+        'ix_system_metrics_labels_gin',
+        'system_metrics',
+        ['labels'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'labels': 'jsonb_path_ops'}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_system_metrics_labels_gin', table_name='system_metrics')
@@ -0,0 +1,31 @@
+"""Add partial index on live refresh tokens per user
+
+Revision ID: refresh_token_partial_013
+Revises: timestamptz_defaults_012
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'refresh_token_partial_013'
+down_revision: Union[str, None] = 'timestamptz_defaults_012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_refresh_tokens_user_active',
+        'refresh_tokens',
+        ['user_id'],
+        unique=False,
+        postgresql_where=sa.text('is_revoked = false')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_refresh_tokens_user_active', table_name='refresh_tokens')
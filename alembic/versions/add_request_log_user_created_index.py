@@ -0,0 +1,34 @@
+"""Replace request_logs user_id index with covering (user_id, created_at DESC)
+
+Revision ID: add_request_log_covering_007
+Revises: add_metric_labels_gin_006
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_request_log_covering_007'
+down_revision: Union[str, None] = 'add_metric_labels_gin_006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_request_logs_user_created',
+        'request_logs',
+        ['user_id', sa.text('created_at DESC')],
+        unique=False,
+        postgresql_include=['status_code', 'duration_ms', 'endpoint']
+    )
+    # The composite index's leading column covers user_id lookups
+    op.drop_index('idx_request_log_user_id', table_name='request_logs')
+
+
+def downgrade() -> None:
+    op.create_index('idx_request_log_user_id', 'request_logs', ['user_id'], unique=False)
+    op.drop_index('ix_request_logs_user_created', table_name='request_logs')
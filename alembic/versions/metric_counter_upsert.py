@@ -0,0 +1,37 @@
+"""Add labels_hash and counter unique index to system_metrics
+
+Revision ID: metric_counter_upsert_010
+Revises: request_log_ip_inet_009
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'metric_counter_upsert_010'
+down_revision: Union[str, None] = 'request_log_ip_inet_009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        ALTER TABLE system_metrics
+        ADD COLUMN labels_hash bytea
+        GENERATED ALWAYS AS (
+            sha256(convert_to(COALESCE(labels, '{}'::jsonb)::text, 'UTF8'))
+        ) STORED
+    """)
+    # One row per counter series; gauges/histograms remain time series
+    op.execute("""
+        CREATE UNIQUE INDEX uq_system_metrics_counter
+        ON system_metrics (metric_name, labels_hash)
+        WHERE metric_type = 'counter'
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS uq_system_metrics_counter")
+    op.execute("ALTER TABLE system_metrics DROP COLUMN labels_hash")
@@ -0,0 +1,121 @@
+"""Partition request_logs by month on created_at
+
+Revision ID: partition_request_logs_008
+Revises: add_request_log_covering_007
+Create Date: 2026-10-15
+
+Postgres cannot convert a table to a partitioned one in place, so the
+table is recreated and the last 30 days of rows are copied over.
+Later partitions are created by rag.services.log_retention.
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'partition_request_logs_008'
+down_revision: Union[str, None] = 'add_request_log_covering_007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _month_bounds(offset: int):
+    """(name, from, to) of the month offset months from the current one."""
+    today = date.today()
+    index = today.year * 12 + today.month - 1 + offset
+    start = date(index // 12, index % 12 + 1, 1)
+    index += 1
+    end = date(index // 12, index % 12 + 1, 1)
+    return f"request_logs_{start.year:04d}_{start.month:02d}", start, end
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE request_logs RENAME TO request_logs_unpartitioned")
+    op.execute("ALTER TABLE request_logs_unpartitioned RENAME CONSTRAINT request_logs_pkey TO request_logs_unpartitioned_pkey")
+    op.execute("DROP INDEX IF EXISTS idx_request_log_request_id")
+    op.execute("DROP INDEX IF EXISTS idx_request_log_created_at")
+    op.execute("DROP INDEX IF EXISTS idx_request_log_status_code")
+    op.execute("DROP INDEX IF EXISTS ix_request_logs_user_created")
+
+    op.execute("""
+        CREATE TABLE request_logs (
+            id UUID NOT NULL,
+            request_id VARCHAR(36) NOT NULL,
+            endpoint VARCHAR(255) NOT NULL,
+            method VARCHAR(10) NOT NULL,
+            user_id UUID REFERENCES users (id) ON DELETE SET NULL,
+            ip_address VARCHAR(45),
+            status_code INTEGER NOT NULL,
+            duration_ms FLOAT NOT NULL,
+            error_type VARCHAR(50),
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+
+    # Catch-all for rows outside the monthly partitions
+    op.execute("CREATE TABLE request_logs_default PARTITION OF request_logs DEFAULT")
+    for offset in (-1, 0, 1):
+        name, start, end = _month_bounds(offset)
+        op.execute(
+            f"CREATE TABLE {name} PARTITION OF request_logs "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+
+    op.create_index('ix_request_logs_request_id', 'request_logs', ['request_id'], unique=False)
+    op.create_index('ix_request_logs_created_at', 'request_logs', ['created_at'], unique=False)
+    op.create_index('idx_request_log_status_code', 'request_logs', ['status_code'], unique=False)
+    op.execute(
+        "CREATE INDEX ix_request_logs_user_created ON request_logs "
+        "(user_id, created_at DESC) INCLUDE (status_code, duration_ms, endpoint)"
+    )
+
+    op.execute("""
+        INSERT INTO request_logs
+        SELECT id, request_id, endpoint, method, user_id, ip_address,
+               status_code, duration_ms, error_type, created_at
+        FROM request_logs_unpartitioned
+        WHERE created_at >= now() - interval '30 days'
+    """)
+    op.execute("DROP TABLE request_logs_unpartitioned")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE request_logs RENAME TO request_logs_partitioned")
+    op.execute("DROP INDEX IF EXISTS ix_request_logs_request_id")
+    op.execute("DROP INDEX IF EXISTS ix_request_logs_created_at")
+    op.execute("DROP INDEX IF EXISTS idx_request_log_status_code")
+    op.execute("DROP INDEX IF EXISTS ix_request_logs_user_created")
+
+    op.execute("""
+        CREATE TABLE request_logs (
+            id UUID NOT NULL PRIMARY KEY,
+            request_id VARCHAR(36) NOT NULL,
+            endpoint VARCHAR(255) NOT NULL,
+            method VARCHAR(10) NOT NULL,
+            user_id UUID REFERENCES users (id) ON DELETE SET NULL,
+            ip_address VARCHAR(45),
+            status_code INTEGER NOT NULL,
+            duration_ms FLOAT NOT NULL,
+            error_type VARCHAR(50),
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now()
+        )
+    """)
+    op.execute("""
+        INSERT INTO request_logs
+        SELECT DISTINCT ON (request_id) id, request_id, endpoint, method, user_id,
+               ip_address, status_code, duration_ms, error_type, created_at
+        FROM request_logs_partitioned
+        ORDER BY request_id, created_at DESC
+    """)
+    op.execute("DROP TABLE request_logs_partitioned")
+
+    op.create_index('idx_request_log_request_id', 'request_logs', ['request_id'], unique=True)
+    op.create_index('idx_request_log_created_at', 'request_logs', ['created_at'], unique=False)
+    op.create_index('idx_request_log_status_code', 'request_logs', ['status_code'], unique=False)
+    op.execute(
+        "CREATE INDEX ix_request_logs_user_created ON request_logs "
+        "(user_id, created_at DESC) INCLUDE (status_code, duration_ms, endpoint)"
+    )
@@ -0,0 +1,36 @@
+"""Store refresh tokens as SHA-256 digests
+
+Revision ID: refresh_token_hash_014
+Revises: refresh_token_partial_013
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'refresh_token_hash_014'
+down_revision: Union[str, None] = 'refresh_token_partial_013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('refresh_tokens', sa.Column('token_hash', sa.LargeBinary(32), nullable=True))
+    # Same digest as rag.core.security.hash_refresh_token
+    op.execute("UPDATE refresh_tokens SET token_hash = sha256(convert_to(token, 'UTF8'))")
+    op.alter_column('refresh_tokens', 'token_hash', nullable=False)
+    op.create_index('ix_refresh_tokens_token_hash', 'refresh_tokens', ['token_hash'], unique=True)
+    op.drop_index('ix_refresh_tokens_token', table_name='refresh_tokens')
+    op.drop_column('refresh_tokens', 'token')
+
+
+def downgrade() -> None:
+    # Raw tokens cannot be recovered from digests; existing sessions are dropped
+    op.execute("DELETE FROM refresh_tokens")
+    op.add_column('refresh_tokens', sa.Column('token', sa.String(500), nullable=False))
+    op.create_index('ix_refresh_tokens_token', 'refresh_tokens', ['token'], unique=True)
+    op.drop_index('ix_refresh_tokens_token_hash', table_name='refresh_tokens')
+    op.drop_column('refresh_tokens', 'token_hash')
@@ -0,0 +1,42 @@
+"""Store request_logs.ip_address as INET
+
+Revision ID: request_log_ip_inet_009
+Revises: partition_request_logs_008
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'request_log_ip_inet_009'
+down_revision: Union[str, None] = 'partition_request_logs_008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Values that do not look like an address (e.g. 'unknown') become NULL
+    op.alter_column(
+        'request_logs',
+        'ip_address',
+        type_=postgresql.INET(),
+        existing_nullable=True,
+        postgresql_using=(
+            "CASE WHEN ip_address ~ '^[0-9A-Fa-f:.]+$' "
+            "THEN ip_address::inet END"
+        )
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'request_logs',
+        'ip_address',
+        type_=sa.String(45),
+        existing_nullable=True,
+        postgresql_using="host(ip_address)"
+    )
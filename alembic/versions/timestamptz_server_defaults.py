@@ -0,0 +1,46 @@
+"""Store creation timestamps as timestamptz with now() server defaults
+
+Revision ID: timestamptz_defaults_012
+Revises: user_namespace_default_011
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'timestamptz_defaults_012'
+down_revision: Union[str, None] = 'user_namespace_default_011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# request_logs.created_at is left alone: it is the partition key
+COLUMNS = [
+    ('users', 'created_at'),
+    ('users', 'updated_at'),
+    ('refresh_tokens', 'created_at'),
+    ('system_metrics', 'recorded_at'),
+]
+
+
+def upgrade() -> None:
+    for table, column in COLUMNS:
+        # Existing values were written with datetime.utcnow()
+        op.execute(f"""
+            ALTER TABLE {table}
+            ALTER COLUMN {column} TYPE timestamptz USING {column} AT TIME ZONE 'UTC',
+            ALTER COLUMN {column} SET DEFAULT now()
+        """)
+        op.execute(f"UPDATE {table} SET {column} = now() WHERE {column} IS NULL")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET NOT NULL")
+
+
+def downgrade() -> None:
+    for table, column in COLUMNS:
+        op.execute(f"""
+            ALTER TABLE {table}
+            ALTER COLUMN {column} DROP DEFAULT,
+            ALTER COLUMN {column} DROP NOT NULL,
+            ALTER COLUMN {column} TYPE timestamp USING {column} AT TIME ZONE 'UTC'
+        """)
@@ -0,0 +1,41 @@
+"""Generate users.pinecone_namespace with a server default
+
+Revision ID: user_namespace_default_011
+Revises: metric_counter_upsert_010
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'user_namespace_default_011'
+down_revision: Union[str, None] = 'metric_counter_upsert_010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # gen_random_uuid() is built in from Postgres 13; pgcrypto provides it before that
+    op.execute("CREATE EXTENSION IF NOT EXISTS pgcrypto")
+    op.alter_column(
+        'users',
+        'pinecone_namespace',
+        existing_type=sa.String(100),
+        existing_nullable=False,
+        server_default=sa.text(
+            "('user_' || substr(replace(gen_random_uuid()::text, '-', ''), 1, 12))"
+        )
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'users',
+        'pinecone_namespace',
+        existing_type=sa.String(100),
+        existing_nullable=False,
+        server_default=None
+    )
@@ -8,7 +8,9 @@ HOW IT WORKS:
 - Automatic refresh on expired access token
 - Seamless user experience
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from uuid import UUID
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from rag.core.database import get_db
@@ -18,7 +20,9 @@ from rag.models.user import User
 from rag.schemas.user import UserCreate, UserResponse
 from rag.schemas.auth import LoginRequest, PasswordChange
 from rag.services import auth_service
+from rag.services.email_service import send_password_reset_email
 from rag.core.config import get_settings
+from rag.core.logging import get_logger
 
 settings = get_settings()
 
@@ -328,11 +332,36 @@ async def change_password(
     
     return {"message": "Password changed successfully"}
 
+async def _send_reset_email(user_id: UUID, email: str, reset_link: str, username: str) -> None:
+    """Background task: send the reset email and log the outcome."""
+    logger = get_logger(__name__)
+
+    success = await send_password_reset_email(
+        email=email,
+        reset_link=reset_link,
+        username=username
+    )
+
+    if success:
+        logger.info(
+            "password_reset_requested",
+            user_id=str(user_id),
+            email=email
+        )
+    else:
+        logger.error(
+            "password_reset_email_failed",
+            user_id=str(user_id),
+            email=email
+        )
+
+
 @router.post("/forgot-password")
 @limiter.limit("3/hour", key_func=get_remote_address)
 async def forgot_password(
     request: Request,
     email: str,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -357,10 +386,6 @@ async def forgot_password(
     ```
     """
     from sqlalchemy import select
-    from rag.services.email_service import send_password_reset_email
-    from rag.core.logging import get_logger
-
-    logger = get_logger(__name__)
 
     # Find user by email (safely - don't reveal if user exists)
     result = await db.execute(
@@ -376,24 +401,9 @@ async def forgot_password(
         # For now, simple link to frontend with email
         reset_link = f"{settings.frontend_url}/reset-password?email={email}"
 
-        # Send email
-        success = await send_password_reset_email(
-            email=user.email,
-            reset_link=reset_link,
-            username=user.username
+        # Send email after the response; the reply must not wait on (or reveal) delivery
+        background_tasks.add_task(
+            _send_reset_email, user.id, user.email, reset_link, user.username
         )
 
-        if success:
-            logger.info(
-                "password_reset_requested",
-                user_id=str(user.id),
-                email=user.email
-            )
-        else:
-            logger.error(
-                "password_reset_email_failed",
-                user_id=str(user.id),
-                email=user.email
-            )
-
     return {"message": response_msg}
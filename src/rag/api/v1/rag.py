@@ -7,7 +7,7 @@ Protected endpoints - all require authentication.
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, BackgroundTasks, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from rag.core.database import get_db
@@ -27,12 +27,11 @@ from rag.services import rag_service
 router = APIRouter(prefix="/rag", tags=["RAG"])
 
 
-@router.post("/upload", response_model=DocumentUploadResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/upload", response_model=DocumentUploadResponse, status_code=status.HTTP_202_ACCEPTED)
 @limiter.limit("2/10minutes", key_func=get_user_key)
 async def upload_document(
     request: Request,
     file: UploadFile = File(...),
-    background_tasks: BackgroundTasks = BackgroundTasks(),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -42,8 +41,8 @@ async def upload_document(
     **FLOW:**
     1. File is saved to disk
     2. Database record created (status="pending")
-    3. Background task processes document
-    4. Returns immediately (non-blocking)
+    3. Document queued for a background worker
+    4. Returns 202 Accepted immediately (non-blocking)
     
     **Supported file types:** PDF, DOCX, TXT, JSON
     
@@ -80,8 +79,7 @@ async def upload_document(
         document = await rag_service.upload_and_process_document(
             db,
             current_user.id,
-            file,
-            background_tasks
+            file
         )
         
         return document
@@ -381,11 +379,11 @@ async def health_check(
     
     **Returns:** System status and user info
     """
-    from rag.vectorstore import SimplePineconeStore
+    from rag.vectorstore import get_pinecone_store
     
     try:
         # Test Pinecone connection
-        store = SimplePineconeStore()
+        store = get_pinecone_store()
         pinecone_connected = store.connect_to_index()
         
         return {
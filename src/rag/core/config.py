@@ -66,6 +66,9 @@ class Settings(BaseSettings):
     pinecone_index_name: str = Field(default="rag-index")
     pinecone_environment: Optional[str] = None
     pinecone_use_namespaces: bool = True
+    # Upsert embeddings rounded to the int8 grid (cosine index only); the
+    # integer values make the JSON payload ~3x smaller
+    pinecone_quantize_int8: bool = False
     
     # ============ Embedding Settings ============
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
@@ -101,6 +104,20 @@ class Settings(BaseSettings):
     use_ollama: bool = False
     ollama_base_url: str = "http://localhost:11434"
     ollama_model: str = "llama3.2"
+
+    # ============ LLM Fallback Settings ============
+    # Start the next provider if the current one has not answered in time (0 = sequential).
+    # Every hedge is an extra paid call, so leave it off unless tail latency matters:
+    # set it to about the p95 of the "<provider> answered in N ms" times logged for
+    # your primary provider, so only the slowest ~5% of queries start a second one.
+    llm_hedge_delay_ms: int = 0
+    # Exact-match answer cache; only calls at or below the temperature threshold are cached
+    llm_cache_size: int = 1024
+    llm_cache_ttl_seconds: int = 3600
+    llm_cache_temperature_threshold: float = 0.0
+    # Reuse answers of paraphrased prompts (embeds every cacheable prompt locally)
+    llm_semantic_cache_enabled: bool = False
+    llm_semantic_cache_threshold: float = 0.92
     
     # ============ Document Processing Settings ============
     chunk_size: int = 1000
@@ -108,6 +125,8 @@ class Settings(BaseSettings):
     max_file_size_mb: int = 10
     allowed_file_types: List[str] = [".pdf", ".docx", ".txt", ".json"]
     enable_ocr: bool = False
+    # Background workers chunking/embedding uploads concurrently
+    document_workers: int = 2
     
     # ============ Storage Settings ============
     upload_dir: Path = Path("data/uploads")
@@ -127,6 +146,14 @@ class Settings(BaseSettings):
     min_relevance_score: float = 0.5
     enable_hybrid_search: bool = False
 
+    # ============ Semantic Cache Settings ============
+    semantic_cache_enabled: bool = True
+    semantic_cache_threshold: float = 0.95
+    # Cache of Pinecone results for similar queries, one per (namespace, user) scope;
+    # a scope is dropped whenever its documents are uploaded or deleted
+    search_cache_per_user: int = 256
+    search_cache_users: int = 256
+
     # ============ Email Settings (SMTP) ============
     resend_api_key: str = Field(default="")
     smtp_from_email: str = Field(default="noreply@example.com")
@@ -139,6 +166,12 @@ class Settings(BaseSettings):
     log_level: str = "INFO"
     log_format: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
+    # Persist one RequestLog row per API request (written in batches)
+    request_log_enabled: bool = False
+    log_buffer_max_batch: int = 500
+    log_buffer_flush_interval: float = 1.0  # seconds
+    request_log_retention_days: int = 30
+
     # ============ Rate Limiting Settings ============
     # Redis URL for distributed rate limit storage
     redis_url: str = Field(default="redis://localhost:6379/0")
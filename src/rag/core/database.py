@@ -2,9 +2,12 @@
 Database connection and session management.
 File: src/rag/core/database.py
 """
-from typing import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, List
 import logging
 
+from sqlalchemy import Index, Table
+from sqlalchemy.schema import CreateIndex, DropIndex
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     AsyncSession,
@@ -88,4 +91,42 @@ async def close_db() -> None:
     Call this on application shutdown.
     """
     await engine.dispose()
-    logger.info("✅ Database connections closed")
\ No newline at end of file
+    logger.info("✅ Database connections closed")
+
+
+def secondary_indexes(table: Table) -> List[Index]:
+    """Non-unique indexes of a table (safe to drop while loading)."""
+    return sorted(
+        (ix for ix in table.indexes if not ix.unique),
+        key=lambda ix: ix.name
+    )
+
+
+@asynccontextmanager
+async def bulk_load_mode(table: Table, bind=None) -> AsyncGenerator[None, None]:
+    """
+    Drop a table's secondary indexes for a bulk load, rebuild them after.
+
+    Usage (backfills / replays only, not on a live table):
+        async with bulk_load_mode(RequestLog.__table__):
+            await session.execute(insert(RequestLog), rows)
+
+    Indexes are rebuilt even if the load fails. CONCURRENTLY is not used
+    because Postgres does not support it on partitioned tables such as
+    request_logs.
+    """
+    bind = bind or engine
+    indexes = secondary_indexes(table)
+
+    async with bind.begin() as conn:
+        for ix in indexes:
+            await conn.execute(DropIndex(ix, if_exists=True))
+    logger.info(f"📦 Bulk load mode on {table.name}: dropped {len(indexes)} indexes")
+
+    try:
+        yield
+    finally:
+        async with bind.begin() as conn:
+            for ix in indexes:
+                await conn.execute(CreateIndex(ix, if_not_exists=True))
+        logger.info(f"✅ Rebuilt {len(indexes)} indexes on {table.name}")
@@ -176,6 +176,10 @@ async def rate_limit_exceeded_handler(
 
     logger.warning("Rate limit exceeded", extra=log_data)
 
+    # Counted in its own session; a metrics failure never blocks the 429
+    from rag.services.metrics_service import record_counter
+    await record_counter("rate_limit_exceeded_total")
+
     # Build response with rate limit headers
     response = JSONResponse(
         status_code=429,
@@ -2,9 +2,13 @@
 Security utilities: JWT, password hashing, token management.
 File: src/rag/core/security.py
 """
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from uuid import UUID
+import hashlib
+import threading
+import time
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -94,8 +98,34 @@ def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None)
     return encoded_jwt
 
 
+def hash_refresh_token(token: str) -> bytes:
+    """SHA-256 digest under which a refresh token is stored and looked up."""
+    return hashlib.sha256(token.encode()).digest()
+
+
 # ============ JWT Token Verification ============
 
+# Verified access token payloads, keyed by token digest.
+# Access tokens are stateless (never revoked server-side), so a verified
+# payload stays valid until its exp; entries carry a monotonic deadline.
+ACCESS_TOKEN_CACHE_SIZE = 4096
+_access_token_cache: "OrderedDict[bytes, Tuple[float, dict]]" = OrderedDict()
+_access_token_cache_lock = threading.Lock()
+
+
+def _cache_access_token(key: bytes, payload: dict) -> None:
+    """Remember a verified payload until its exp claim."""
+    exp = payload.get("exp")
+    if exp is None:
+        return
+    deadline = time.monotonic() + (exp - time.time())
+    with _access_token_cache_lock:
+        _access_token_cache[key] = (deadline, payload)
+        _access_token_cache.move_to_end(key)
+        if len(_access_token_cache) > ACCESS_TOKEN_CACHE_SIZE:
+            _access_token_cache.popitem(last=False)
+
+
 def decode_access_token(token: str) -> Optional[dict]:
     """
     Decode and verify access token.
@@ -104,6 +134,15 @@ def decode_access_token(token: str) -> Optional[dict]:
     Returns:
         Decoded token data or None if invalid
     """
+    key = hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+    with _access_token_cache_lock:
+        cached = _access_token_cache.get(key)
+        if cached is not None:
+            if time.monotonic() < cached[0]:
+                _access_token_cache.move_to_end(key)
+                return dict(cached[1])
+            del _access_token_cache[key]
+
     try:
         payload = jwt.decode(
             token,
@@ -115,7 +154,8 @@ def decode_access_token(token: str) -> Optional[dict]:
         if payload.get("type") != "access":
             return None
         
-        return payload
+        _cache_access_token(key, payload)
+        return dict(payload)
         
     except JWTError:
         return None
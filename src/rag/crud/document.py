@@ -2,11 +2,11 @@
 CRUD operations for documents.
 Data access layer - no business logic!
 """
-from typing import List, Optional
-from uuid import UUID
-from datetime import datetime
+from typing import List, Optional, Tuple
+from uuid import UUID, uuid4
+from datetime import datetime, timedelta
 
-from sqlalchemy import select, update, and_
+from sqlalchemy import select, update, insert, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from rag.models.document import Document, DocumentChunk, ChatMessage
@@ -100,17 +100,16 @@ async def update_document_status(
     if error:
         update_data["processing_error"] = error
     
-    await db.execute(
+    # RETURNING hands back the updated row, so no SELECT after the commit
+    result = await db.execute(
         update(Document)
         .where(Document.id == document_id)
         .values(**update_data)
+        .returning(Document)
     )
+    document = result.scalar_one_or_none()
     await db.commit()
-    
-    result = await db.execute(
-        select(Document).where(Document.id == document_id)
-    )
-    return result.scalar_one_or_none()
+    return document
 
 
 async def soft_delete_document(
@@ -133,29 +132,71 @@ async def soft_delete_document(
     return result.rowcount > 0
 
 
+async def reset_unfinished_documents(db: AsyncSession) -> List[Tuple[UUID, str, UUID]]:
+    """
+    Set every pending or processing document back to pending.
+    
+    Called on startup, when no document can still be in progress.
+    
+    Returns:
+        (document_id, file_path, user_id) for each reset document
+    """
+    result = await db.execute(
+        update(Document)
+        .where(
+            and_(
+                Document.status.in_(("pending", "processing")),
+                Document.is_deleted == False
+            )
+        )
+        .values(status="pending")
+        .returning(Document.id, Document.file_path, Document.user_id)
+    )
+    jobs = [tuple(row) for row in result.all()]
+    await db.commit()
+    return jobs
+
+
 # ============= CHUNK CRUD =============
 
 async def create_chunks(
     db: AsyncSession,
     document_id: UUID,
-    chunks: List[dict]
-) -> List[DocumentChunk]:
-    """Bulk create document chunks."""
-    db_chunks = [
-        DocumentChunk(
-            document_id=document_id,
-            chunk_index=chunk["index"],
-            content=chunk["content"],
-            page_number=chunk.get("page_number"),
-            start_char=chunk.get("start_char"),
-            end_char=chunk.get("end_char")
-        )
+    chunks: List[dict],
+    commit: bool = True
+) -> int:
+    """
+    Bulk create document chunks.
+    
+    Rows go out in one Core INSERT (executemany) rather than through ORM
+    objects, which matters for documents with thousands of chunks.
+    With commit=False the caller commits them together with its next write.
+    
+    Returns:
+        Number of chunks inserted
+    """
+    if not chunks:
+        return 0
+    
+    now = datetime.utcnow()
+    rows = [
+        {
+            "id": uuid4(),
+            "document_id": document_id,
+            "chunk_index": chunk["index"],
+            "content": chunk["content"],
+            "page_number": chunk.get("page_number"),
+            "start_char": chunk.get("start_char"),
+            "end_char": chunk.get("end_char"),
+            "created_at": now
+        }
         for chunk in chunks
     ]
     
-    db.add_all(db_chunks)
-    await db.commit()
-    return db_chunks
+    await db.execute(insert(DocumentChunk), rows)
+    if commit:
+        await db.commit()
+    return len(rows)
 
 
 async def get_document_chunks(
@@ -197,6 +238,48 @@ async def create_chat_message(
     return message
 
 
+async def create_chat_exchange(
+    db: AsyncSession,
+    user_id: UUID,
+    session_id: str,
+    question: str,
+    answer: str,
+    retrieved_chunks: int = 0,
+    model_used: Optional[str] = None
+) -> None:
+    """
+    Save a question and its answer in one INSERT and one commit.
+
+    The answer is stamped a microsecond after the question, so history
+    ordered by created_at always lists them in that order.
+    """
+    now = datetime.utcnow()
+    rows = [
+        {
+            "id": uuid4(),
+            "user_id": user_id,
+            "session_id": session_id,
+            "role": "user",
+            "content": question,
+            "retrieved_chunks": 0,
+            "model_used": None,
+            "created_at": now
+        },
+        {
+            "id": uuid4(),
+            "user_id": user_id,
+            "session_id": session_id,
+            "role": "assistant",
+            "content": answer,
+            "retrieved_chunks": retrieved_chunks,
+            "model_used": model_used,
+            "created_at": now + timedelta(microseconds=1)
+        }
+    ]
+    await db.execute(insert(ChatMessage), rows)
+    await db.commit()
+
+
 async def get_chat_history(
     db: AsyncSession,
     user_id: UUID,
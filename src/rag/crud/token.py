@@ -20,6 +20,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from rag.models.token import RefreshToken
 from rag.core.config import get_settings
+from rag.core.security import hash_refresh_token
 
 settings = get_settings()
 
@@ -36,7 +37,7 @@ async def create_refresh_token(
     
     Args:
         user_id: User who owns this token
-        token: JWT refresh token string
+        token: JWT refresh token string (only its hash is stored)
         device_info: Optional device/browser info
         ip_address: Optional IP address
         
@@ -49,7 +50,7 @@ async def create_refresh_token(
     
     db_token = RefreshToken(
         user_id=user_id,
-        token=token,
+        token_hash=hash_refresh_token(token),
         expires_at=expires_at,
         #device_info=device_info,
         #ip_address=ip_address,
@@ -72,7 +73,7 @@ async def get_refresh_token(
     Used during token refresh to validate.
     """
     result = await db.execute(
-        select(RefreshToken).where(RefreshToken.token == token)
+        select(RefreshToken).where(RefreshToken.token_hash == hash_refresh_token(token))
     )
     return result.scalar_one_or_none()
 
@@ -104,7 +105,7 @@ async def revoke_token(db: AsyncSession, token: str) -> bool:
     """
     result = await db.execute(
         update(RefreshToken)
-        .where(RefreshToken.token == token)
+        .where(RefreshToken.token_hash == hash_refresh_token(token))
         .values(
             is_revoked=True,
             revoked_at=datetime.utcnow()
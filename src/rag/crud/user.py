@@ -11,11 +11,11 @@ WHY CRUD PATTERN:
 - Testable: Easy to unit test DB operations
 - Maintainable: Change query in one place
 """
-from typing import Optional
+from typing import List, Optional, Tuple
 from uuid import UUID
 from datetime import datetime
 
-from sqlalchemy import select, update
+from sqlalchemy import or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from rag.models.user import User
@@ -59,6 +59,26 @@ async def get_user_by_username(db: AsyncSession, username: str) -> Optional[User
     return result.scalar_one_or_none()
 
 
+async def get_email_username_matches(
+    db: AsyncSession,
+    email: str,
+    username: str
+) -> List[Tuple[str, str]]:
+    """
+    Get (email, username) of users matching either value.
+    
+    Used at registration to check both unique fields in one round-trip.
+    Only the two columns are fetched, so no User objects are built; both
+    columns are unique, so at most two rows come back.
+    """
+    result = await db.execute(
+        select(User.email, User.username)
+        .where(or_(User.email == email, User.username == username))
+        .limit(2)
+    )
+    return [tuple(row) for row in result.all()]
+
+
 async def create_user(db: AsyncSession, user_data: UserCreate) -> User:
     """
     Create new user.
@@ -107,9 +127,6 @@ async def update_user(
         # Nothing to update
         return await get_user_by_id(db, user_id)
     
-    # Add updated_at timestamp
-    update_data["updated_at"] = datetime.utcnow()
-    
     # Execute update
     await db.execute(
         update(User)
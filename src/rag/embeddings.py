@@ -3,12 +3,14 @@ Clean, focused embeddings module for portfolio RAG project.
 
 Features (only what we need):
 - Basic embedding generation with sentence-transformers
-- Simple file-based caching to avoid re-computation
+- SQLite cache keyed by model + text hash to avoid re-computation
 - Batch processing for multiple documents
 - Error handling for robust operation
 """
 import logging
 import hashlib
+import sqlite3
+import threading
 import time
 from pathlib import Path
 from typing import List, Dict, Any, Optional
@@ -23,40 +25,102 @@ from rag.core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Keyed BLAKE2b namespaces cache keys; not used for anything security-sensitive
+_CACHE_KEY_SALT = b"rag-embeddings"
+
 
 class SimpleEmbeddingCache:
-    """File-based caching for embeddings."""
+    """
+    Embedding cache in a SQLite table keyed by a hash of model + text.
+
+    Vectors are stored as float32 blobs in data_dir/embeddings_cache, and
+    batches are looked up and written with one statement each, so
+    re-uploaded or duplicated chunks are never embedded twice.
+    """
+    
+    # Keeps IN (...) lists under SQLite's host parameter limit
+    _MAX_PARAMS = 500
     
     def __init__(self):
         settings = get_settings()
         self.cache_dir = settings.data_dir / "embeddings_cache"
         self.cache_dir.mkdir(exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
         logger.info(f"📁 Cache directory: {self.cache_dir}")
     
-    def _get_cache_key(self, text: str, model_name: str) -> str:
+    def _connection(self) -> sqlite3.Connection:
+        """Open the cache database on first use (call with the lock held)."""
+        if self._conn is None:
+            conn = sqlite3.connect(
+                str(self.cache_dir / "embeddings.sqlite3"),
+                timeout=30,
+                check_same_thread=False
+            )
+            # WAL lets concurrent ingestion workers read while one writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embedding_cache "
+                "(hash BLOB PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+    
+    def _get_cache_key(self, text: str, model_name: str) -> bytes:
         """Generate cache key from text + model."""
         content = f"{model_name}:{text}"
-        return hashlib.md5(content.encode()).hexdigest()
+        return hashlib.blake2b(
+            content.encode('utf-8'), digest_size=16, key=_CACHE_KEY_SALT
+        ).digest()
     
     def get(self, text: str, model_name: str) -> Optional[np.ndarray]:
         """Get embedding from cache if exists."""
+        return self.get_many([text], model_name)[0]
+    
+    def set(self, text: str, model_name: str, embedding: np.ndarray):
+        """Save embedding to cache."""
+        self.set_many([text], model_name, [embedding])
+    
+    def get_many(self, texts: List[str], model_name: str) -> List[Optional[np.ndarray]]:
+        """Get embeddings for several texts (None for misses)."""
+        keys = [self._get_cache_key(text, model_name) for text in texts]
+        found: Dict[bytes, bytes] = {}
         try:
-            cache_key = self._get_cache_key(text, model_name)
-            cache_file = self.cache_dir / f"{cache_key}.npy"
-            
-            if cache_file.exists():
-                return np.load(cache_file)
-            return None
+            with self._lock:
+                for i in range(0, len(keys), self._MAX_PARAMS):
+                    batch = keys[i:i + self._MAX_PARAMS]
+                    rows = self._connection().execute(
+                        "SELECT hash, vector FROM embedding_cache WHERE hash IN "
+                        f"({','.join('?' * len(batch))})",
+                        batch
+                    ).fetchall()
+                    found.update(rows)
         except Exception as e:
             logger.warning(f"⚠️ Cache read failed: {e}")
-            return None
+            return [None] * len(texts)
+        
+        return [
+            np.frombuffer(found[key], dtype=np.float32) if key in found else None
+            for key in keys
+        ]
     
-    def set(self, text: str, model_name: str, embedding: np.ndarray):
-        """Save embedding to cache."""
+    def set_many(self, texts: List[str], model_name: str, embeddings: List[np.ndarray]):
+        """Save embeddings for several texts in one transaction."""
         try:
-            cache_key = self._get_cache_key(text, model_name)
-            cache_file = self.cache_dir / f"{cache_key}.npy"
-            np.save(cache_file, embedding)
+            rows = [
+                (self._get_cache_key(text, model_name),
+                 np.asarray(embedding, dtype=np.float32).tobytes())
+                for text, embedding in zip(texts, embeddings)
+            ]
+            with self._lock:
+                conn = self._connection()
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO embedding_cache (hash, vector) VALUES (?, ?)",
+                        rows
+                    )
         except Exception as e:
             logger.warning(f"⚠️ Cache save failed: {e}")
 
@@ -69,6 +133,8 @@ class EmbeddingGenerator:
         settings = get_settings()
         self.model_name = model_name or getattr(settings, 'embedding_model', 'sentence-transformers/all-MiniLM-L6-v2')
         self.use_cache = use_cache
+        # Texts per model.encode call (cache lookups happen per batch)
+        self.batch_size = int(getattr(settings, 'embedding_batch_size', 32))
         
         # Lazy loading
         self.model = None
@@ -140,10 +206,11 @@ class EmbeddingGenerator:
             logger.error(f"❌ Embedding failed: {e}")
             return None
     
-    def embed_texts(self, texts: List[str], batch_size: int = 32) -> List[Optional[np.ndarray]]:
-        """Generate embeddings for multiple texts with batching."""
+    def embed_texts(self, texts: List[str], batch_size: Optional[int] = None) -> List[Optional[np.ndarray]]:
+        """Generate embeddings for multiple texts with batching (settings.embedding_batch_size by default)."""
         if not texts:
             return []
+        batch_size = batch_size or self.batch_size
         
         logger.info(f"🔄 Generating embeddings for {len(texts)} texts")
         start_time = time.time()
@@ -179,21 +246,24 @@ class EmbeddingGenerator:
         uncached_indices = []
         cache_hits = 0
 
+        # Look up the whole batch in one cache query
+        if self.cache:
+            cached_embeddings = self.cache.get_many(clean_texts, self.model_name)
+        else:
+            cached_embeddings = [None] * len(clean_texts)
+
         # Check for empty texts
         empty_count = 0
-        for i, clean_text in enumerate(clean_texts):
+        for i, (clean_text, cached) in enumerate(zip(clean_texts, cached_embeddings)):
             if not clean_text:
                 embeddings.append(None)
                 empty_count += 1
                 continue
 
-            # Check cache
-            if self.cache:
-                cached = self.cache.get(clean_text, self.model_name)
-                if cached is not None:
-                    embeddings.append(cached)
-                    cache_hits += 1
-                    continue
+            if cached is not None:
+                embeddings.append(cached)
+                cache_hits += 1
+                continue
 
             # Needs embedding
             embeddings.append(None)  # Placeholder
@@ -215,7 +285,7 @@ class EmbeddingGenerator:
         if uncached_texts and self._load_model():
             try:
                 logger.debug(f"🔄 Encoding {len(uncached_texts)} texts...")
-                batch_embeddings = self.model.encode(uncached_texts)
+                batch_embeddings = self.model.encode(uncached_texts, batch_size=len(uncached_texts))
 
                 # Verify embeddings were generated
                 if len(batch_embeddings) == 0:
@@ -226,8 +296,8 @@ class EmbeddingGenerator:
                 for idx, embedding in zip(uncached_indices, batch_embeddings):
                     embeddings[idx] = embedding
 
-                    if self.cache:
-                        self.cache.set(clean_texts[idx], self.model_name, embedding)
+                if self.cache:
+                    self.cache.set_many(uncached_texts, self.model_name, batch_embeddings)
 
             except Exception as e:
                 logger.error(
@@ -243,10 +313,17 @@ class EmbeddingGenerator:
 
         return embeddings, cache_hits
     
-    def embed_documents(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def embed_documents(
+        self,
+        documents: List[Dict[str, Any]],
+        return_mask: bool = False
+    ):
         """
         Add embeddings to document chunks.
         Main function you'll use with your processed documents.
+        
+        With return_mask=True, returns (docs, mask) where mask is a bool
+        array marking the chunks that got an embedding.
         """
         logger.info(f"📚 Embedding {len(documents)} document chunks")
         
@@ -258,32 +335,43 @@ class EmbeddingGenerator:
         
         # Add embeddings to documents
         updated_docs = []
-        for doc, embedding in zip(documents, embeddings):
+        mask = np.zeros(len(documents), dtype=bool)
+        for i, (doc, embedding) in enumerate(zip(documents, embeddings)):
             updated_doc = doc.copy()
             
             if embedding is not None:
                 updated_doc['embedding'] = embedding.tolist()  # Convert for JSON
                 updated_doc['embedding_model'] = self.model_name
+                mask[i] = True
             else:
                 updated_doc['embedding'] = None
                 logger.warning(f"❌ Failed to embed: {doc.get('id', 'unknown')}")
             
             updated_docs.append(updated_doc)
         
-        successful = sum(1 for doc in updated_docs if doc['embedding'] is not None)
+        successful = int(mask.sum())
         logger.info(f"✅ Successfully embedded {successful}/{len(documents)} documents")
         
+        if return_mask:
+            return updated_docs, mask
         return updated_docs
     
 
 
 # Simple convenience function - this is what you'll actually use
-def embed_document_chunks(document_chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def embed_document_chunks(
+    document_chunks: List[Dict[str, Any]],
+    return_mask: bool = False
+):
     """
     Main function to embed your document chunks.
     Use this in your pipeline.
+    
+    With return_mask=True, also returns the bool success mask.
     """
     embedder = EmbeddingGenerator(use_cache=True)
+    if return_mask:
+        return embedder.embed_documents(document_chunks, return_mask=True)
     return embedder.embed_documents(document_chunks)
 
 
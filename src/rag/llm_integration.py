@@ -2,9 +2,13 @@
 Complete RAG system with Gemini LLM integration.
 The final piece - generates answers using retrieved context!
 """
+import asyncio
 import logging
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 
+import numpy as np
+
 try:
     import google.generativeai as genai
     GEMINI_AVAILABLE = True
@@ -13,10 +17,31 @@ except ImportError:
     GEMINI_AVAILABLE = False
 
 from rag.core.config import get_settings
+from rag.embeddings import EmbeddingGenerator
 from rag.vectorstore import search_documents_by_text
 
 logger = logging.getLogger(__name__)
 
+# RAG prompt template, split around the two interpolated fields
+_PROMPT_HEAD = (
+    "You are a helpful AI assistant that answers questions based on the provided context.\n"
+    "\n"
+    "CONTEXT:\n"
+)
+_PROMPT_MID = "\n\nQUESTION: "
+_PROMPT_TAIL = (
+    "\n"
+    "\n"
+    "INSTRUCTIONS:\n"
+    "1. Answer the question using ONLY the information provided in the context above\n"
+    "2. If the context doesn't contain enough information to answer the question, say so\n"
+    "3. Be specific and cite relevant parts of the context when possible\n"
+    "4. Keep your answer concise but complete\n"
+    "5. If you mention information from the context, briefly indicate which context source it came from\n"
+    "\n"
+    "ANSWER:"
+)
+
 
 class RAGWithGemini:
     """Complete RAG system with Gemini for final response generation."""
@@ -35,6 +60,8 @@ class RAGWithGemini:
         genai.configure(api_key=settings.google_api_key)
         self.model = genai.GenerativeModel(settings.gemini_model)
         
+        self.embedder = EmbeddingGenerator()
+        
         logger.info("🤖 Initialized Gemini LLM for RAG")
     
     def format_context(self, search_results: List[Dict[str, Any]]) -> str:
@@ -42,38 +69,21 @@ class RAGWithGemini:
         if not search_results:
             return "No relevant information found in the knowledge base."
         
-        context_parts = []
-        for i, result in enumerate(search_results, 1):
-            text = result['metadata'].get('text', '')
-            source = result['metadata'].get('source', 'Unknown')
+        context_parts = [None] * len(search_results)
+        for i, result in enumerate(search_results):
+            md_get = result['metadata'].get
+            text = md_get('text', '')
+            source = md_get('source', 'Unknown')
             score = result.get('score', 0)
             
             # Format each piece of context
-            context_part = f"""
-Context {i} (Relevance: {score:.2f}, Source: {source}):
-{text}
-"""
-            context_parts.append(context_part)
+            context_parts[i] = f"\nContext {i + 1} (Relevance: {score:.2f}, Source: {source}):\n{text}\n"
         
         return "\n".join(context_parts)
     
     def create_rag_prompt(self, question: str, context: str) -> str:
         """Create a well-structured prompt for RAG."""
-        return f"""You are a helpful AI assistant that answers questions based on the provided context.
-
-CONTEXT:
-{context}
-
-QUESTION: {question}
-
-INSTRUCTIONS:
-1. Answer the question using ONLY the information provided in the context above
-2. If the context doesn't contain enough information to answer the question, say so
-3. Be specific and cite relevant parts of the context when possible
-4. Keep your answer concise but complete
-5. If you mention information from the context, briefly indicate which context source it came from
-
-ANSWER:"""
+        return "".join((_PROMPT_HEAD, context, _PROMPT_MID, question, _PROMPT_TAIL))
 
     def generate_response(self, question: str, context: str) -> str:
         """Generate response using Gemini."""
@@ -96,23 +106,59 @@ ANSWER:"""
             logger.error(f"❌ Response generation failed: {e}")
             return f"I apologize, but I encountered an error while generating the response: {str(e)}"
     
-    def query(self, question: str, top_k: int = 5) -> Dict[str, Any]:
+    def retrieve(
+        self,
+        question: str,
+        top_k: int = 5,
+        query_embedding: Optional[np.ndarray] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Retrieve relevant chunks, reusing cached results for similar questions.
+        
+        Goes through the shared search cache (unscoped entry), which is
+        invalidated whenever documents are uploaded or deleted. Pass
+        query_embedding when the question was already embedded (e.g. as
+        part of a batch).
+        """
+        if query_embedding is None:
+            query_embedding = self.embedder.embed_single_text(question)
+        if query_embedding is None:
+            return []
+        
+        return search_documents_by_text(
+            question, top_k=top_k, query_embedding=query_embedding
+        )
+    
+    def query(
+        self,
+        question: str,
+        top_k: int = 5,
+        include_context: bool = False,
+        query_embedding: Optional[np.ndarray] = None
+    ) -> Dict[str, Any]:
         """
         Complete RAG pipeline: retrieve documents + generate response.
         This is your main function!
+        
+        The formatted context is only returned as 'context_used' when
+        include_context is set, since it is usually several KB.
         """
         logger.info(f"🔍 Processing RAG query: {question}")
         
         # Step 1: Retrieve relevant documents
-        search_results = search_documents_by_text(question, top_k=top_k,)
+        search_results = self.retrieve(
+            question, top_k=top_k, query_embedding=query_embedding
+        )
         
         if not search_results:
-            return {
+            response = {
                 'question': question,
                 'answer': "I couldn't find any relevant information in the knowledge base to answer your question.",
-                'sources': [],
-                'context_used': ""
+                'sources': []
             }
+            if include_context:
+                response['context_used'] = ""
+            return response
         
         # Step 2: Format context
         context = self.format_context(search_results)
@@ -123,19 +169,32 @@ ANSWER:"""
         # Step 4: Prepare response
         sources = []
         for result in search_results:
+            md = result['metadata']
             sources.append({
-                'source': result['metadata'].get('source', 'Unknown'),
+                'source': md.get('source', 'Unknown'),
                 'relevance_score': result.get('score', 0),
-                'text_preview': result['metadata'].get('text', '')[:200] + "..."
+                'text_preview': md.get('text_preview') or f"{md.get('text', '')[:200]}..."
             })
         
-        return {
+        response = {
             'question': question,
             'answer': answer,
             'sources': sources,
-            'context_used': context,
             'num_sources_used': len(search_results)
         }
+        if include_context:
+            response['context_used'] = context
+        return response
+
+
+@lru_cache(maxsize=1)
+def get_rag() -> RAGWithGemini:
+    """
+    Get the process-wide RAGWithGemini instance.
+    
+    Gemini is configured once here instead of on every question.
+    """
+    return RAGWithGemini()
 
 
 # Simple convenience function - your main interface
@@ -145,10 +204,42 @@ def ask_question(question: str, top_k: int = 5) -> str:
     
     This is the main function you'll use!
     """
-    rag = RAGWithGemini()
+    rag = get_rag()
     result = rag.query(question, top_k)
     return result['answer']
 
+
+async def ask_questions_batch(questions: List[str], top_k: int = 5) -> List[str]:
+    """
+    Answer several questions, running the pipeline once per distinct question.
+    
+    All distinct questions are embedded in one batch, then retrieval and
+    generation run concurrently. Answers are returned in the same order
+    as questions; repeated questions share one answer.
+    """
+    rag = get_rag()
+    unique: Dict[str, int] = {}
+    inv = [unique.setdefault(q, len(unique)) for q in questions]
+    
+    if not unique:
+        return []
+    if len(unique) < len(questions):
+        logger.info(f"📦 Batch of {len(questions)} questions, {len(unique)} unique")
+    
+    embeddings = rag.embedder.embed_texts(list(unique))
+    results = await asyncio.gather(*(
+        asyncio.to_thread(rag.query, q, top_k, query_embedding=embedding)
+        for q, embedding in zip(unique, embeddings)
+    ))
+    
+    answers = [result['answer'] for result in results]
+    return [answers[i] for i in inv]
+
+
+def batch_ask(questions: List[str], top_k: int = 5) -> List[str]:
+    """Synchronous wrapper around ask_questions_batch."""
+    return asyncio.run(ask_questions_batch(questions, top_k))
+
 def generate_answer_with_gemini(prompt: str) -> str:
     """
     Simple wrapper to generate answer using Gemini.
@@ -159,15 +250,9 @@ def generate_answer_with_gemini(prompt: str) -> str:
     Returns:
         Generated answer as string
     """
-    settings = get_settings()
-    
     try:
-        import google.generativeai as genai
-        
-        genai.configure(api_key=settings.google_api_key)
-        model = genai.GenerativeModel(settings.gemini_model)
-        
-        response = model.generate_content(prompt)
+        rag = get_rag()
+        response = rag.model.generate_content(prompt)
         
         return response.text
         
@@ -178,20 +263,21 @@ def ask_question_detailed(
                 question: str,
                  top_k: int = 5,
                  namespace: Optional[str] = None,  
-                 user_id: Optional[str] = None
+                 user_id: Optional[str] = None,
+                 include_context: bool = False
                  ) -> Dict[str, Any]:
     """
     Ask a question and get detailed results including sources.
     Use this when you want to see what documents were used.
     """
-    rag = RAGWithGemini()
+    rag = get_rag()
     results = search_documents_by_text(
         question, 
         top_k=top_k,
         namespace=namespace,  
         user_id=user_id       
     )
-    return rag.query(question, top_k)
+    return rag.query(question, top_k, include_context=include_context)
 
 
 # Test function
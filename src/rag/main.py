@@ -16,13 +16,26 @@ from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
+import ipaddress
 import logging
 import time
+from typing import Optional
+from uuid import uuid4
+
+import orjson
 
 from rag.core.config import get_settings
-from rag.core.database import init_db, close_db
+from rag.core.database import engine, init_db, close_db
 from rag.core.rate_limiter import limiter, rate_limit_exceeded_handler
 from rag.core.logging import configure_logging, LoggingMiddleware
+from rag.llm_integration import get_rag
+from rag.services.auth_service import wait_for_pending_logins
+from rag.services.document_queue import get_document_queue
+from rag.services.email_service import close_email_service
+from rag.services.llm_service import close_llm_service
+from rag.services.log_buffer import get_request_log_buffer, get_metric_buffer
+from rag.services.log_retention import maintain_partitions
+from rag.services.rag_service import wait_for_pending_cleanups
 from slowapi.errors import RateLimitExceeded
 from rag.api.v1 import auth
 
@@ -42,6 +55,13 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson instead of the stdlib json module."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -67,6 +87,34 @@ async def lifespan(app: FastAPI):
         logger.error(f"❌ Database initialization failed: {e}")
         raise
     
+    try:
+        # Configure Gemini once per process instead of per request
+        app.state.rag = get_rag()
+        logger.info("✅ Gemini RAG client ready")
+    except Exception as e:
+        app.state.rag = None
+        logger.warning(f"⚠️ Gemini RAG client unavailable: {e}")
+
+    if settings.request_log_enabled:
+        try:
+            # Make sure this month's request_logs partition exists
+            async with engine.begin() as conn:
+                await maintain_partitions(
+                    conn, retention_days=settings.request_log_retention_days
+                )
+        except Exception as e:
+            logger.warning(f"⚠️ Request log partition maintenance failed: {e}")
+        get_request_log_buffer().start()
+        get_metric_buffer().start()
+        logger.info("✅ Request log buffer started")
+
+    get_document_queue().start()
+    logger.info("✅ Document workers started")
+    try:
+        await get_document_queue().recover()
+    except Exception as e:
+        logger.warning(f"⚠️ Re-queueing unfinished documents failed: {e}")
+
     # Add any other startup tasks here
     # - Initialize Redis connection
     # - Load ML models into memory
@@ -80,6 +128,14 @@ async def lifespan(app: FastAPI):
     logger.info("🛑 Shutting down application...")
     
     try:
+        await wait_for_pending_logins()
+        await wait_for_pending_cleanups()
+        await get_document_queue().stop()
+        await close_email_service()
+        await close_llm_service()
+        if settings.request_log_enabled:
+            await get_request_log_buffer().stop()
+            await get_metric_buffer().stop()
         await close_db()
         logger.info("✅ Database connections closed")
     except Exception as e:
@@ -94,6 +150,7 @@ app = FastAPI(
     version=settings.app_version,
     description="Multi-user RAG system with authentication and document Q&A",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs",  # Swagger UI
     redoc_url="/redoc",  # ReDoc
     openapi_url="/openapi.json",
@@ -118,6 +175,17 @@ app.add_middleware(
 )
 
 # ============ Request Logging Middleware ============
+
+def _client_ip(request: Request) -> Optional[str]:
+    """Client address if it is a valid IP (request_logs.ip_address is INET)."""
+    if not request.client:
+        return None
+    try:
+        return str(ipaddress.ip_address(request.client.host))
+    except ValueError:
+        return None
+
+
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     """
@@ -128,29 +196,49 @@ async def log_requests(request: Request, call_next):
     - Processing time
     - Status code
     """
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
+    log_enabled = logger.isEnabledFor(logging.INFO)
     
     # Log request
-    logger.info(
-        f"→ {request.method} {request.url.path} "
-        f"from {request.client.host if request.client else 'unknown'}"
-    )
+    if log_enabled:
+        logger.info(
+            "→ %s %s from %s",
+            request.method,
+            request.url.path,
+            request.client.host if request.client else 'unknown'
+        )
     
     # Process request
     response = await call_next(request)
     
-    # Calculate processing time
-    process_time = time.time() - start_time
+    # Calculate processing time (seconds)
+    process_time = (time.perf_counter_ns() - start_ns) / 1e9
     
     # Log response
-    logger.info(
-        f"← {request.method} {request.url.path} "
-        f"completed in {process_time:.3f}s with status {response.status_code}"
-    )
+    if log_enabled:
+        logger.info(
+            "← %s %s completed in %.3fs with status %s",
+            request.method,
+            request.url.path,
+            process_time,
+            response.status_code
+        )
     
     # Add custom header with processing time
     response.headers["X-Process-Time"] = str(process_time)
     
+    if settings.request_log_enabled:
+        get_request_log_buffer().add({
+            "request_id": request.headers.get("x-request-id") or str(uuid4()),
+            "endpoint": request.url.path[:255],
+            "method": request.method,
+            "user_id": None,
+            "ip_address": _client_ip(request),
+            "status_code": response.status_code,
+            "duration_ms": process_time * 1000,
+            "error_type": "server_error" if response.status_code >= 500 else None,
+        })
+    
     return response
 
 
@@ -173,7 +261,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     
     logger.warning(f"Validation error on {request.url.path}: {error_messages}")
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "detail": "Validation error",
@@ -201,7 +289,7 @@ async def global_exception_handler(request: Request, exc: Exception):
     else:
         detail = "An internal error occurred. Please try again later."
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={"detail": detail}
     )
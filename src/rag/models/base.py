@@ -2,11 +2,57 @@
 Base database model.
 File: src/rag/models/base.py
 """
+import os
+import time
+import uuid
+
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.sql.expression import FunctionElement
+from sqlalchemy.types import String
 
 
 class Base(DeclarativeBase):
     """
     Base class for all database models.
     """
-    pass
\ No newline at end of file
+    pass
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Generate a time-ordered UUIDv7 (RFC 9562).
+    
+    48-bit Unix millisecond timestamp followed by random bits, so new
+    primary keys land at the right edge of the B-tree index.
+    """
+    unix_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    
+    value = (unix_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= 0x7 << 76                        # version
+    value |= (rand >> 68) << 64               # rand_a (12 bits)
+    value |= 0b10 << 62                       # variant
+    value |= rand & ((1 << 62) - 1)           # rand_b (62 bits)
+    return uuid.UUID(int=value)
+
+
+class random_namespace(FunctionElement):
+    """
+    Server-side 'user_' + 12 random hex chars, for use as a server_default.
+    
+    Postgres uses gen_random_uuid(); other dialects (SQLite in tests) get
+    an equivalent randomblob() expression.
+    """
+    type = String()
+    inherit_cache = True
+
+
+@compiles(random_namespace, "postgresql")
+def _pg_random_namespace(element, compiler, **kw):
+    return "('user_' || substr(replace(gen_random_uuid()::text, '-', ''), 1, 12))"
+
+
+@compiles(random_namespace)
+def _random_namespace(element, compiler, **kw):
+    return "('user_' || lower(hex(randomblob(6))))"
@@ -5,7 +5,7 @@ Tracks uploaded files and their metadata.
 from datetime import datetime
 from uuid import UUID, uuid4
 
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text, Boolean, Float
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text, Boolean, Float, Index
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import relationship
 
@@ -23,6 +23,11 @@ class Document(Base):
     - Audit trail (when uploaded, by whom)
     """
     __tablename__ = "documents"
+    __table_args__ = (
+        # Document list per user (newest first) and filtering by status
+        Index("ix_documents_user_uploaded", "user_id", "uploaded_at"),
+        Index("ix_documents_user_status", "user_id", "status"),
+    )
     
     id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid4)
     user_id = Column(PG_UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -74,6 +79,10 @@ class DocumentChunk(Base):
     - Debugging and auditing
     """
     __tablename__ = "document_chunks"
+    __table_args__ = (
+        # Chunks are fetched per document in chunk order
+        Index("ix_document_chunks_doc_index", "document_id", "chunk_index"),
+    )
     
     id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid4)
     document_id = Column(PG_UUID(as_uuid=True), ForeignKey("documents.id", ondelete="CASCADE"), nullable=False)
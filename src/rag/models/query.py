@@ -6,7 +6,7 @@ from datetime import datetime
 from typing import Optional
 import uuid
 
-from sqlalchemy import String, DateTime, Integer, Text, Float
+from sqlalchemy import String, DateTime, Integer, Text, Float, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -16,6 +16,10 @@ from rag.models.base import Base
 class QueryHistory(Base):
     """Track user queries for analytics and improvement."""
     __tablename__ = "query_history"
+    __table_args__ = (
+        # Recent queries per user
+        Index("ix_query_history_user_created", "user_id", "created_at"),
+    )
     
     # Primary key
     id: Mapped[uuid.UUID] = mapped_column(
@@ -6,11 +6,11 @@ from datetime import datetime
 from typing import Optional
 import uuid
 
-from sqlalchemy import String, DateTime, Integer, Float, ForeignKey
+from sqlalchemy import String, DateTime, Integer, Float, ForeignKey, Index, desc
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, INET
 
-from rag.models.base import Base
+from rag.models.base import Base, uuid7
 
 
 class RequestLog(Base):
@@ -22,20 +22,36 @@ class RequestLog(Base):
     - User tracking for authenticated requests
     - Duration and status for performance monitoring
     - 30-day retention (cleanup via scheduled task)
+
+    Partitioned by month on created_at, so retention drops whole
+    partitions (see rag.services.log_retention). Postgres requires the
+    partition key in every unique index, hence the (id, created_at)
+    primary key and a non-unique request_id index.
     """
     __tablename__ = "request_logs"
+    __table_args__ = (
+        # "Last N requests for user X" as an index-only scan
+        Index(
+            "ix_request_logs_user_created",
+            "user_id",
+            desc("created_at"),
+            postgresql_include=["status_code", "duration_ms", "endpoint"]
+        ),
+        # Error-rate queries (created by migration partition_request_logs)
+        Index("idx_request_log_status_code", "status_code"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4
+        default=uuid7
     )
 
     # Correlation ID for request tracing
     request_id: Mapped[str] = mapped_column(
         String(36),
         nullable=False,
-        unique=True,
         index=True
     )
 
@@ -54,13 +70,13 @@ class RequestLog(Base):
     user_id: Mapped[Optional[uuid.UUID]] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="SET NULL"),
-        nullable=True,
-        index=True
+        nullable=True
     )
 
     # Client info
     ip_address: Mapped[Optional[str]] = mapped_column(
-        String(45),  # IPv6 max length
+        # INET on Postgres (7 bytes for IPv4, 19 for IPv6); text elsewhere
+        String(45).with_variant(INET(), "postgresql"),
         nullable=True
     )
 
@@ -81,8 +97,11 @@ class RequestLog(Base):
         nullable=True
     )
 
+    # Stays timestamp without time zone: Postgres cannot change the type of
+    # a partition key column. Buffered rows are stamped when queued.
     created_at: Mapped[datetime] = mapped_column(
         DateTime,
+        primary_key=True,
         default=datetime.utcnow,
         nullable=False,
         index=True
@@ -7,11 +7,11 @@ from typing import Optional, Dict, Any
 from enum import Enum
 import uuid
 
-from sqlalchemy import String, DateTime, Float, Enum as SQLEnum
+from sqlalchemy import String, DateTime, Float, Index, Enum as SQLEnum, func
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 
-from rag.models.base import Base
+from rag.models.base import Base, uuid7
 
 
 class MetricType(str, Enum):
@@ -32,11 +32,22 @@ class SystemMetric(Base):
     - active_users: Currently active users
     """
     __tablename__ = "system_metrics"
+    __table_args__ = (
+        # Per-name time-range aggregations
+        Index("idx_metric_name_recorded", "metric_name", "recorded_at"),
+        # Label containment filters: SystemMetric.labels.contains({...}) -> @>
+        Index(
+            "ix_system_metrics_labels_gin",
+            "labels",
+            postgresql_using="gin",
+            postgresql_ops={"labels": "jsonb_path_ops"}
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4
+        default=uuid7
     )
 
     metric_name: Mapped[str] = mapped_column(
@@ -45,7 +56,12 @@ class SystemMetric(Base):
     )
 
     metric_type: Mapped[MetricType] = mapped_column(
-        SQLEnum(MetricType),
+        # Store enum values ('counter'), matching the metrictype type in migration 003
+        SQLEnum(
+            MetricType,
+            name="metrictype",
+            values_callable=lambda members: [m.value for m in members]
+        ),
         nullable=False
     )
 
@@ -60,9 +76,12 @@ class SystemMetric(Base):
         nullable=True
     )
 
+    # labels_hash (generated column, migration 010) backs the unique
+    # counter index used by rag.services.metrics_service
+
     recorded_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        default=datetime.utcnow,
+        DateTime(timezone=True),
+        server_default=func.now(),
         nullable=False
     )
 
@@ -4,24 +4,34 @@ File: src/rag/models/token.py
 """
 from datetime import datetime
 from typing import Optional
+import time
 import uuid
 
-from sqlalchemy import String, DateTime, Boolean, Text
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DateTime, Boolean, Text, Index, LargeBinary, func, text
+from sqlalchemy.orm import Mapped, mapped_column, reconstructor
 from sqlalchemy.dialects.postgresql import UUID
 
-from rag.models.base import Base
+from rag.models.base import Base, uuid7
 
 
 class RefreshToken(Base):
     """Refresh token model for JWT token rotation."""
     __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        # Live sessions per user; revoked rows never enter the index.
+        # expires_at cannot go in the predicate (now() is not immutable).
+        Index(
+            "ix_refresh_tokens_user_active",
+            "user_id",
+            postgresql_where=text("is_revoked = false")
+        ),
+    )
     
     # Primary key
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), 
         primary_key=True, 
-        default=uuid.uuid4
+        default=uuid7
     )
     
     # Foreign key to user
@@ -31,9 +41,10 @@ class RefreshToken(Base):
         index=True
     )
     
-    # Token data
-    token: Mapped[str] = mapped_column(
-        String(500), 
+    # Token data: SHA-256 of the JWT (see rag.core.security.hash_refresh_token),
+    # never the token itself
+    token_hash: Mapped[bytes] = mapped_column(
+        LargeBinary(32), 
         unique=True, 
         nullable=False, 
         index=True
@@ -51,14 +62,27 @@ class RefreshToken(Base):
     
     # Timestamp
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, 
-        default=datetime.utcnow
+        DateTime(timezone=True), 
+        server_default=func.now(),
+        nullable=False
     )
     
+    @reconstructor
+    def _init_on_load(self) -> None:
+        """Convert expires_at to a monotonic deadline once per load."""
+        self._expires_at_monotonic = (
+            time.monotonic()
+            + (self.expires_at - datetime.utcnow()).total_seconds()
+        )
+    
     @property
     def is_expired(self) -> bool:
         """Check if token is expired."""
-        return datetime.utcnow() > self.expires_at
+        deadline = getattr(self, "_expires_at_monotonic", None)
+        if deadline is None:
+            # Not loaded from the database (e.g. just created)
+            return datetime.utcnow() > self.expires_at
+        return time.monotonic() > deadline
     
     @property
     def is_valid(self) -> bool:
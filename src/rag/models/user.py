@@ -6,23 +6,25 @@ from datetime import datetime
 from typing import Optional
 import uuid
 
-from sqlalchemy import String, DateTime, Boolean, Integer
+from sqlalchemy import String, DateTime, Boolean, Integer, func
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
-from rag.models.base import Base
+from rag.models.base import Base, random_namespace, uuid7
 
 
 class User(Base):
     """User model with authentication and profile fields."""
     __tablename__ = "users"
+    # Fetch server-generated columns (pinecone_namespace) via RETURNING on insert
+    __mapper_args__ = {"eager_defaults": True}
     
     # Primary key
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), 
         primary_key=True, 
-        default=uuid.uuid4
+        default=uuid7
     )
     
     # Authentication
@@ -53,7 +55,7 @@ class User(Base):
         String(100), 
         unique=True, 
         nullable=False,
-        default=lambda: f"user_{uuid.uuid4().hex[:12]}"
+        server_default=random_namespace()
     )
     
     # Usage tracking
@@ -65,13 +67,15 @@ class User(Base):
 
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, 
-        default=datetime.utcnow
+        DateTime(timezone=True), 
+        server_default=func.now(),
+        nullable=False
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, 
-        default=datetime.utcnow, 
-        onupdate=datetime.utcnow
+        DateTime(timezone=True), 
+        server_default=func.now(), 
+        onupdate=func.now(),
+        nullable=False
     )
     last_login: Mapped[Optional[datetime]] = mapped_column(
         DateTime, 
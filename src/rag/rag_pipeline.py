@@ -2,24 +2,91 @@
 Interactive RAG Pipeline
 Complete end-to-end pipeline with user-friendly CLI interface.
 """
+import asyncio
 import logging
 import sys
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 # Import all your RAG components
 from rag.documents import process_document
-from rag.embeddings import embed_document_chunks
-from rag.vectorstore import store_embedded_documents
-from rag.llm_integration import ask_question, ask_question_detailed
-
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(levelname)s: %(message)s'
-)
+from rag.embeddings import EmbeddingGenerator
+from rag.vectorstore import SimplePineconeStore
+from rag.llm_integration import ask_question, ask_question_detailed, batch_ask, get_rag
+
+try:
+    import readline
+    READLINE_AVAILABLE = True
+except ImportError:
+    readline = None
+    READLINE_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+HISTORY_FILE = Path(".rag_history")
+HISTORY_LENGTH = 1000
+
+
+INGEST_BATCH_SIZE = 64
+
+
+async def ingest_pipeline(doc_path: Path, batch_size: int = INGEST_BATCH_SIZE) -> Tuple[int, int, int]:
+    """
+    Chunk -> embed -> upsert as overlapping stages.
+
+    Chunks are fed to the embedder in batches of batch_size through a queue,
+    and embedded batches go through a second queue to the uploader, so batch
+    N+1 is embedded while batch N is being upserted.
+
+    Returns:
+        (chunks created, chunks embedded, batches that failed to upsert)
+    """
+    chunk_q: asyncio.Queue = asyncio.Queue()
+    embed_q: asyncio.Queue = asyncio.Queue()
+    counts = {"chunks": 0, "embedded": 0, "failed": 0}
+
+    async def chunker():
+        try:
+            chunks = await asyncio.to_thread(process_document, doc_path)
+            counts["chunks"] = len(chunks)
+            for start in range(0, len(chunks), batch_size):
+                await chunk_q.put(chunks[start:start + batch_size])
+        finally:
+            await chunk_q.put(None)
+
+    async def embedder():
+        generator = None
+        try:
+            while (batch := await chunk_q.get()) is not None:
+                if generator is None:
+                    generator = await asyncio.to_thread(EmbeddingGenerator, use_cache=True)
+                docs, mask = await asyncio.to_thread(
+                    generator.embed_documents, batch, return_mask=True
+                )
+                counts["embedded"] += int(mask.sum())
+                await embed_q.put(docs)
+        finally:
+            await embed_q.put(None)
+
+    async def uploader():
+        store = None
+        while (docs := await embed_q.get()) is not None:
+            if store is None:
+                store = SimplePineconeStore()
+                dimension = next(
+                    (len(d['embedding']) for d in docs if d.get('embedding')), 384
+                )
+                if not await asyncio.to_thread(store.create_index_if_not_exists, dimension):
+                    counts["failed"] += 1
+                    store = None
+                    continue
+            if not await asyncio.to_thread(store.upsert_documents, docs):
+                counts["failed"] += 1
+
+    await asyncio.gather(chunker(), embedder(), uploader())
+    return counts["chunks"], counts["embedded"], counts["failed"]
+
 
 def process_new_document(file_path: str) -> bool:
     """
@@ -35,32 +102,22 @@ def process_new_document(file_path: str) -> bool:
         return False
     
     try:
-        # Step 2: Process document into chunks
-        print("🔨 Breaking document into chunks...")
-        chunks = process_document(doc_path)
+        # Step 2: Chunk, embed and store, with the stages overlapping per batch
+        print("🔨 Chunking, embedding and storing document...")
+        num_chunks, num_embedded, failed_batches = asyncio.run(ingest_pipeline(doc_path))
         
-        if not chunks:
+        if not num_chunks:
             print("❌ No chunks created from document")
             return False
         
-        print(f"✅ Created {len(chunks)} chunks")
-        
-        # Step 3: Generate embeddings
-        print("🔢 Generating embeddings...")
-        embedded_chunks = embed_document_chunks(chunks)
-        
-        successful_embeddings = sum(1 for chunk in embedded_chunks if chunk.get('embedding') is not None)
-        print(f"✅ Generated embeddings for {successful_embeddings}/{len(embedded_chunks)} chunks")
+        print(f"✅ Created {num_chunks} chunks")
+        print(f"✅ Generated embeddings for {num_embedded}/{num_chunks} chunks")
         
-        # Step 4: Store in vector database
-        print("📤 Storing in vector database...")
-        success = store_embedded_documents(embedded_chunks)
-        
-        if success:
+        if not failed_batches:
             print("✅ Document successfully ingested into RAG system!")
             return True  
         else:
-            print("❌ Failed to store in vector database")
+            print(f"❌ Failed to store {failed_batches} batch(es) in vector database")
             return False
             
     except Exception as e:
@@ -69,6 +126,35 @@ def process_new_document(file_path: str) -> bool:
         return False
 
 
+def warm_up() -> None:
+    """Load the Gemini client and embedding model ahead of the first question."""
+    try:
+        get_rag().embedder.embed_single_text("warmup")
+    except Exception as e:
+        logger.debug(f"Warmup failed: {e}")
+
+
+def load_history() -> None:
+    """Enable line editing with question history persisted across sessions."""
+    if not READLINE_AVAILABLE:
+        return
+    readline.set_history_length(HISTORY_LENGTH)
+    try:
+        readline.read_history_file(HISTORY_FILE)
+    except (FileNotFoundError, OSError):
+        pass
+
+
+def save_history() -> None:
+    """Write the question history back to disk."""
+    if not READLINE_AVAILABLE:
+        return
+    try:
+        readline.write_history_file(HISTORY_FILE)
+    except OSError as e:
+        logger.debug(f"Could not save history: {e}")
+
+
 def query_interface():
     """
     Interactive query interface for the RAG system.
@@ -76,6 +162,17 @@ def query_interface():
     print("\n🤖 RAG Query Interface")
     print("="*50)
     
+    # Warm up in the background while the user types the first question
+    threading.Thread(target=warm_up, daemon=True).start()
+    load_history()
+    try:
+        _query_loop()
+    finally:
+        save_history()
+
+
+def _query_loop():
+    """Read questions until the user quits."""
     while True:
         try:
             # Get user query
@@ -204,16 +301,24 @@ def quick_demo():
     
     print("Running demo queries...")
     
-    for i, query in enumerate(demo_queries, 1):
+    try:
+        answers = batch_ask(demo_queries)
+    except Exception as e:
+        print(f"   Error: {e}")
+        return
+    
+    for i, (query, answer) in enumerate(zip(demo_queries, answers), 1):
         print(f"\n{i}. Query: {query}")
-        try:
-            answer = ask_question(query)
-            print(f"   Answer: {answer[:200]}...")
-        except Exception as e:
-            print(f"   Error: {e}")
+        print(f"   Answer: {answer[:200]}...")
 
 
 if __name__ == "__main__":
+    # Setup logging (CLI only; importing this module must not reconfigure it)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(levelname)s: %(message)s'
+    )
+    
     # Check if running in demo mode
     if len(sys.argv) > 1 and sys.argv[1] == 'demo':
         quick_demo()
@@ -6,7 +6,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class Token(BaseModel):
@@ -19,25 +19,32 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     """Data extracted from JWT token."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
     user_id: Optional[UUID] = None
     username: Optional[str] = None
     exp: Optional[datetime] = None
 
 class LoginRequest(BaseModel):
-    email: str  # ← Changed from username
-    password: str
-    
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        extra="forbid",
+        json_schema_extra={
             "example": {
                 "email": "user@example.com",
                 "password": "SecurePass123"
             }
-        }   
+        }
+    )
+    
+    email: str  # ← Changed from username
+    password: str
 
 
 class RefreshTokenRequest(BaseModel):
     """Refresh token request."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
     refresh_token: str
 
 
@@ -5,7 +5,7 @@ from datetime import datetime
 from uuid import UUID
 from typing import Optional, List
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class DocumentUploadResponse(BaseModel):
@@ -55,45 +55,73 @@ class DocumentDetail(BaseModel):
 
 class ChatRequest(BaseModel):
     """Request for chat endpoint."""
-    message: str = Field(..., min_length=1, max_length=5000)
-    session_id: Optional[str] = None  # For conversation context
-    
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        extra="forbid",
+        str_strip_whitespace=True,
+        json_schema_extra={
             "example": {
                 "message": "What are the main points in the document?",
                 "session_id": "conv-123-abc"
             }
         }
+    )
+    
+    message: str = Field(..., min_length=1, max_length=5000)
+    session_id: Optional[str] = None  # For conversation context
+
+
+class SourceRef(BaseModel):
+    """Retrieved chunk cited in a chat answer."""
+    document: str
+    chunk_index: int
+    relevance_score: float
+    preview: str
 
 
 class ChatResponse(BaseModel):
     """Response from chat endpoint."""
-    session_id: str
-    message: str
-    role: str = "assistant"
-    retrieved_chunks: int
-    sources: List[dict]  # Which documents/chunks were used
-    
-    class Config:
-        json_schema_extra = {
+    # extra stays "ignore": the service returns model_used, which is filtered out
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "session_id": "conv-123-abc",
                 "message": "Based on the documents...",
                 "role": "assistant",
                 "retrieved_chunks": 3,
                 "sources": [
-                    {"document": "report.pdf", "chunk": 2},
-                    {"document": "notes.txt", "chunk": 5}
+                    {
+                        "document": "report.pdf",
+                        "chunk_index": 2,
+                        "relevance_score": 0.92,
+                        "preview": "The study shows that..."
+                    }
                 ]
             }
         }
+    )
+    
+    session_id: str
+    message: str
+    role: str = "assistant"
+    retrieved_chunks: int
+    sources: List[SourceRef]  # Which documents/chunks were used
+
+
+class ChatMessageItem(BaseModel):
+    """Single message in a chat session."""
+    id: str
+    role: str
+    content: str
+    created_at: str
+    retrieved_chunks: Optional[int] = None
 
 
 class ChatHistoryResponse(BaseModel):
     """Chat history for a session."""
     session_id: str
-    messages: List[dict]
+    messages: List[ChatMessageItem]
     total_messages: int
 
     
\ No newline at end of file
@@ -7,7 +7,7 @@ from typing import Optional, Dict, Any
 from uuid import UUID
 from enum import Enum
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class MetricType(str, Enum):
@@ -19,6 +19,8 @@ class MetricType(str, Enum):
 
 class RequestLogCreate(BaseModel):
     """Schema for creating a request log entry."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
     request_id: str = Field(
         ...,
         description="Correlation ID for request tracing",
@@ -69,6 +71,8 @@ class RequestLogResponse(RequestLogCreate):
 
 class SystemMetricCreate(BaseModel):
     """Schema for creating a system metric entry."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
     metric_name: str = Field(
         ...,
         description="Metric identifier",
@@ -11,6 +11,8 @@ from pydantic import BaseModel, Field, ConfigDict
 
 class QueryRequest(BaseModel):
     """RAG query request."""
+    model_config = ConfigDict(frozen=True, extra="forbid", str_strip_whitespace=True)
+    
     query: str = Field(..., min_length=3, max_length=1000)
     top_k: int = Field(default=5, ge=1, le=20)
 
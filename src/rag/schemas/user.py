@@ -18,6 +18,9 @@ class UserBase(BaseModel):
 
 class UserCreate(UserBase):
     """Schema for user registration."""
+    # extra stays "ignore": the register form also sends confirmPassword
+    model_config = ConfigDict(frozen=True)
+    
     password: str = Field(..., min_length=8, max_length=100)
 
 
@@ -0,0 +1,290 @@
+"""
+Semantic (proximity) cache keyed by embedding vectors.
+File: src/rag/semantic_cache.py
+
+A lookup hits when a stored vector is within a cosine-similarity threshold
+of the query vector, so paraphrased questions can reuse earlier results.
+
+Lookups use random-projection LSH: every vector is hashed to an n-bit
+bucket key, and only the query's bucket plus its 1-bit-flip neighbours
+(multi-probe) are compared exactly. This keeps lookups sublinear in the
+number of cached entries.
+
+Stored vectors are quantized to int8 with a symmetric per-vector scale,
+a quarter of the FP32 footprint. The candidate sweep accumulates int8 dot
+products in int32 and rescales by both scales. It runs in a Numba-compiled
+kernel when numba is installed, and falls back to NumPy otherwise.
+
+ProximityCacheGroup keeps a separate cache per scope (e.g. per user), so
+one user's results are never served to another and a scope can be
+invalidated on its own.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    njit = None
+    prange = range
+    NUMBA_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def quantize(vector: np.ndarray) -> Tuple[np.ndarray, float]:
+    """Symmetric int8 quantization: returns (int8 vector, scale)."""
+    peak = float(np.max(np.abs(vector)))
+    if peak == 0.0:
+        return np.zeros(vector.shape, dtype=np.int8), 0.0
+    scale = peak / 127.0
+    return np.round(vector / scale).astype(np.int8), scale
+
+
+def _best_match_numpy(
+    vectors: np.ndarray,
+    scales: np.ndarray,
+    slots: np.ndarray,
+    query: np.ndarray,
+    query_scale: float
+) -> Tuple[int, float]:
+    """Index into slots of the row most similar to query, and its score."""
+    dots = np.einsum(
+        'ij,j->i',
+        vectors[slots].astype(np.int32),
+        query.astype(np.int32)
+    )
+    sims = dots * scales[slots] * query_scale
+    best = int(np.argmax(sims))
+    return best, float(sims[best])
+
+
+def _best_match_kernel(vectors, scales, slots, query, query_scale):
+    """Int8 dot product sweep over the candidate rows (compiled by numba)."""
+    n = slots.shape[0]
+    dim = query.shape[0]
+    sims = np.empty(n, dtype=np.float32)
+    for i in prange(n):
+        row = slots[i]
+        acc = np.int32(0)
+        for j in range(dim):
+            acc += np.int32(vectors[row, j]) * np.int32(query[j])
+        sims[i] = acc * scales[row] * query_scale
+    best = np.argmax(sims)
+    return best, sims[best]
+
+
+if NUMBA_AVAILABLE:
+    _best_match_jit = njit(parallel=True, fastmath=True, cache=True)(_best_match_kernel)
+
+    def best_match(
+        vectors: np.ndarray,
+        scales: np.ndarray,
+        slots: np.ndarray,
+        query: np.ndarray,
+        query_scale: float
+    ) -> Tuple[int, float]:
+        """Index into slots of the row most similar to query, and its score."""
+        best, score = _best_match_jit(
+            vectors, scales, slots, query, np.float32(query_scale)
+        )
+        return int(best), float(score)
+else:
+    best_match = _best_match_numpy
+
+
+class ProximityCache:
+    """Bounded similarity cache with LSH bucket lookup."""
+
+    def __init__(
+        self,
+        dim: int,
+        capacity: int = 10000,
+        threshold: float = 0.95,
+        n_bits: int = 16,
+        seed: int = 0
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            dim: Embedding dimension
+            capacity: Max entries kept (oldest entries are overwritten)
+            threshold: Minimum cosine similarity for a hit
+            n_bits: Number of LSH hyperplanes (bucket key width)
+            seed: Seed for the random hyperplanes
+        """
+        self.dim = dim
+        self.capacity = capacity
+        self.threshold = threshold
+        self.n_bits = n_bits
+
+        rng = np.random.default_rng(seed)
+        self._planes = rng.standard_normal((dim, n_bits)).astype(np.float32)
+
+        # Int8-quantized unit vectors, one row per slot (ring buffer)
+        self._vectors = np.zeros((capacity, dim), dtype=np.int8)
+        self._scales = np.zeros(capacity, dtype=np.float32)
+        self._values: List[Any] = [None] * capacity
+        self._slot_keys: List[Optional[int]] = [None] * capacity
+        self._buckets: Dict[int, List[int]] = {}
+
+        self._next_slot = 0
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def _normalize(vector) -> Optional[np.ndarray]:
+        """Return a float32 unit vector, or None for a zero vector."""
+        vec = np.asarray(vector, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(vec))
+        if norm == 0.0:
+            return None
+        return vec / norm
+
+    def _bucket_key(self, unit_vec: np.ndarray) -> int:
+        """Hash a unit vector to its LSH bucket key."""
+        bits = (unit_vec @ self._planes) > 0
+        packed = np.packbits(bits, bitorder="little")
+        return int.from_bytes(packed.tobytes(), "little")
+
+    def _probe_keys(self, key: int) -> List[int]:
+        """Bucket key plus all keys one bit-flip away."""
+        return [key] + [key ^ (1 << b) for b in range(self.n_bits)]
+
+    def lookup(self, vector) -> Optional[Any]:
+        """
+        Find the cached value closest to vector.
+
+        Returns:
+            Cached value if best similarity >= threshold, None otherwise
+        """
+        query = self._normalize(vector)
+        if query is None:
+            return None
+
+        with self._lock:
+            if self._size == 0:
+                return None
+
+            candidates: List[int] = []
+            for key in self._probe_keys(self._bucket_key(query)):
+                candidates.extend(self._buckets.get(key, ()))
+
+            if not candidates:
+                return None
+
+            slots = np.fromiter(candidates, dtype=np.intp, count=len(candidates))
+            query_q, query_scale = quantize(query)
+            best, score = best_match(
+                self._vectors, self._scales, slots, query_q, query_scale
+            )
+
+            if score < self.threshold:
+                return None
+
+            return self._values[slots[best]]
+
+    def insert(self, vector, value: Any) -> None:
+        """Store value under vector, overwriting the oldest slot when full."""
+        unit_vec = self._normalize(vector)
+        if unit_vec is None:
+            return
+
+        key = self._bucket_key(unit_vec)
+
+        with self._lock:
+            slot = self._next_slot
+
+            # Evict whatever occupied this slot before
+            old_key = self._slot_keys[slot]
+            if old_key is not None:
+                bucket = self._buckets[old_key]
+                bucket.remove(slot)
+                if not bucket:
+                    del self._buckets[old_key]
+            else:
+                self._size += 1
+
+            self._vectors[slot], self._scales[slot] = quantize(unit_vec)
+            self._values[slot] = value
+            self._slot_keys[slot] = key
+            self._buckets.setdefault(key, []).append(slot)
+
+            self._next_slot = (slot + 1) % self.capacity
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._values = [None] * self.capacity
+            self._slot_keys = [None] * self.capacity
+            self._buckets.clear()
+            self._next_slot = 0
+            self._size = 0
+
+
+class ProximityCacheGroup:
+    """One ProximityCache per scope (e.g. per user), LRU-bounded by scope count."""
+
+    def __init__(
+        self,
+        dim: int,
+        capacity: int = 256,
+        threshold: float = 0.95,
+        max_scopes: int = 256
+    ):
+        """
+        Initialize the group.
+
+        Args:
+            dim: Embedding dimension
+            capacity: Max entries per scope
+            threshold: Minimum cosine similarity for a hit
+            max_scopes: Scopes kept; the least recently used one is dropped
+        """
+        self.dim = dim
+        self.capacity = capacity
+        self.threshold = threshold
+        self.max_scopes = max_scopes
+
+        self._caches: "OrderedDict[Hashable, ProximityCache]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, scope: Hashable, create: bool) -> Optional[ProximityCache]:
+        """Cache for a scope, marked most recently used."""
+        with self._lock:
+            cache = self._caches.get(scope)
+            if cache is None:
+                if not create:
+                    return None
+                cache = ProximityCache(self.dim, self.capacity, self.threshold)
+                self._caches[scope] = cache
+                if len(self._caches) > self.max_scopes:
+                    self._caches.popitem(last=False)
+            self._caches.move_to_end(scope)
+            return cache
+
+    def lookup(self, scope: Hashable, vector) -> Optional[Any]:
+        """Find the cached value closest to vector within a scope."""
+        cache = self._get(scope, create=False)
+        return None if cache is None else cache.lookup(vector)
+
+    def insert(self, scope: Hashable, vector, value: Any) -> None:
+        """Store value under vector within a scope."""
+        self._get(scope, create=True).insert(vector, value)
+
+    def invalidate(self, scope: Hashable) -> None:
+        """Drop every entry of a scope (e.g. after its data changed)."""
+        with self._lock:
+            self._caches.pop(scope, None)
+
+    def __len__(self) -> int:
+        return len(self._caches)
@@ -15,9 +15,14 @@ WHAT IT DOES:
 - register_new_user(): Registration flow  
 - refresh_tokens(): Token refresh flow
 """
-from typing import Optional, Tuple
+from collections import OrderedDict
+from typing import Optional, Set, Tuple
 from datetime import timedelta
 from uuid import UUID
+import asyncio
+import logging
+import threading
+import time
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -35,7 +40,50 @@ from rag.core.security import (
 from rag.core.config import get_settings
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
+# last_login writes still in flight; referenced so they are not garbage collected
+_background_tasks: Set[asyncio.Task] = set()
+
+# Active users seen by a recent refresh: user_id -> (monotonic deadline,
+# username). Saves the users lookup on repeat refreshes; the refresh_tokens
+# row is still read every time. Logout, logout-all and deactivation drop
+# the entry in this process; on other workers a deactivated user can keep
+# refreshing for up to the TTL.
+REFRESH_USER_CACHE_SIZE = 50_000
+REFRESH_USER_CACHE_TTL = 60.0
+_refresh_user_cache: "OrderedDict[UUID, Tuple[float, str]]" = OrderedDict()
+_refresh_user_cache_lock = threading.Lock()
+
+
+def _get_cached_username(user_id: UUID) -> Optional[str]:
+    """Return the username if the user was confirmed active recently."""
+    with _refresh_user_cache_lock:
+        cached = _refresh_user_cache.get(user_id)
+        if cached is None:
+            return None
+        if time.monotonic() >= cached[0]:
+            del _refresh_user_cache[user_id]
+            return None
+        _refresh_user_cache.move_to_end(user_id)
+        return cached[1]
+
+
+def _cache_user(user: User) -> None:
+    """Remember an active user for the TTL."""
+    with _refresh_user_cache_lock:
+        _refresh_user_cache[user.id] = (
+            time.monotonic() + REFRESH_USER_CACHE_TTL, user.username
+        )
+        _refresh_user_cache.move_to_end(user.id)
+        if len(_refresh_user_cache) > REFRESH_USER_CACHE_SIZE:
+            _refresh_user_cache.popitem(last=False)
+
+
+def _forget_user(user_id: UUID) -> None:
+    """Drop a user's cache entry."""
+    with _refresh_user_cache_lock:
+        _refresh_user_cache.pop(user_id, None)
 
 
 async def authenticate_user(
@@ -89,7 +137,8 @@ async def create_user_tokens(
     1. Generate JWT access token (30 mins)
     2. Generate JWT refresh token (7 days)
     3. Save refresh token to database
-    4. Return both tokens
+    4. Schedule the last login update (background task)
+    5. Return both tokens
     
     WHY SEPARATE FUNCTION:
     - Used in login
@@ -114,7 +163,8 @@ async def create_user_tokens(
         data={"sub": str(user.id)}
     )
     
-    # Save refresh token to database for tracking
+    # Save refresh token to database before handing it out, so refresh,
+    # logout and revoke-all always find its row
     await token_crud.create_refresh_token(
         db=db,
         user_id=user.id,
@@ -123,8 +173,10 @@ async def create_user_tokens(
         ip_address=ip_address
     )
     
-    # Update user's last login timestamp
-    await user_crud.update_last_login(db, user.id)
+    # last_login is informational only, so it is written off the response path
+    task = asyncio.create_task(_persist_last_login(db.bind, user.id))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
     
     return Token(
         access_token=access_token,
@@ -134,6 +186,21 @@ async def create_user_tokens(
     )
 
 
+async def _persist_last_login(bind, user_id: UUID) -> None:
+    """Stamp the user's last_login in its own session."""
+    try:
+        async with AsyncSession(bind, expire_on_commit=False) as session:
+            await user_crud.update_last_login(session, user_id)
+    except Exception as e:
+        logger.error(f"❌ Failed to update last login for user {user_id}: {e}")
+
+
+async def wait_for_pending_logins() -> None:
+    """Let in-flight last_login writes finish (called on shutdown)."""
+    if _background_tasks:
+        await asyncio.gather(*_background_tasks, return_exceptions=True)
+
+
 async def register_new_user(
     db: AsyncSession,
     user_data: UserCreate
@@ -158,14 +225,13 @@ async def register_new_user(
     Raises:
         ValueError: If email/username already exists
     """
-    # Check if email already registered
-    existing_user = await user_crud.get_user_by_email(db, user_data.email)
-    if existing_user:
+    # Check email and username in a single query
+    matches = await user_crud.get_email_username_matches(
+        db, user_data.email, user_data.username
+    )
+    if any(email == user_data.email for email, _ in matches):
         raise ValueError("Email already registered")
-    
-    # Check if username already taken
-    existing_user = await user_crud.get_user_by_username(db, user_data.username)
-    if existing_user:
+    if any(username == user_data.username for _, username in matches):
         raise ValueError("Username already taken")
     
     # Create user (password hashing happens in CRUD layer)
@@ -189,7 +255,7 @@ async def refresh_user_tokens(
     FLOW:
     1. Decode refresh token
     2. Verify token exists in database and not revoked
-    3. Get user from token
+    3. Get user from token (cached per user)
     4. Generate new access token
     5. Optionally rotate refresh token (more secure)
     6. Return new tokens
@@ -212,7 +278,8 @@ async def refresh_user_tokens(
     if not payload:
         return None
     
-    # Check if token exists in database and is valid
+    # Check if token exists in database and is valid (every refresh, so a
+    # revocation on any worker takes effect immediately)
     db_token = await token_crud.get_refresh_token(db, refresh_token)
     
     if not db_token or not db_token.is_valid:
@@ -223,14 +290,21 @@ async def refresh_user_tokens(
     if not user_id_str:
         return None
     
-    user = await user_crud.get_user_by_id(db, UUID(user_id_str))
+    user_id = UUID(user_id_str)
+    username = _get_cached_username(user_id)
     
-    if not user or not user.is_active:
-        return None
+    if username is None:
+        user = await user_crud.get_user_by_id(db, user_id)
+        
+        if not user or not user.is_active:
+            return None
+        
+        _cache_user(user)
+        username = user.username
     
     # Create new access token
     access_token = create_access_token(
-        data={"sub": str(user.id), "username": user.username}
+        data={"sub": str(user_id), "username": username}
     )
     
     # SECURITY: Optional token rotation (issue new refresh token)
@@ -260,6 +334,9 @@ async def logout_user(
     Returns:
         True if successful, False otherwise
     """
+    payload = decode_refresh_token(refresh_token)
+    if payload and payload.get("sub"):
+        _forget_user(UUID(payload["sub"]))
     return await token_crud.revoke_token(db, refresh_token)
 
 
@@ -278,4 +355,26 @@ async def logout_all_sessions(
     Returns:
         Number of tokens revoked
     """
-    return await token_crud.revoke_all_user_tokens(db, user_id)
\ No newline at end of file
+    _forget_user(user_id)
+    return await token_crud.revoke_all_user_tokens(db, user_id)
+
+
+async def deactivate_account(
+    db: AsyncSession,
+    user_id: UUID
+) -> Optional[User]:
+    """
+    Deactivate a user and end all their sessions.
+    
+    FLOW:
+    1. Revoke all the user's refresh tokens
+    2. Mark the account inactive
+    3. Drop the user from the refresh cache
+    
+    Returns:
+        Updated User object, None if not found
+    """
+    await token_crud.revoke_all_user_tokens(db, user_id)
+    user = await user_crud.deactivate_user(db, user_id)
+    _forget_user(user_id)
+    return user
\ No newline at end of file
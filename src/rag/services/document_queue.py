@@ -0,0 +1,135 @@
+"""
+Document processing worker queue.
+File: src/rag/services/document_queue.py
+
+Uploads only save the file and create the documents row (status="pending");
+chunking, embedding and the Pinecone upsert run on a small pool of worker
+tasks that each open their own database session. The frontend polls
+GET /documents/{id} for the status.
+
+Queued documents live in memory only: on startup, recover() queues the
+rows an earlier run left "pending" or "processing".
+
+Usage:
+    queue = get_document_queue()
+    queue.enqueue(document.id, file_path, user_id)
+"""
+import asyncio
+import logging
+from typing import List, Optional, Set, Tuple
+from uuid import UUID
+
+from rag.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+Job = Tuple[UUID, str, UUID]
+
+
+class DocumentQueue:
+    """Queue of uploaded documents processed by background workers."""
+
+    def __init__(self, session_factory=None, workers: int = 2):
+        """
+        Initialize the queue.
+
+        Args:
+            session_factory: Async session factory (defaults to AsyncSessionLocal)
+            workers: Documents processed concurrently
+        """
+        if session_factory is None:
+            from rag.core.database import AsyncSessionLocal
+            session_factory = AsyncSessionLocal
+
+        self.session_factory = session_factory
+        self.workers = workers
+
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+        self._active: Set[asyncio.Task] = set()
+
+    def enqueue(self, document_id: UUID, file_path: str, user_id: UUID) -> None:
+        """Queue a saved document for processing."""
+        self._queue.put_nowait((document_id, file_path, user_id))
+        logger.info(f"📥 Document {document_id} queued ({self._queue.qsize()} waiting)")
+
+    def pending(self) -> int:
+        """Number of documents waiting for a worker."""
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        """Start the worker tasks."""
+        self._tasks = [t for t in self._tasks if not t.done()]
+        while len(self._tasks) < self.workers:
+            self._tasks.append(asyncio.create_task(self._run()))
+
+    async def stop(self) -> None:
+        """Finish the documents being processed, then stop the workers."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await asyncio.gather(*self._active, return_exceptions=True)
+
+        if not self._queue.empty():
+            # Rows stay "pending"; recover() queues them again on the next start
+            logger.warning(f"⚠️ {self._queue.qsize()} queued documents left for the next start")
+
+    async def recover(self) -> int:
+        """
+        Queue documents left unfinished by the previous run.
+
+        Documents still "pending" were never picked up; documents still
+        "processing" were interrupted mid-pipeline and are set back to
+        "pending". Assumes one application process owns the queue.
+
+        Returns:
+            Number of documents queued
+        """
+        from rag.crud import document as document_crud
+
+        async with self.session_factory() as session:
+            jobs = await document_crud.reset_unfinished_documents(session)
+        for job in jobs:
+            self.enqueue(*job)
+        if jobs:
+            logger.info(f"♻️ Re-queued {len(jobs)} unfinished documents")
+        return len(jobs)
+
+    async def process(self, job: Job) -> bool:
+        """Run the ingestion pipeline for one document in its own session."""
+        from rag.services.rag_service import process_document_pipeline
+
+        document_id, file_path, user_id = job
+        try:
+            async with self.session_factory() as session:
+                return await process_document_pipeline(session, document_id, file_path, user_id)
+        except Exception as e:
+            logger.error(f"❌ Worker failed on document {document_id}: {e}")
+            return False
+
+    async def _run(self) -> None:
+        """Process queued documents one at a time."""
+        while True:
+            job = await self._queue.get()
+            task = asyncio.create_task(self.process(job))
+            self._active.add(task)
+            task.add_done_callback(self._active.discard)
+            try:
+                # Shielded so stop() lets the current document finish
+                await asyncio.shield(task)
+            finally:
+                self._queue.task_done()
+
+
+# Singleton instance
+_document_queue: Optional[DocumentQueue] = None
+
+
+def get_document_queue() -> DocumentQueue:
+    """Get or create the document queue singleton."""
+    global _document_queue
+    if _document_queue is None:
+        settings = get_settings()
+        _document_queue = DocumentQueue(workers=settings.document_workers)
+    return _document_queue
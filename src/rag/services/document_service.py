@@ -11,12 +11,17 @@ Handles the complete document ingestion pipeline:
 5. Store in Pinecone (user's namespace)
 6. Save metadata to PostgreSQL
 """
+import asyncio
 import logging
+import shutil
 import uuid
+from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import Any, Callable, Dict, List, Optional
 import json
 
+from fastapi import UploadFile
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from rag.models.user import User
@@ -24,39 +29,87 @@ from rag.models.document import DocumentMetadata
 from rag.documents import process_document  #  existing code
 from rag.embeddings import embed_document_chunks  # existing code
 from rag.core.config import get_settings  # existing code
-from rag.vectorstore import store_embedded_documents  # existing code
+from rag.vectorstore import store_embedded_documents, get_pinecone_store  # existing code
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# Pinecone request limits: ~100 vectors (2 MB) per upsert, 1000 ids per delete
+UPSERT_BATCH_SIZE = 100
+DELETE_BATCH_SIZE = 1000
+# Max Pinecone requests in flight per call, to stay under rate limits
+MAX_CONCURRENT_PINECONE_REQUESTS = 8
+# Bytes read from an upload per await
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+
+async def _get_index():
+    """Shared Pinecone Index handle (client and connection built once per process)."""
+    store = get_pinecone_store()
+    if store.index is None and not await asyncio.to_thread(store.connect_to_index):
+        raise RuntimeError(f"Pinecone index {store.index_name} unavailable")
+    return store.index
+
+
+async def run_batched(
+    func: Callable[..., Any],
+    items: List[Any],
+    batch_size: int,
+    arg_name: str,
+    **kwargs
+) -> None:
+    """
+    Call a blocking Pinecone method on fixed-size slices of items, concurrently.
+    
+    Each slice runs in a worker thread so the event loop stays free, and
+    at most MAX_CONCURRENT_PINECONE_REQUESTS slices are in flight at once.
+    
+    Args:
+        func: Blocking client method (e.g. index.upsert)
+        items: Vectors or ids to send
+        batch_size: Items per request
+        arg_name: Keyword the slice is passed as ("vectors", "ids")
+        **kwargs: Extra keyword arguments for every call (e.g. namespace)
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_PINECONE_REQUESTS)
+    
+    async def send(batch: List[Any]) -> None:
+        async with semaphore:
+            await asyncio.to_thread(func, **{arg_name: batch}, **kwargs)
+    
+    await asyncio.gather(*[
+        send(items[i:i + batch_size])
+        for i in range(0, len(items), batch_size)
+    ])
+
+
+def _copy_file(source, file_path: Path) -> None:
+    """Copy a file object to disk in UPLOAD_CHUNK_SIZE pieces."""
+    with open(file_path, 'wb') as f:
+        shutil.copyfileobj(source, f, UPLOAD_CHUNK_SIZE)
+
 
 async def save_uploaded_file(
-    file_content: bytes,
-    filename: str,
+    upload: UploadFile,
     user_id: uuid.UUID
 ) -> Path:
     """
     Save uploaded file to disk.
     
     Files stored as: data/uploads/{user_id}/{filename}
-    This keeps user files isolated.
+    This keeps user files isolated. The upload is streamed in
+    UPLOAD_CHUNK_SIZE pieces, so memory use does not grow with file size.
     """
     # Create user's upload directory
     user_upload_dir = settings.upload_dir / str(user_id)
-    user_upload_dir.mkdir(parents=True, exist_ok=True)
+    await asyncio.to_thread(user_upload_dir.mkdir, parents=True, exist_ok=True)
     
-    # Generate unique filename (prevent overwrite)
-    file_path = user_upload_dir / filename
-    counter = 1
-    while file_path.exists():
-        stem = Path(filename).stem
-        suffix = Path(filename).suffix
-        file_path = user_upload_dir / f"{stem}_{counter}{suffix}"
-        counter += 1
+    # Unique filename (prevent overwrite) without probing the directory
+    name = Path(upload.filename)
+    file_path = user_upload_dir / f"{name.stem}_{uuid.uuid4().hex[:8]}{name.suffix}"
     
-    # Save file
-    with open(file_path, 'wb') as f:
-        f.write(file_content)
+    # Save file (off the event loop, one thread hop for the whole copy)
+    await asyncio.to_thread(_copy_file, upload.file, file_path)
     
     logger.info(f"✅ Saved file: {file_path}")
     return file_path
@@ -80,13 +133,15 @@ async def process_and_store_document(
     Returns:
         DocumentMetadata object
     """
+    file_stat = await asyncio.to_thread(file_path.stat)
+    
     # Create database record (mark as processing)
     doc_metadata = DocumentMetadata(
         user_id=user.id,
         filename=file_path.name,
         original_filename=original_filename,
         file_type=file_path.suffix,
-        file_size=file_path.stat().st_size,
+        file_size=file_stat.st_size,
         embedding_model=settings.embedding_model,
         processing_status="processing"
     )
@@ -97,7 +152,7 @@ async def process_and_store_document(
     try:
         # Step 1: Process document (chunking)
         logger.info(f"📄 Processing document: {file_path}")
-        chunks = process_document(file_path)
+        chunks = await asyncio.to_thread(process_document, file_path)
         
         if not chunks:
             raise ValueError("No content extracted from document")
@@ -106,7 +161,7 @@ async def process_and_store_document(
         
         # Step 2: Generate embeddings
         logger.info("🔢 Generating embeddings...")
-        embedded_chunks = embed_document_chunks(chunks)
+        embedded_chunks = await asyncio.to_thread(embed_document_chunks, chunks)
         
         successful_embeddings = sum(
             1 for chunk in embedded_chunks 
@@ -122,37 +177,28 @@ async def process_and_store_document(
             document_id=str(doc_metadata.id)
         )
         
-        # Step 4: Update database metadata
-        from sqlalchemy import update
-        from datetime import datetime
+        # Step 4: Update database metadata. Set on the loaded row, so the
+        # object is current after the commit without a refresh SELECT
+        doc_metadata.chunk_count = len(chunks)
+        doc_metadata.processing_status = "completed"
+        doc_metadata.processed_at = datetime.utcnow()
+        doc_metadata.pinecone_ids = json.dumps(pinecone_ids)
         
+        # Update user's document count in the same transaction
         await db.execute(
-            update(DocumentMetadata)
-            .where(DocumentMetadata.id == doc_metadata.id)
-            .values(
-                chunk_count=len(chunks),
-                processing_status="completed",
-                processed_at=datetime.utcnow(),
-                pinecone_ids=json.dumps(pinecone_ids)
-            )
+            update(User)
+            .where(User.id == user.id)
+            .values(document_count=User.document_count + 1)
         )
         await db.commit()
         
-        # Update user's document count
-        from rag.crud import user as user_crud
-        await user_crud.increment_document_count(db, user.id)
-        
         logger.info(f"✅ Document processed successfully: {doc_metadata.id}")
-        
-        # Refresh to get updated data
-        await db.refresh(doc_metadata)
         return doc_metadata
         
     except Exception as e:
         logger.error(f"❌ Document processing failed: {e}")
         
         # Update status to failed
-        from sqlalchemy import update
         await db.execute(
             update(DocumentMetadata)
             .where(DocumentMetadata.id == doc_metadata.id)
@@ -182,23 +228,17 @@ async def store_in_pinecone(
     Returns:
         List of Pinecone vector IDs
     """
-    from pinecone import Pinecone
-    
-    pc = Pinecone(api_key=settings.pinecone_api_key)
-    index = pc.Index(settings.pinecone_index_name)
+    index = await _get_index()
     
-    vectors = []
-    pinecone_ids = []
+    # Only chunks that got an embedding; IDs are {document_id}_{chunk position}
+    valid = [
+        (i, chunk) for i, chunk in enumerate(embedded_chunks)
+        if chunk.get('embedding') is not None
+    ]
+    pinecone_ids = [f"{document_id}_{i}" for i, _ in valid]
     
-    for i, chunk in enumerate(embedded_chunks):
-        if chunk.get('embedding') is None:
-            continue
-        
-        # Generate unique ID: {document_id}_{chunk_index}
-        vector_id = f"{document_id}_{i}"
-        pinecone_ids.append(vector_id)
-        
-        vector = {
+    vectors = [
+        {
             'id': vector_id,
             'values': chunk['embedding'],
             'metadata': {
@@ -208,16 +248,31 @@ async def store_in_pinecone(
                 'document_id': document_id
             }
         }
-        vectors.append(vector)
+        for vector_id, (i, chunk) in zip(pinecone_ids, valid)
+    ]
     
-    # Upsert to Pinecone with namespace
+    # Upsert to Pinecone with namespace, in request-sized batches
     if vectors:
-        index.upsert(vectors=vectors, namespace=namespace)
+        await run_batched(
+            index.upsert, vectors, UPSERT_BATCH_SIZE, "vectors", namespace=namespace
+        )
         logger.info(f"✅ Stored {len(vectors)} vectors in namespace: {namespace}")
     
     return pinecone_ids
 
 
+async def _delete_vectors(pinecone_ids: Optional[str], namespace: str) -> None:
+    """Delete a document's vectors (JSON list of IDs) from Pinecone."""
+    if not pinecone_ids:
+        return
+    index = await _get_index()
+    vector_ids = json.loads(pinecone_ids)
+    await run_batched(
+        index.delete, vector_ids, DELETE_BATCH_SIZE, "ids", namespace=namespace
+    )
+    logger.info(f"✅ Deleted {len(vector_ids)} vectors from Pinecone")
+
+
 async def delete_document(
     db: AsyncSession,
     user: User,
@@ -228,12 +283,10 @@ async def delete_document(
     
     STEPS:
     1. Get document metadata
-    2. Delete vectors from Pinecone
-    3. Delete file from disk
-    4. Delete metadata from database
+    2. Delete vectors from Pinecone + file from disk (concurrently)
+    3. Delete metadata from database
     """
     # Get document
-    from sqlalchemy import select
     result = await db.execute(
         select(DocumentMetadata).where(
             DocumentMetadata.id == document_id,
@@ -246,31 +299,17 @@ async def delete_document(
         return False
     
     try:
-        # Delete from Pinecone
-        if doc.pinecone_ids:
-            from pinecone import Pinecone
-            
-            pc = Pinecone(api_key=settings.pinecone_api_key)
-            index = pc.Index(settings.pinecone_index_name)
-            
-            vector_ids = json.loads(doc.pinecone_ids)
-            index.delete(ids=vector_ids, namespace=user.pinecone_namespace)
-            logger.info(f"✅ Deleted {len(vector_ids)} vectors from Pinecone")
-        
-        # Delete file from disk
-        user_upload_dir = settings.upload_dir / str(user.id)
-        file_path = user_upload_dir / doc.filename
-        if file_path.exists():
-            file_path.unlink()
-            logger.info(f"✅ Deleted file: {file_path}")
+        # Pinecone and disk cleanup are independent, so run them concurrently.
+        # The row is deleted only after both succeed, so a failure leaves it
+        # in place for a retry.
+        file_path = settings.upload_dir / str(user.id) / doc.filename
+        await asyncio.gather(
+            _delete_vectors(doc.pinecone_ids, user.pinecone_namespace),
+            asyncio.to_thread(file_path.unlink, missing_ok=True)
+        )
         
-        # Delete from database
+        # Delete from database and update user's document count, one commit
         await db.delete(doc)
-        await db.commit()
-        
-        # Update user's document count
-        from rag.crud import user as user_crud
-        from sqlalchemy import update
         await db.execute(
             update(User)
             .where(User.id == user.id)
@@ -291,8 +330,6 @@ async def get_user_documents(
     user_id: uuid.UUID
 ) -> List[DocumentMetadata]:
     """Get all documents for a user."""
-    from sqlalchemy import select
-    
     result = await db.execute(
         select(DocumentMetadata)
         .where(DocumentMetadata.user_id == user_id)
@@ -6,18 +6,105 @@ Handles:
 - Password reset emails
 - User notifications
 - Welcome emails
+
+Emails go straight to the Resend REST API through one shared
+httpx.AsyncClient, so sends don't block the event loop and reuse
+pooled connections.
 """
+import asyncio
 import logging
-from typing import Optional
+from string import Template
+from typing import Any, Dict, Optional
+
+import httpx
+
 from rag.core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
-# Try to import Resend, but make it optional
-try:
-    from resend import Resend
-except ImportError:
-    Resend = None
+RESEND_API_URL = "https://api.resend.com"
+
+# Sends run in the background, so transient failures are retried here:
+# attempt n waits EMAIL_RETRY_BASE_DELAY * 2**(n-1) seconds first
+EMAIL_MAX_ATTEMPTS = 3
+EMAIL_RETRY_BASE_DELAY = 0.5
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Network errors, 429 and 5xx are worth another attempt; 4xx are not."""
+    if isinstance(error, httpx.HTTPStatusError):
+        code = error.response.status_code
+        return code == 429 or code >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+# Email bodies, parsed once at import; only the placeholders change per send
+_PASSWORD_RESET_TEMPLATE = Template("""
+        <html>
+            <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; padding: 20px;">
+                <h2>Password Reset Request</h2>
+
+                <p>Hi ${name},</p>
+
+                <p>We received a request to reset your password. Click the button below to set a new password:</p>
+
+                <a href="${reset_link}" style="
+                    display: inline-block;
+                    background-color: #007bff;
+                    color: white;
+                    padding: 12px 30px;
+                    text-decoration: none;
+                    border-radius: 5px;
+                    margin: 20px 0;
+                ">Reset Password</a>
+
+                <p>Or copy this link: <code>${reset_link}</code></p>
+
+                <p style="color: #666; font-size: 12px;">
+                    This link will expire in 1 hour.<br>
+                    If you didn't request this, you can ignore this email.
+                </p>
+
+                <hr style="border: none; border-top: 1px solid #ddd; margin: 30px 0;">
+
+                <p style="color: #999; font-size: 12px;">
+                    RAG Application<br>
+                    Questions? Reply to this email.
+                </p>
+            </body>
+        </html>
+        """)
+
+_WELCOME_TEMPLATE = Template("""
+        <html>
+            <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; padding: 20px;">
+                <h2>Welcome to RAG! 🎉</h2>
+
+                <p>Hi ${username},</p>
+
+                <p>Welcome to the RAG (Retrieval-Augmented Generation) application!</p>
+
+                <p><strong>Here's what you can do:</strong></p>
+                <ul>
+                    <li>📄 Upload documents (PDF, DOCX, TXT, JSON)</li>
+                    <li>🔍 Search using natural language (hybrid search)</li>
+                    <li>🤖 Get AI-powered answers from your documents</li>
+                    <li>💾 Save conversation history</li>
+                </ul>
+
+                <p><strong>Get started:</strong></p>
+                <ol>
+                    <li>Upload your first document</li>
+                    <li>Wait for processing (usually <1 minute)</li>
+                    <li>Ask questions in natural language</li>
+                </ol>
+
+                <p style="color: #666; font-size: 12px; margin-top: 30px;">
+                    Happy exploring! If you have questions, reach out to us.
+                </p>
+            </body>
+        </html>
+        """)
 
 
 class EmailService:
@@ -30,13 +117,37 @@ class EmailService:
         self.from_email = settings.smtp_from_email
         self.from_name = settings.smtp_from_name
 
-        if self.api_key and Resend:
-            self.client = Resend(api_key=self.api_key)
+        if self.api_key:
+            self.client: Optional[httpx.AsyncClient] = httpx.AsyncClient(
+                base_url=RESEND_API_URL,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=10.0
+            )
         else:
             self.client = None
             logger.warning("⚠️ Resend API key not configured. Email sending disabled.")
 
-    def send_password_reset_email(
+    async def _send(self, email: str, subject: str, html_content: str) -> Dict[str, Any]:
+        """POST one email to Resend (retrying transient errors) and return the response."""
+        payload = {
+            "from": f"{self.from_name} <{self.from_email}>",
+            "to": email,
+            "subject": subject,
+            "html": html_content
+        }
+        for attempt in range(1, EMAIL_MAX_ATTEMPTS + 1):
+            try:
+                response = await self.client.post("/emails", json=payload)
+                response.raise_for_status()
+                return response.json()
+            except Exception as e:
+                if attempt == EMAIL_MAX_ATTEMPTS or not _is_retryable(e):
+                    raise
+                delay = EMAIL_RETRY_BASE_DELAY * 2 ** (attempt - 1)
+                logger.warning(f"⚠️ Email send failed ({e}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    async def send_password_reset_email(
         self,
         email: str,
         reset_link: str,
@@ -61,12 +172,7 @@ class EmailService:
             subject = "Reset Your Password"
             html_content = self._password_reset_template(reset_link, username)
 
-            response = self.client.emails.send({
-                "from": f"{self.from_name} <{self.from_email}>",
-                "to": email,
-                "subject": subject,
-                "html": html_content
-            })
+            response = await self._send(email, subject, html_content)
 
             logger.info(
                 f"✅ Password reset email sent",
@@ -81,7 +187,7 @@ class EmailService:
             )
             return False
 
-    def send_welcome_email(self, email: str, username: str) -> bool:
+    async def send_welcome_email(self, email: str, username: str) -> bool:
         """
         Send welcome email to new user.
 
@@ -99,12 +205,7 @@ class EmailService:
         try:
             html_content = self._welcome_template(username)
 
-            response = self.client.emails.send({
-                "from": f"{self.from_name} <{self.from_email}>",
-                "to": email,
-                "subject": "Welcome to RAG!",
-                "html": html_content
-            })
+            await self._send(email, "Welcome to RAG!", html_content)
 
             logger.info(f"✅ Welcome email sent to {email}")
             return True
@@ -113,80 +214,21 @@ class EmailService:
             logger.error(f"❌ Failed to send welcome email: {str(e)}")
             return False
 
+    async def close(self) -> None:
+        """Close the pooled HTTP connections."""
+        if self.client:
+            await self.client.aclose()
+
     @staticmethod
     def _password_reset_template(reset_link: str, username: Optional[str] = None) -> str:
         """Generate HTML template for password reset email."""
         name = username if username else "User"
-
-        return f"""
-        <html>
-            <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; padding: 20px;">
-                <h2>Password Reset Request</h2>
-
-                <p>Hi {name},</p>
-
-                <p>We received a request to reset your password. Click the button below to set a new password:</p>
-
-                <a href="{reset_link}" style="
-                    display: inline-block;
-                    background-color: #007bff;
-                    color: white;
-                    padding: 12px 30px;
-                    text-decoration: none;
-                    border-radius: 5px;
-                    margin: 20px 0;
-                ">Reset Password</a>
-
-                <p>Or copy this link: <code>{reset_link}</code></p>
-
-                <p style="color: #666; font-size: 12px;">
-                    This link will expire in 1 hour.<br>
-                    If you didn't request this, you can ignore this email.
-                </p>
-
-                <hr style="border: none; border-top: 1px solid #ddd; margin: 30px 0;">
-
-                <p style="color: #999; font-size: 12px;">
-                    RAG Application<br>
-                    Questions? Reply to this email.
-                </p>
-            </body>
-        </html>
-        """
+        return _PASSWORD_RESET_TEMPLATE.safe_substitute(name=name, reset_link=reset_link)
 
     @staticmethod
     def _welcome_template(username: str) -> str:
         """Generate HTML template for welcome email."""
-        return f"""
-        <html>
-            <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; padding: 20px;">
-                <h2>Welcome to RAG! 🎉</h2>
-
-                <p>Hi {username},</p>
-
-                <p>Welcome to the RAG (Retrieval-Augmented Generation) application!</p>
-
-                <p><strong>Here's what you can do:</strong></p>
-                <ul>
-                    <li>📄 Upload documents (PDF, DOCX, TXT, JSON)</li>
-                    <li>🔍 Search using natural language (hybrid search)</li>
-                    <li>🤖 Get AI-powered answers from your documents</li>
-                    <li>💾 Save conversation history</li>
-                </ul>
-
-                <p><strong>Get started:</strong></p>
-                <ol>
-                    <li>Upload your first document</li>
-                    <li>Wait for processing (usually <1 minute)</li>
-                    <li>Ask questions in natural language</li>
-                </ol>
-
-                <p style="color: #666; font-size: 12px; margin-top: 30px;">
-                    Happy exploring! If you have questions, reach out to us.
-                </p>
-            </body>
-        </html>
-        """
+        return _WELCOME_TEMPLATE.safe_substitute(username=username)
 
 
 # Singleton instance
@@ -206,12 +248,20 @@ async def send_password_reset_email(
     reset_link: str,
     username: Optional[str] = None
 ) -> bool:
-    """Async wrapper for sending password reset email."""
+    """Send a password reset email with the shared service."""
     service = get_email_service()
-    return service.send_password_reset_email(email, reset_link, username)
+    return await service.send_password_reset_email(email, reset_link, username)
 
 
 async def send_welcome_email(email: str, username: str) -> bool:
-    """Async wrapper for sending welcome email."""
+    """Send a welcome email with the shared service."""
     service = get_email_service()
-    return service.send_welcome_email(email, username)
+    return await service.send_welcome_email(email, username)
+
+
+async def close_email_service() -> None:
+    """Close the singleton's HTTP client (called on shutdown)."""
+    global _email_service
+    if _email_service is not None:
+        await _email_service.close()
+        _email_service = None
@@ -0,0 +1,186 @@
+"""
+LLM answer cache.
+File: src/rag/services/llm_cache.py
+
+Deterministic LLM calls (temperature at or below a threshold) with the
+same prompt, parameters and provider set return the same answer, so
+successful results are kept in a bounded in-process LRU with a TTL and
+returned without calling a provider again.
+
+The optional semantic layer behind it embeds the prompt locally and reuses
+the answer of a previous prompt whose embedding is within a cosine
+similarity threshold (paraphrases), using the LSH ProximityCache.
+
+Usage:
+    cache = get_llm_response_cache()
+    key = cache.key(models, prompt, temperature, max_tokens)
+    result = cache.get(key)
+"""
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from rag.core.config import get_settings
+from rag.semantic_cache import ProximityCache
+
+
+class ResponseCache:
+    """Bounded LRU of successful LLM results with a TTL per entry."""
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl_seconds: float = 3600.0,
+        temperature_threshold: float = 0.0
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Max cached answers (0 disables the cache)
+            ttl_seconds: Seconds an answer stays valid
+            temperature_threshold: Only calls at or below this temperature are cached
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.temperature_threshold = temperature_threshold
+
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def cacheable(self, temperature: float) -> bool:
+        """Whether a call with this temperature may be served from the cache."""
+        return self.max_size > 0 and temperature <= self.temperature_threshold
+
+    @staticmethod
+    def key(models: str, prompt: str, temperature: float, max_tokens: int) -> str:
+        """SHA-256 over the call parameters."""
+        payload = json.dumps(
+            {
+                "model": models,
+                "prompt": prompt,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+            },
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached result, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() >= entry[0]:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return dict(entry[1])
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Cache a successful result, evicting the least recently used."""
+        if not result.get("success"):
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, dict(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached answer."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SemanticResponseCache:
+    """Answers of previous prompts, looked up by prompt embedding similarity."""
+
+    def __init__(
+        self,
+        embedder=None,
+        dim: int = 384,
+        capacity: int = 10000,
+        threshold: float = 0.92
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            embedder: Object with embed_single_text (defaults to EmbeddingGenerator)
+            dim: Embedding dimension
+            capacity: Max cached answers
+            threshold: Minimum cosine similarity between prompts for a hit
+        """
+        if embedder is None:
+            from rag.embeddings import EmbeddingGenerator
+            embedder = EmbeddingGenerator(use_cache=False)
+
+        self.embedder = embedder
+        self._cache = ProximityCache(dim=dim, capacity=capacity, threshold=threshold)
+
+    async def embed(self, prompt: str) -> Optional[np.ndarray]:
+        """Embed a prompt off the event loop (None if embedding failed)."""
+        return await asyncio.to_thread(self.embedder.embed_single_text, prompt)
+
+    def get(self, embedding: np.ndarray, params: Tuple) -> Optional[Dict[str, Any]]:
+        """Return a copy of the answer to a similar prompt with the same params."""
+        cached = self._cache.lookup(embedding)
+        if cached is None or cached[0] != params:
+            return None
+        return dict(cached[1])
+
+    def put(self, embedding: np.ndarray, params: Tuple, result: Dict[str, Any]) -> None:
+        """Cache a successful result under the prompt embedding."""
+        if result.get("success"):
+            self._cache.insert(embedding, (params, dict(result)))
+
+    def clear(self) -> None:
+        """Drop every cached answer."""
+        self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+# Singleton instances
+_llm_response_cache: Optional[ResponseCache] = None
+_llm_semantic_cache: Optional[SemanticResponseCache] = None
+
+
+def get_llm_response_cache() -> ResponseCache:
+    """Get or create the LLM answer cache singleton."""
+    global _llm_response_cache
+    if _llm_response_cache is None:
+        settings = get_settings()
+        _llm_response_cache = ResponseCache(
+            max_size=settings.llm_cache_size,
+            ttl_seconds=settings.llm_cache_ttl_seconds,
+            temperature_threshold=settings.llm_cache_temperature_threshold
+        )
+    return _llm_response_cache
+
+
+def get_llm_semantic_cache() -> Optional[SemanticResponseCache]:
+    """Get or create the semantic answer cache singleton (None when disabled)."""
+    global _llm_semantic_cache
+    settings = get_settings()
+    if not settings.llm_semantic_cache_enabled:
+        return None
+    if _llm_semantic_cache is None:
+        _llm_semantic_cache = SemanticResponseCache(
+            dim=settings.embedding_dimension,
+            capacity=settings.llm_cache_size,
+            threshold=settings.llm_semantic_cache_threshold
+        )
+    return _llm_semantic_cache
@@ -8,16 +8,45 @@ Features:
 - Graceful degradation across multiple providers
 - Request tracing and detailed error logging
 """
+import asyncio
 import logging
+import random
 import time
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator
 from enum import Enum
 
+import httpx
+import orjson
+
+try:
+    import openai
+    OPENAI_AVAILABLE = True
+except ImportError:
+    openai = None
+    OPENAI_AVAILABLE = False
+
+try:
+    import anthropic
+    ANTHROPIC_AVAILABLE = True
+except ImportError:
+    anthropic = None
+    ANTHROPIC_AVAILABLE = False
+
+try:
+    import google.generativeai as genai
+    GEMINI_AVAILABLE = True
+except ImportError:
+    genai = None
+    GEMINI_AVAILABLE = False
+
 from rag.core.config import get_settings
+from rag.services.llm_cache import ResponseCache, get_llm_response_cache, get_llm_semantic_cache
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
 
 class LLMProvider(str, Enum):
     """Available LLM providers."""
@@ -28,6 +57,97 @@ class LLMProvider(str, Enum):
     OLLAMA = "ollama"
 
 
+class CircuitState(str, Enum):
+    """Circuit breaker states."""
+    CLOSED = "closed"        # Calls go through
+    OPEN = "open"            # Calls fail immediately
+    HALF_OPEN = "half_open"  # One probe call decides
+
+
+class CircuitBreaker:
+    """Per-provider breaker: skip a provider after repeated failures."""
+
+    def __init__(self, failure_threshold: int = 3, recovery_timeout: float = 30.0):
+        """
+        Initialize the breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds before an open circuit lets a probe through
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = CircuitState.CLOSED
+        self.failure_count = 0
+        self.opened_at = 0.0
+
+    def allow(self) -> bool:
+        """Whether a call may be made now."""
+        if self.state == CircuitState.CLOSED:
+            return True
+        now = time.monotonic()
+        if now - self.opened_at >= self.recovery_timeout:
+            # Also re-probes if a previous probe never reported (e.g. cancelled)
+            self.state = CircuitState.HALF_OPEN
+            self.opened_at = now
+            return True
+        # Open, or half-open with the probe still in flight
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        self.state = CircuitState.CLOSED
+        self.failure_count = 0
+
+    def record_failure(self) -> None:
+        """Count a failure; open the circuit at the threshold or on a failed probe."""
+        self.failure_count += 1
+        if self.state == CircuitState.HALF_OPEN or self.failure_count >= self.failure_threshold:
+            self.state = CircuitState.OPEN
+            self.opened_at = time.monotonic()
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    """HTTP status behind a provider error, if it has one."""
+    code = getattr(error, "status_code", None)  # OpenAI/Anthropic status errors
+    if code is None:
+        code = getattr(getattr(error, "response", None), "status_code", None)  # httpx
+    if code is None:
+        code = getattr(error, "code", None)  # google.api_core errors
+    return code if isinstance(code, int) else None
+
+
+def _is_retryable(error: Exception) -> bool:
+    """
+    Timeouts, connection errors, 408, 429 and 5xx are worth another attempt.
+    Other 4xx (bad key, bad request, unknown model) and a missing SDK are not.
+    Errors without a status are retried, as before.
+    """
+    if isinstance(error, ImportError):
+        return False
+    code = _status_code(error)
+    if code is None:
+        return True
+    return code in (408, 429) or code >= 500
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """
+    Seconds to wait if error is an HTTP 429, else None.
+
+    Works for the OpenAI/Anthropic SDK status errors and httpx.HTTPStatusError,
+    which all carry the httpx response. A 429 without a numeric Retry-After
+    header gives 0 (use the normal retry delay).
+    """
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) != 429:
+        return None
+    try:
+        return max(0.0, float(response.headers.get("retry-after")))
+    except (TypeError, ValueError):
+        return 0.0
+
+
 class LLMService:
     """
     Unified LLM service with automatic fallback and retry logic.
@@ -45,14 +165,87 @@ class LLMService:
         LLMProvider.OLLAMA,    # Local fallback
     ]
 
+    # Provider -> method that calls it. Names, not bound methods, so
+    # per-instance overrides (e.g. mocks in tests) are picked up.
+    PROVIDER_CALLS = {
+        LLMProvider.OPENAI: "_call_openai",
+        LLMProvider.GEMINI: "_call_gemini",
+        LLMProvider.CLAUDE: "_call_claude",
+        LLMProvider.GROK: "_call_grok",
+        LLMProvider.OLLAMA: "_call_ollama",
+    }
+
+    # Same methods for token streaming (async generators)
+    PROVIDER_STREAMS = {
+        LLMProvider.OPENAI: "_stream_openai",
+        LLMProvider.GEMINI: "_stream_gemini",
+        LLMProvider.CLAUDE: "_stream_claude",
+        LLMProvider.GROK: "_stream_grok",
+        LLMProvider.OLLAMA: "_stream_ollama",
+    }
+
+    # Returned (or streamed) when every provider failed
+    UNAVAILABLE_ANSWER = (
+        "I apologize, but I'm currently unable to generate a response. "
+        "All AI providers are unavailable. Please try again later."
+    )
+
     # Retry configuration
     MAX_RETRIES = 2  # Total attempts = 1 + MAX_RETRIES
-    RETRY_DELAY_SECONDS = 1  # Delay between retries
+    RETRY_DELAY_SECONDS = 1  # Base delay, doubled per attempt with ±50% jitter
+    MAX_BACKOFF_SECONDS = 8  # Cap on the backoff delay
+
+    # Circuit breaker configuration (per provider)
+    BREAKER_FAILURE_THRESHOLD = 3  # Consecutive failures before skipping a provider
+    BREAKER_RECOVERY_SECONDS = 30  # Skip time before one probe call is let through
+
+    # Max concurrent calls per provider, to stay under each provider's rate limit
+    MAX_INFLIGHT = {
+        LLMProvider.OPENAI: 8,
+        LLMProvider.CLAUDE: 4,
+        LLMProvider.GEMINI: 8,
+        LLMProvider.GROK: 4,
+        LLMProvider.OLLAMA: 2,
+    }
+    MAX_RETRY_AFTER_SECONDS = 30  # Cap on a provider's Retry-After
 
     def __init__(self):
         """Initialize LLM service."""
         self.providers = self._initialize_providers()
         self.last_successful_provider: Optional[LLMProvider] = None
+
+        # Config read on every call, snapshotted once
+        self._models: Dict[LLMProvider, str] = {
+            LLMProvider.OPENAI: settings.openai_model,
+            LLMProvider.GEMINI: settings.gemini_model,
+            LLMProvider.CLAUDE: settings.claude_model,
+            LLMProvider.GROK: settings.grok_model,
+            LLMProvider.OLLAMA: settings.ollama_model,
+        }
+        self._hedge_delay_ms = settings.llm_hedge_delay_ms
+
+        self._breakers: Dict[LLMProvider, CircuitBreaker] = {
+            provider: CircuitBreaker(self.BREAKER_FAILURE_THRESHOLD, self.BREAKER_RECOVERY_SECONDS)
+            for provider in self.providers
+        }
+        self._semaphores: Dict[LLMProvider, asyncio.Semaphore] = {
+            provider: asyncio.Semaphore(self.MAX_INFLIGHT[provider])
+            for provider in self.providers
+        }
+        # Identical calls in progress, keyed like the response cache
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+        # Async SDK clients, created on first use and reused across calls
+        self._aio_openai = None
+        self._aio_grok = None
+        self._aio_anthropic = None
+        self._gemini_model = None
+        self._ollama_client: Optional[httpx.AsyncClient] = None
+
+        # Gemini keeps its API key in module state; set it once
+        if GEMINI_AVAILABLE and LLMProvider.GEMINI in self.providers:
+            genai.configure(api_key=settings.google_api_key)
+
         logger.info(f"📊 LLM Service initialized with providers: {[p.value for p in self.providers]}")
         logger.info(f"🎯 Provider priority order: {' → '.join([p.value for p in self.DEFAULT_PROVIDER_PRIORITY if p in self.providers])}")
     
@@ -91,7 +284,7 @@ class LLMService:
         sorted_providers = [p for p in self.DEFAULT_PROVIDER_PRIORITY if p in available]
         return sorted_providers
     
-    def generate_answer(
+    async def generate_answer(
         self,
         prompt: str,
         max_tokens: int = 1024,
@@ -104,7 +297,15 @@ class LLMService:
         Strategy:
         1. Try last successful provider first (with retries)
         2. Fall back to next providers in priority order (each with retries)
-        3. If all fail, return graceful error message
+        3. Hedge: if a provider has not answered within llm_hedge_delay_ms,
+           start the next one in parallel; the first success wins and the
+           others are cancelled
+        4. If all fail, return graceful error message
+
+        Deterministic calls (see ResponseCache) are answered from the
+        exact-match cache when the same prompt was answered before, then
+        from the semantic cache (if enabled) when a similar one was.
+        Concurrent identical calls share one generation (single flight).
 
         Returns:
             {
@@ -116,61 +317,219 @@ class LLMService:
                 "attempt": int  # Which attempt this was (1, 2, 3, etc)
             }
         """
-        logger.info(f"🚀 Generating answer (attempt {retry_count + 1}/{self.MAX_RETRIES + 1})")
-
-        # Try last successful provider first (with retries)
-        if self.last_successful_provider and self.last_successful_provider in self.providers:
-            logger.info(f"🎯 Trying last successful provider: {self.last_successful_provider.value}")
-            for attempt in range(self.MAX_RETRIES + 1):
-                result = self._try_provider(
-                    self.last_successful_provider,
-                    prompt,
-                    max_tokens,
-                    temperature,
-                    attempt
-                )
-                if result["success"]:
-                    return result
+        models = ",".join(p.value for p in self.providers)
+        key = ResponseCache.key(models, prompt, temperature, max_tokens)
 
-                if attempt < self.MAX_RETRIES:
-                    logger.info(f"⏳ Retrying {self.last_successful_provider.value} in {self.RETRY_DELAY_SECONDS}s...")
-                    time.sleep(self.RETRY_DELAY_SECONDS)
+        task = self._inflight.get(key)
+        if task is not None:
+            logger.info("🔗 Joining identical in-flight request")
+        else:
+            task = asyncio.create_task(self._generate(prompt, max_tokens, temperature, retry_count))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
 
-        # Try all other providers in priority order (with retries)
-        for provider in self.providers:
-            if provider == self.last_successful_provider:
-                continue  # Already tried
+        # Shielded so one caller disconnecting doesn't cancel the others' answer
+        return dict(await asyncio.shield(task))
 
-            logger.info(f"🔄 Trying {provider.value}... (fallback)")
-            for attempt in range(self.MAX_RETRIES + 1):
-                result = self._try_provider(provider, prompt, max_tokens, temperature, attempt)
+    async def _generate(
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        retry_count: int
+    ) -> Dict[str, Any]:
+        """Cache lookups plus the hedged provider loop behind generate_answer."""
+        logger.info(f"🚀 Generating answer (attempt {retry_count + 1}/{self.MAX_RETRIES + 1})")
 
-                if result["success"]:
-                    self.last_successful_provider = provider
-                    logger.info(f"✅ Success with {provider.value}")
-                    return result
+        cache = get_llm_response_cache()
+        semantic_cache = get_llm_semantic_cache()
+        cache_key = embedding = None
+        if cache.cacheable(temperature):
+            models = ",".join(p.value for p in self.providers)
+            cache_key = cache.key(models, prompt, temperature, max_tokens)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"⚡ Cache hit ({cached['provider']})")
+                return cached
+
+            if semantic_cache is not None:
+                params = (models, temperature, max_tokens)
+                embedding = await semantic_cache.embed(prompt)
+                if embedding is not None:
+                    cached = semantic_cache.get(embedding, params)
+                    if cached is not None:
+                        logger.info(f"⚡ Semantic cache hit ({cached['provider']})")
+                        cache.put(cache_key, cached)
+                        return cached
+
+        queue = self._provider_order()
+
+        hedge_delay = self._hedge_delay_ms / 1000 if len(queue) > 1 else 0
+        running: Dict[asyncio.Task, LLMProvider] = {}
+
+        def launch() -> None:
+            provider = queue.pop(0)
+            task = asyncio.create_task(
+                self._try_provider_with_retries(provider, prompt, max_tokens, temperature)
+            )
+            running[task] = provider
+
+        if queue:
+            launch()
+        try:
+            while running:
+                timeout = hedge_delay if queue and hedge_delay > 0 else None
+                done, _ = await asyncio.wait(
+                    running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
 
-                if attempt < self.MAX_RETRIES:
-                    logger.info(f"⏳ Retrying {provider.value} in {self.RETRY_DELAY_SECONDS}s...")
-                    time.sleep(self.RETRY_DELAY_SECONDS)
-                else:
-                    logger.warning(f"❌ {provider.value} exhausted all retries: {result['error']}")
+                if not done:
+                    logger.info(f"⏱️ No answer after {hedge_delay:.1f}s, hedging with {queue[0].value}")
+                    launch()
+                    continue
+
+                for task in done:
+                    provider = running.pop(task)
+                    result = task.result()
+                    if result["success"]:
+                        self.last_successful_provider = provider
+                        logger.info(f"✅ Success with {provider.value}")
+                        if cache_key is not None:
+                            cache.put(cache_key, result)
+                        if embedding is not None:
+                            semantic_cache.put(embedding, params, result)
+                        return result
+
+                    # Provider gave up: fall back right away
+                    if queue:
+                        logger.info(f"🔄 Trying {queue[0].value}... (fallback)")
+                        launch()
+        finally:
+            for task in running:
+                task.cancel()
 
         # All providers and retries failed - graceful degradation
         logger.error("💥 All LLM providers failed after retries")
         return {
-            "answer": (
-                "I apologize, but I'm currently unable to generate a response. "
-                "All AI providers are unavailable. Please try again later."
-            ),
+            "answer": self.UNAVAILABLE_ANSWER,
             "provider": "none",
             "model": "none",
             "success": False,
             "error": "All LLM providers failed after retries",
             "attempt": retry_count + 1
         }
+
+    def _provider_order(self) -> List[LLMProvider]:
+        """Last successful provider first, then the rest in priority order."""
+        order = list(self.providers)
+        if self.last_successful_provider in order:
+            order.remove(self.last_successful_provider)
+            order.insert(0, self.last_successful_provider)
+            logger.info(f"🎯 Trying last successful provider: {self.last_successful_provider.value}")
+        return order
+
+    async def stream_answer(
+        self,
+        prompt: str,
+        max_tokens: int = 1024,
+        temperature: float = 0.7
+    ) -> AsyncIterator[str]:
+        """
+        Stream an answer token by token.
+
+        Providers are tried in the same order as generate_answer. A provider
+        that fails before its first token is skipped (no retries; the next
+        provider is the retry); once tokens flow, the stream stays with it
+        and a later error propagates to the caller. If no provider starts,
+        the graceful error message is yielded instead.
+        """
+        for provider in self._provider_order():
+            breaker = self._breakers[provider]
+            if not breaker.allow():
+                continue
+
+            stream = getattr(self, self.PROVIDER_STREAMS[provider])(prompt, max_tokens, temperature)
+            async with self._semaphores[provider]:
+                try:
+                    first = await stream.__anext__()
+                except StopAsyncIteration:
+                    first = None
+                except Exception as e:
+                    if _retry_after(e) is None:
+                        breaker.record_failure()
+                    logger.error(f"{provider.value} stream error: {e}")
+                    await stream.aclose()
+                    continue
+
+                breaker.record_success()
+                self.last_successful_provider = provider
+                logger.info(f"📡 Streaming from {provider.value}")
+                try:
+                    if first is not None:
+                        yield first
+                    async for chunk in stream:
+                        yield chunk
+                finally:
+                    await stream.aclose()
+                return
+
+        logger.error("💥 No LLM provider could start a stream")
+        yield self.UNAVAILABLE_ANSWER
+
+    async def generate_answer_batch(
+        self,
+        prompts: List[str],
+        max_tokens: int = 1024,
+        temperature: float = 0.7
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate answers for independent prompts concurrently.
+
+        Each prompt goes through generate_answer (cache, fallback, retries);
+        the per-provider semaphores bound how many run against one provider.
+
+        Returns:
+            Result dicts in the same order as prompts
+        """
+        return list(await asyncio.gather(
+            *(self.generate_answer(prompt, max_tokens, temperature) for prompt in prompts)
+        ))
+
+    async def _try_provider_with_retries(
+        self,
+        provider: LLMProvider,
+        prompt: str,
+        max_tokens: int,
+        temperature: float
+    ) -> Dict[str, Any]:
+        """Try a provider up to 1 + MAX_RETRIES times; return the last result."""
+        for attempt in range(self.MAX_RETRIES + 1):
+            result = await self._try_provider(provider, prompt, max_tokens, temperature, attempt)
+            if result["success"]:
+                return result
+
+            if not result.get("retryable", True):
+                break  # Same request would fail the same way; fall back now
+            if self._breakers[provider].state != CircuitState.CLOSED:
+                break  # Provider is down; retrying would only wait
+            if attempt < self.MAX_RETRIES:
+                # Rate limited: wait at least as long as the provider asked
+                delay = max(
+                    self._backoff(attempt),
+                    min(result.get("retry_after", 0), self.MAX_RETRY_AFTER_SECONDS)
+                )
+                logger.info(f"⏳ Retrying {provider.value} in {delay:.2f}s...")
+                await asyncio.sleep(delay)
+            else:
+                logger.warning(f"❌ {provider.value} exhausted all retries: {result['error']}")
+        return result
     
-    def _try_provider(
+    def _backoff(self, attempt: int) -> float:
+        """Jittered exponential backoff, so concurrent callers don't retry in lockstep."""
+        delay = self.RETRY_DELAY_SECONDS * (2 ** attempt) * random.uniform(0.5, 1.5)
+        return min(delay, self.MAX_BACKOFF_SECONDS)
+
+    async def _try_provider(
         self,
         provider: LLMProvider,
         prompt: str,
@@ -191,45 +550,124 @@ class LLMService:
         Returns:
             Result dict with answer, provider, model, success, and error
         """
+        breaker = self._breakers[provider]
+        if not breaker.allow():
+            return {
+                "answer": "",
+                "provider": provider.value,
+                "model": "",
+                "success": False,
+                "error": f"{provider.value} circuit open (skipped)"
+            }
+
         try:
-            if provider == LLMProvider.OPENAI:
-                return self._call_openai(prompt, max_tokens, temperature)
-            elif provider == LLMProvider.GEMINI:
-                return self._call_gemini(prompt, max_tokens, temperature)
-            elif provider == LLMProvider.CLAUDE:
-                return self._call_claude(prompt, max_tokens, temperature)
-            elif provider == LLMProvider.GROK:
-                return self._call_grok(prompt, max_tokens, temperature)
-            elif provider == LLMProvider.OLLAMA:
-                return self._call_ollama(prompt, max_tokens, temperature)
+            # Cap in-flight calls so concurrent requests don't trip the rate limit
+            call = getattr(self, self.PROVIDER_CALLS[provider])
+            async with self._semaphores[provider]:
+                started = time.perf_counter()
+                result = await call(prompt, max_tokens, temperature)
+            # Latency source for tuning llm_hedge_delay_ms
+            logger.info(f"⏱️ {provider.value} answered in {(time.perf_counter() - started) * 1000:.0f} ms")
+            breaker.record_success()
+            return result
         except Exception as e:
+            retry_after = _retry_after(e)
+            # A rate-limited provider is up; only real failures trip the breaker
+            if retry_after is None:
+                breaker.record_failure()
+                if breaker.state == CircuitState.OPEN:
+                    logger.warning(f"🔌 {provider.value} circuit opened for {breaker.recovery_timeout}s")
             error_msg = f"{provider.value} error (attempt {attempt + 1}): {str(e)}"
             logger.error(error_msg)
-            return {
+            result = {
                 "answer": "",
                 "provider": provider.value,
                 "model": "",
                 "success": False,
                 "error": error_msg
             }
+            if retry_after is not None:
+                result["retry_after"] = retry_after
+            if not _is_retryable(e):
+                result["retryable"] = False
+            return result
     
-    def _call_openai(
+    def _get_openai_client(self):
+        """Shared AsyncOpenAI client for OpenAI."""
+        if self._aio_openai is None:
+            if not OPENAI_AVAILABLE:
+                raise ImportError("openai not installed. Run: uv add openai")
+            self._aio_openai = openai.AsyncOpenAI(api_key=settings.openai_api_key)
+        return self._aio_openai
+
+    def _get_grok_client(self):
+        """Shared AsyncOpenAI client for the xAI endpoint."""
+        if self._aio_grok is None:
+            if not OPENAI_AVAILABLE:
+                raise ImportError("openai not installed. Run: uv add openai")
+            self._aio_grok = openai.AsyncOpenAI(
+                api_key=settings.xai_api_key,
+                base_url="https://api.x.ai/v1"
+            )
+        return self._aio_grok
+
+    def _get_anthropic_client(self):
+        """Shared AsyncAnthropic client."""
+        if self._aio_anthropic is None:
+            if not ANTHROPIC_AVAILABLE:
+                raise ImportError("anthropic not installed. Run: uv add anthropic")
+            self._aio_anthropic = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
+        return self._aio_anthropic
+
+    def _get_gemini_model(self):
+        """Shared Gemini GenerativeModel (sampling parameters are passed per call)."""
+        if self._gemini_model is None:
+            if not GEMINI_AVAILABLE:
+                raise ImportError("google-generativeai not installed. Run: uv add google-generativeai")
+            self._gemini_model = genai.GenerativeModel(self._models[LLMProvider.GEMINI])
+        return self._gemini_model
+
+    def _get_ollama_client(self) -> httpx.AsyncClient:
+        """Shared httpx client for the Ollama API."""
+        if self._ollama_client is None:
+            # Keep-alive pool sized above MAX_INFLIGHT so connections are reused
+            self._ollama_client = httpx.AsyncClient(
+                base_url=settings.ollama_base_url,
+                timeout=60,
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=10)
+            )
+        return self._ollama_client
+
+    @staticmethod
+    def _chat_messages(prompt: str) -> List[Dict[str, str]]:
+        """Messages for the OpenAI-compatible chat endpoints."""
+        return [
+            {"role": "system", "content": "You are a helpful AI assistant."},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _ollama_payload(self, prompt: str, max_tokens: int, temperature: float, stream: bool) -> bytes:
+        """Request body for Ollama's /api/generate, serialized with orjson."""
+        return orjson.dumps({
+            "model": self._models[LLMProvider.OLLAMA],
+            "prompt": prompt,
+            "stream": stream,
+            "options": {
+                "temperature": temperature,
+                "num_predict": max_tokens
+            }
+        })
+
+    async def _call_openai(
         self,
         prompt: str,
         max_tokens: int,
         temperature: float
     ) -> Dict[str, Any]:
         """Call OpenAI GPT API."""
-        import openai
-        
-        openai.api_key = settings.openai_api_key
-        
-        response = openai.chat.completions.create(
-            model=settings.openai_model,
-            messages=[
-                {"role": "system", "content": "You are a helpful AI assistant."},
-                {"role": "user", "content": prompt}
-            ],
+        response = await self._get_openai_client().chat.completions.create(
+            model=self._models[LLMProvider.OPENAI],
+            messages=self._chat_messages(prompt),
             max_tokens=max_tokens,
             temperature=temperature
         )
@@ -239,53 +677,44 @@ class LLMService:
         return {
             "answer": answer,
             "provider": "openai",
-            "model": settings.openai_model,
+            "model": self._models[LLMProvider.OPENAI],
             "success": True,
             "error": None
         }
     
-    def _call_gemini(
+    async def _call_gemini(
         self,
         prompt: str,
         max_tokens: int,
         temperature: float
     ) -> Dict[str, Any]:
         """Call Google Gemini API."""
-        import google.generativeai as genai
-        
-        genai.configure(api_key=settings.google_api_key)
-        
-        model = genai.GenerativeModel(
-            settings.gemini_model,
+        # Sampling parameters go per call so the model object can be reused
+        response = await self._get_gemini_model().generate_content_async(
+            prompt,
             generation_config={
                 "temperature": temperature,
                 "max_output_tokens": max_tokens,
             }
         )
         
-        response = model.generate_content(prompt)
-        
         return {
             "answer": response.text,
             "provider": "gemini",
-            "model": settings.gemini_model,
+            "model": self._models[LLMProvider.GEMINI],
             "success": True,
             "error": None
         }
     
-    def _call_claude(
+    async def _call_claude(
         self,
         prompt: str,
         max_tokens: int,
         temperature: float
     ) -> Dict[str, Any]:
         """Call Anthropic Claude API."""
-        import anthropic
-        
-        client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
-        
-        response = client.messages.create(
-            model=settings.claude_model,
+        response = await self._get_anthropic_client().messages.create(
+            model=self._models[LLMProvider.CLAUDE],
             max_tokens=max_tokens,
             temperature=temperature,
             messages=[
@@ -298,31 +727,21 @@ class LLMService:
         return {
             "answer": answer,
             "provider": "claude",
-            "model": settings.claude_model,
+            "model": self._models[LLMProvider.CLAUDE],
             "success": True,
             "error": None
         }
     
-    def _call_grok(
+    async def _call_grok(
         self,
         prompt: str,
         max_tokens: int,
         temperature: float
     ) -> Dict[str, Any]:
         """Call xAI Grok API (OpenAI-compatible endpoint)."""
-        import openai
-
-        client = openai.OpenAI(
-            api_key=settings.xai_api_key,
-            base_url="https://api.x.ai/v1"
-        )
-
-        response = client.chat.completions.create(
-            model=settings.grok_model,
-            messages=[
-                {"role": "system", "content": "You are a helpful AI assistant."},
-                {"role": "user", "content": prompt}
-            ],
+        response = await self._get_grok_client().chat.completions.create(
+            model=self._models[LLMProvider.GROK],
+            messages=self._chat_messages(prompt),
             max_tokens=max_tokens,
             temperature=temperature
         )
@@ -332,45 +751,114 @@ class LLMService:
         return {
             "answer": answer,
             "provider": "grok",
-            "model": settings.grok_model,
+            "model": self._models[LLMProvider.GROK],
             "success": True,
             "error": None
         }
 
-    def _call_ollama(
+    async def _call_ollama(
         self,
         prompt: str,
         max_tokens: int,
         temperature: float
     ) -> Dict[str, Any]:
         """Call local Ollama API."""
-        import requests
-
-        response = requests.post(
-            f"{settings.ollama_base_url}/api/generate",
-            json={
-                "model": settings.ollama_model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": temperature,
-                    "num_predict": max_tokens
-                }
-            },
-            timeout=60
+        response = await self._get_ollama_client().post(
+            "/api/generate",
+            content=self._ollama_payload(prompt, max_tokens, temperature, stream=False),
+            headers=_JSON_HEADERS
         )
 
         response.raise_for_status()
-        result = response.json()
+        result = orjson.loads(response.content)
 
         return {
             "answer": result["response"],
             "provider": "ollama",
-            "model": settings.ollama_model,
+            "model": self._models[LLMProvider.OLLAMA],
             "success": True,
             "error": None
         }
 
+    async def _stream_openai(self, prompt: str, max_tokens: int, temperature: float) -> AsyncIterator[str]:
+        """Stream OpenAI GPT tokens."""
+        stream = await self._get_openai_client().chat.completions.create(
+            model=self._models[LLMProvider.OPENAI],
+            messages=self._chat_messages(prompt),
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def _stream_grok(self, prompt: str, max_tokens: int, temperature: float) -> AsyncIterator[str]:
+        """Stream xAI Grok tokens."""
+        stream = await self._get_grok_client().chat.completions.create(
+            model=self._models[LLMProvider.GROK],
+            messages=self._chat_messages(prompt),
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def _stream_claude(self, prompt: str, max_tokens: int, temperature: float) -> AsyncIterator[str]:
+        """Stream Anthropic Claude text."""
+        async with self._get_anthropic_client().messages.stream(
+            model=self._models[LLMProvider.CLAUDE],
+            max_tokens=max_tokens,
+            temperature=temperature,
+            messages=[{"role": "user", "content": prompt}]
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+
+    async def _stream_gemini(self, prompt: str, max_tokens: int, temperature: float) -> AsyncIterator[str]:
+        """Stream Google Gemini text."""
+        response = await self._get_gemini_model().generate_content_async(
+            prompt,
+            generation_config={
+                "temperature": temperature,
+                "max_output_tokens": max_tokens,
+            },
+            stream=True
+        )
+        async for chunk in response:
+            if chunk.text:
+                yield chunk.text
+
+    async def _stream_ollama(self, prompt: str, max_tokens: int, temperature: float) -> AsyncIterator[str]:
+        """Stream Ollama tokens (one JSON object per line)."""
+        async with self._get_ollama_client().stream(
+            "POST",
+            "/api/generate",
+            content=self._ollama_payload(prompt, max_tokens, temperature, stream=True),
+            headers=_JSON_HEADERS
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                data = orjson.loads(line)
+                if data.get("response"):
+                    yield data["response"]
+                if data.get("done"):
+                    break
+
+    async def close(self) -> None:
+        """Close the shared async clients."""
+        for client in (self._aio_openai, self._aio_grok, self._aio_anthropic):
+            if client is not None:
+                await client.close()
+        if self._ollama_client is not None:
+            await self._ollama_client.aclose()
+        self._aio_openai = self._aio_grok = self._aio_anthropic = None
+        self._ollama_client = None
+
 
 # Singleton instance
 _llm_service: Optional[LLMService] = None
@@ -384,9 +872,15 @@ def get_llm_service() -> LLMService:
     return _llm_service
 
 
-def generate_answer(prompt: str, **kwargs) -> str:
+async def close_llm_service() -> None:
+    """Close the singleton's clients (called on shutdown)."""
+    if _llm_service is not None:
+        await _llm_service.close()
+
+
+async def generate_answer_async(prompt: str, **kwargs) -> str:
     """
-    Convenience function to generate answer.
+    Convenience function to generate answer from async code.
     
     Args:
         prompt: The prompt to send
@@ -396,5 +890,57 @@ def generate_answer(prompt: str, **kwargs) -> str:
         Generated answer as string
     """
     service = get_llm_service()
-    result = service.generate_answer(prompt, **kwargs)
-    return result["answer"]
\ No newline at end of file
+    result = await service.generate_answer(prompt, **kwargs)
+    return result["answer"]
+
+
+async def _with_own_service(call):
+    """
+    Run call(service) on a service created and closed inside this event loop.
+
+    The singleton's semaphores, in-flight futures and async clients bind to
+    the loop that first used them, so asyncio.run must not share it.
+    """
+    service = LLMService()
+    try:
+        return await call(service)
+    finally:
+        await service.close()
+
+
+def generate_answer(prompt: str, **kwargs) -> str:
+    """
+    Convenience function to generate answer from sync code (scripts, tests).
+    Must not be called from a running event loop; use generate_answer_async.
+    Each call uses its own LLMService (the answer caches are still shared).
+    
+    Args:
+        prompt: The prompt to send
+        **kwargs: Additional arguments (max_tokens, temperature)
+        
+    Returns:
+        Generated answer as string
+    """
+    async def call(service: LLMService) -> str:
+        result = await service.generate_answer(prompt, **kwargs)
+        return result["answer"]
+
+    return asyncio.run(_with_own_service(call))
+
+
+def generate_answer_batch_sync(prompts: List[str], **kwargs) -> List[Dict[str, Any]]:
+    """
+    Generate answers for several prompts concurrently from sync code.
+    Must not be called from a running event loop. Like generate_answer,
+    each call uses its own LLMService.
+    
+    Args:
+        prompts: The prompts to send
+        **kwargs: Additional arguments (max_tokens, temperature)
+        
+    Returns:
+        Result dicts in the same order as prompts
+    """
+    return asyncio.run(_with_own_service(
+        lambda service: service.generate_answer_batch(prompts, **kwargs)
+    ))
@@ -0,0 +1,187 @@
+"""
+Buffered bulk inserts for audit logs and metrics.
+File: src/rag/services/log_buffer.py
+
+Request logs and system metrics are written on every request, so instead
+of one ORM flush per row they are queued in-process and written in
+batches with a single Core INSERT (executemany) per flush.
+
+Usage:
+    buffer = get_request_log_buffer()
+    buffer.add({"request_id": ..., "endpoint": ..., ...})
+"""
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Type
+
+from sqlalchemy import insert
+
+from rag.core.config import get_settings
+from rag.models.base import Base, uuid7
+
+logger = logging.getLogger(__name__)
+
+
+class BatchInsertBuffer:
+    """Queue of row dicts flushed to one table in batches."""
+
+    def __init__(
+        self,
+        model: Type[Base],
+        session_factory=None,
+        max_batch: int = 500,
+        flush_interval: float = 1.0,
+        max_queue: int = 10000,
+        timestamp_column: Optional[str] = None
+    ):
+        """
+        Initialize the buffer.
+
+        Args:
+            model: ORM model whose table receives the rows
+            session_factory: Async session factory (defaults to AsyncSessionLocal)
+            max_batch: Max rows per INSERT
+            flush_interval: Max seconds a row waits before being written
+            max_queue: Rows beyond this are dropped instead of blocking requests
+            timestamp_column: Column stamped with the current UTC time when the
+                row is queued (aware for timestamptz columns, naive otherwise)
+        """
+        if session_factory is None:
+            from rag.core.database import AsyncSessionLocal
+            session_factory = AsyncSessionLocal
+
+        self.model = model
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.timestamp_column = timestamp_column
+        self._aware_timestamp = bool(
+            timestamp_column
+            and model.__table__.c[timestamp_column].type.timezone
+        )
+
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._idle = False  # _run is waiting for a row and holds none
+
+    def add(self, row: Dict[str, Any]) -> None:
+        """Queue a row without waiting for the database."""
+        # Fill the primary key (and timestamp) here so the INSERT needs no RETURNING
+        row.setdefault("id", uuid7())
+        if self.timestamp_column:
+            if self._aware_timestamp:
+                row.setdefault(self.timestamp_column, datetime.now(timezone.utc))
+            else:
+                row.setdefault(self.timestamp_column, datetime.utcnow())
+
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            logger.warning(f"⚠️ {self.model.__tablename__} buffer full, dropping row")
+
+    def start(self) -> None:
+        """Start the background flush task."""
+        if self._task is None or self._task.done():
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task and write whatever is still queued."""
+        if self._task is not None:
+            self._stopping = True
+            # Only an idle task is cancelled; a busy one writes its batch and exits.
+            # A cancelled Queue.get() leaves its row in the queue.
+            if self._idle:
+                self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        while not self._queue.empty():
+            await self._write(self._drain())
+
+    async def flush(self) -> int:
+        """Write up to max_batch queued rows now. Returns rows written."""
+        rows = self._drain()
+        await self._write(rows)
+        return len(rows)
+
+    def _drain(self, first: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Pop up to max_batch rows off the queue."""
+        rows = [first] if first is not None else []
+        while len(rows) < self.max_batch:
+            try:
+                rows.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return rows
+
+    async def _write(self, rows: List[Dict[str, Any]]) -> None:
+        """INSERT rows in one executemany round-trip."""
+        if not rows:
+            return
+        try:
+            async with self.session_factory() as session:
+                await session.execute(insert(self.model), rows)
+                await session.commit()
+        except Exception as e:
+            logger.error(f"❌ Failed to write {len(rows)} {self.model.__tablename__} rows: {e}")
+
+    async def _run(self) -> None:
+        """Wait for a row, then flush a batch at most every flush_interval."""
+        loop = asyncio.get_running_loop()
+        while not self._stopping:
+            self._idle = True
+            try:
+                first = await self._queue.get()
+            finally:
+                self._idle = False
+            deadline = loop.time() + self.flush_interval
+
+            # Give the batch a chance to fill before writing
+            while self._queue.qsize() + 1 < self.max_batch and not self._stopping:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                await asyncio.sleep(min(remaining, 0.05))
+
+            await self._write(self._drain(first))
+
+
+# Singleton instances
+_request_log_buffer: Optional[BatchInsertBuffer] = None
+_metric_buffer: Optional[BatchInsertBuffer] = None
+
+
+def get_request_log_buffer() -> BatchInsertBuffer:
+    """Get or create the request log buffer singleton."""
+    global _request_log_buffer
+    if _request_log_buffer is None:
+        from rag.models.request_log import RequestLog
+        settings = get_settings()
+        _request_log_buffer = BatchInsertBuffer(
+            RequestLog,
+            max_batch=settings.log_buffer_max_batch,
+            flush_interval=settings.log_buffer_flush_interval,
+            timestamp_column="created_at"
+        )
+    return _request_log_buffer
+
+
+def get_metric_buffer() -> BatchInsertBuffer:
+    """Get or create the system metric buffer singleton."""
+    global _metric_buffer
+    if _metric_buffer is None:
+        from rag.models.system_metric import SystemMetric
+        settings = get_settings()
+        _metric_buffer = BatchInsertBuffer(
+            SystemMetric,
+            max_batch=settings.log_buffer_max_batch,
+            flush_interval=settings.log_buffer_flush_interval,
+            timestamp_column="recorded_at"
+        )
+    return _metric_buffer
@@ -0,0 +1,159 @@
+"""
+Partition maintenance for the request_logs table.
+File: src/rag/services/log_retention.py
+
+request_logs is range-partitioned by month on created_at. This module
+creates partitions ahead of time and drops the ones that are entirely
+older than the retention window, so cleanup is a DROP TABLE instead of
+a bulk DELETE.
+
+Rows for a month without a partition (maintenance missed the boundary)
+land in request_logs_default. Postgres refuses to create that month's
+partition while the default holds matching rows, so they are moved out
+of the detached default first.
+
+Run daily (cron / scheduled job):
+    python -m rag.services.log_retention
+"""
+import asyncio
+import logging
+import re
+from datetime import date, datetime, timedelta
+from typing import List, Tuple
+
+from sqlalchemy import text
+
+from rag.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "request_logs"
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+_PARTITION_RE = re.compile(r"^request_logs_(\d{4})_(\d{2})$")
+
+
+def month_start(day: date) -> date:
+    """First day of the month containing day."""
+    return day.replace(day=1)
+
+
+def add_months(month: date, n: int) -> date:
+    """Shift a first-of-month date by n months."""
+    index = month.year * 12 + month.month - 1 + n
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Partition table name for a month, e.g. request_logs_2026_10."""
+    return f"{PARENT_TABLE}_{month.year:04d}_{month.month:02d}"
+
+
+def partitions_to_create(today: date, months_ahead: int = 1) -> List[Tuple[str, date, date]]:
+    """(name, from, to) for the current month and the next months_ahead."""
+    first = month_start(today)
+    return [
+        (partition_name(start), start, add_months(start, 1))
+        for start in (add_months(first, i) for i in range(months_ahead + 1))
+    ]
+
+
+def expired_partitions(names: List[str], today: date, retention_days: int) -> List[str]:
+    """Partitions whose whole month ends before the retention cutoff."""
+    cutoff = today - timedelta(days=retention_days)
+    expired = []
+    for name in names:
+        match = _PARTITION_RE.match(name)
+        if not match:
+            continue
+        start = date(int(match.group(1)), int(match.group(2)), 1)
+        if add_months(start, 1) <= cutoff:
+            expired.append(name)
+    return expired
+
+
+async def create_partition(conn, name: str, start: date, end: date) -> None:
+    """Create one monthly partition, moving its rows out of the default partition."""
+    if (await conn.execute(text("SELECT to_regclass(:name)"), {"name": name})).scalar() is not None:
+        return
+
+    bounds = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    in_range = {"start": start, "end": end}
+    stranded = False
+    if (await conn.execute(
+        text("SELECT to_regclass(:name)"), {"name": DEFAULT_PARTITION}
+    )).scalar() is not None:
+        stranded = (await conn.execute(text(
+            f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "
+            f"WHERE created_at >= :start AND created_at < :end)"
+        ), in_range)).scalar()
+
+    if not stranded:
+        await conn.execute(text(f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} {bounds}"))
+        return
+
+    await conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {DEFAULT_PARTITION}"))
+    await conn.execute(text(f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} {bounds}"))
+    moved = await conn.execute(text(
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+        f"WHERE created_at >= :start AND created_at < :end RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved"
+    ), in_range)
+    await conn.execute(text(f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+    logger.info(f"📦 Moved {moved.rowcount} rows from {DEFAULT_PARTITION} into {name}")
+
+
+async def maintain_partitions(
+    conn,
+    today: date = None,
+    months_ahead: int = 1,
+    retention_days: int = 30
+) -> None:
+    """
+    Create upcoming partitions and drop expired ones.
+
+    Each partition is handled in its own savepoint, so one failure does not
+    stop the rest of the run.
+    """
+    today = today or datetime.utcnow().date()
+
+    for name, start, end in partitions_to_create(today, months_ahead):
+        try:
+            async with conn.begin_nested():
+                await create_partition(conn, name, start, end)
+        except Exception as e:
+            logger.error(f"❌ Failed to create request log partition {name}: {e}")
+
+    result = await conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :parent"
+    ), {"parent": PARENT_TABLE})
+    existing = [row[0] for row in result]
+
+    for name in expired_partitions(existing, today, retention_days):
+        try:
+            async with conn.begin_nested():
+                await conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+                await conn.execute(text(f"DROP TABLE {name}"))
+            logger.info(f"🗑️ Dropped expired request log partition {name}")
+        except Exception as e:
+            logger.error(f"❌ Failed to drop request log partition {name}: {e}")
+
+
+async def run_retention() -> None:
+    """Maintain request_logs partitions using the app's engine and settings."""
+    from rag.core.database import engine
+
+    settings = get_settings()
+    async with engine.begin() as conn:
+        await maintain_partitions(
+            conn,
+            retention_days=settings.request_log_retention_days
+        )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_retention())
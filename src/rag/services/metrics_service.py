@@ -0,0 +1,76 @@
+"""
+Counter metrics backed by the system_metrics table.
+File: src/rag/services/metrics_service.py
+
+Counters are one row per (metric_name, labels) and are bumped with a
+single INSERT ... ON CONFLICT DO UPDATE, instead of a SELECT followed by
+an ORM update. Gauges and histograms stay append-only samples (see
+rag.services.log_buffer.get_metric_buffer).
+
+Relies on the labels_hash generated column and the partial unique index
+uq_system_metrics_counter from migration metric_counter_upsert_010.
+"""
+import logging
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func, literal_column, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from rag.models.base import uuid7
+from rag.models.system_metric import MetricType, SystemMetric
+
+logger = logging.getLogger(__name__)
+
+
+def build_counter_upsert(
+    metric_name: str,
+    amount: float = 1.0,
+    labels: Optional[Dict[str, Any]] = None
+):
+    """INSERT ... ON CONFLICT statement that adds amount to a counter."""
+    stmt = pg_insert(SystemMetric).values(
+        id=uuid7(),
+        metric_name=metric_name,
+        metric_type=MetricType.COUNTER,
+        value=amount,
+        labels=labels,
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[SystemMetric.metric_name, literal_column("labels_hash")],
+        # Literal predicate so Postgres can match the partial index
+        index_where=text("metric_type = 'counter'"),
+        set_={
+            "value": SystemMetric.value + stmt.excluded.value,
+            "recorded_at": func.now(),
+        },
+    )
+
+
+async def increment_counter(
+    db: AsyncSession,
+    metric_name: str,
+    amount: float = 1.0,
+    labels: Optional[Dict[str, Any]] = None
+) -> None:
+    """Add amount to a counter in one round-trip (caller commits)."""
+    await db.execute(build_counter_upsert(metric_name, amount, labels))
+
+
+async def record_counter(
+    metric_name: str,
+    amount: float = 1.0,
+    labels: Optional[Dict[str, Any]] = None,
+    session_factory=None
+) -> None:
+    """Bump a counter in its own session; failures are logged, not raised."""
+    if session_factory is None:
+        from rag.core.database import AsyncSessionLocal
+        session_factory = AsyncSessionLocal
+
+    try:
+        async with session_factory() as session:
+            await increment_counter(session, metric_name, amount, labels)
+            await session.commit()
+    except Exception as e:
+        logger.error(f"❌ Failed to bump counter {metric_name}: {e}")
@@ -2,10 +2,12 @@
 RAG Service - Orchestrates document processing and querying.
 Integrates existing RAG pipeline with database tracking.
 """
+import asyncio
 import logging
+import os
 import shutil
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Tuple
 from uuid import UUID, uuid4
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -17,21 +19,83 @@ from rag.core.config import get_settings
 # Your existing RAG pipeline
 from rag.documents import process_document
 from rag.embeddings import embed_document_chunks
-from rag.vectorstore import store_embedded_documents, search_documents_by_text, delete_document
+from rag.vectorstore import (
+    store_embedded_documents,
+    search_documents_by_text,
+    delete_document,
+    invalidate_search_cache
+)
 from rag.llm_integration import ask_question_detailed
 from rag.services.llm_service import get_llm_service
 from rag.services.search_service import create_search_service
+from rag.services.document_queue import get_document_queue
 
 #llm_service.py
-from rag.services.llm_service import generate_answer
+from rag.services.llm_service import generate_answer_async
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# Bytes read from an upload per await
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Vector cleanups still in flight; referenced so they are not garbage collected
+_background_tasks: Set[asyncio.Task] = set()
+
 # Initialize hybrid search service (50/50 BM25 + semantic)
 _search_service = create_search_service(bm25_weight=0.5, semantic_weight=0.5, top_k=5)
 
 
+# Fixed parts of the query prompt; the context blocks go between them
+_PROMPT_PREFIX = "Based on the following documents, answer the question.\n\nDocuments:\n"
+_PROMPT_QUESTION = "\n\nQuestion: "
+_PROMPT_SUFFIX = "\n\nAnswer:"
+
+
+def _format_results(
+    search_results: List[Dict[str, Any]],
+    query: str
+) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    LLM prompt and response sources, built in one pass over the results.
+
+    The prompt's context is numbered "[Document i: source]" blocks separated
+    by blank lines. The template parts, context pieces and query go into one
+    join, so each chunk's text is copied once, straight into the prompt.
+    """
+    pieces: List[str] = [_PROMPT_PREFIX]
+    sources: List[Dict[str, Any]] = []
+    for i, result in enumerate(search_results, 1):
+        metadata = result.get('metadata') or {}
+        name = metadata.get('file_name', 'Unknown')
+        text = metadata.get('text', '')
+        pieces += ("[Document ", str(i), ": ", name, "]\n", text, "\n\n")
+        sources.append({
+            "document": name,
+            "chunk_index": metadata.get('chunk_index', 0),
+            "relevance_score": result.get('score', 0.0),
+            "preview": text[:200]
+        })
+    if sources:
+        pieces[-1] = "\n"
+    pieces += (_PROMPT_QUESTION, query, _PROMPT_SUFFIX)
+    return "".join(pieces), sources
+
+
+def _search_scope(user_id: UUID) -> Tuple[Optional[str], Optional[str]]:
+    """(namespace, user_id filter) that isolate a user's vectors."""
+    if settings.pinecone_use_namespaces:
+        return str(user_id), None
+    return None, str(user_id)
+
+
+def _file_suffix(filename: str) -> str:
+    """Same as Path(filename).suffix, without building a Path."""
+    name = filename.rpartition("/")[2]
+    i = name.rfind(".")
+    return name[i:] if 0 < i < len(name) - 1 else ""
+
+
 class DocumentProcessingError(Exception):
     """Raised when document processing fails."""
     pass
@@ -50,8 +114,7 @@ class RagService:
     @staticmethod
     def validate_file_type(filename: str) -> bool:
         """Validate file type is allowed."""
-        file_ext = Path(filename).suffix.lower()
-        return file_ext in settings.allowed_file_types
+        return _file_suffix(filename).lower() in settings.allowed_file_types
     
     @staticmethod
     def validate_file_size(file_size: int) -> bool:
@@ -60,6 +123,78 @@ class RagService:
         return file_size <= max_size
 
 
+def _upload_fd(source) -> Optional[int]:
+    """OS file descriptor behind an upload, if it is already on disk."""
+    # fileno() would force an in-memory SpooledTemporaryFile onto disk first.
+    # _rolled is private to SpooledTemporaryFile (CPython 3.11+); if it goes
+    # away, the getattr default sends every upload down the fileno() path.
+    # TestCopyUpload.test_spool_rolled_attribute pins it.
+    if getattr(source, "_rolled", True) is False:
+        return None
+    try:
+        source.flush()
+        return source.fileno()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def _sendfile_upload(source_fd: int, offset: int, buffer, max_size: int) -> Optional[int]:
+    """
+    Copy in-kernel with os.sendfile from offset to the end of source_fd.
+
+    Returns the bytes copied, or None once more than max_size were copied.
+    """
+    out_fd = buffer.fileno()
+    file_size = 0
+    while True:
+        sent = os.sendfile(out_fd, source_fd, offset + file_size, max_size + 1 - file_size)
+        if not sent:
+            return file_size
+        file_size += sent
+        if file_size > max_size:
+            return None
+
+
+def _copy_upload(source, file_path: Path) -> Optional[int]:
+    """
+    Copy an upload's file object to disk.
+
+    Uploads Starlette has spooled to a temporary file are copied in-kernel
+    with os.sendfile where it accepts a regular file as output (Linux; on
+    macOS/BSD it fails and the copy falls back); anything else is read in
+    UPLOAD_CHUNK_SIZE pieces. Memory stays flat whatever the file size.
+    Returns the bytes written, or None (after removing the partial file)
+    once the size limit is crossed.
+    """
+    max_size = settings.max_file_size_mb * 1024 * 1024
+    source_fd = _upload_fd(source) if hasattr(os, "sendfile") else None
+    
+    with open(file_path, "wb") as buffer:
+        if source_fd is not None:
+            offset = source.tell()
+            try:
+                file_size = _sendfile_upload(source_fd, offset, buffer, int(max_size))
+            except OSError as e:
+                # e.g. ENOTSOCK on macOS/BSD, where sendfile only writes to sockets
+                logger.debug(f"sendfile unavailable for uploads ({e}); reading instead")
+                buffer.seek(0)
+                buffer.truncate()
+                source.seek(offset)
+                source_fd = None
+        if source_fd is None:
+            file_size = 0
+            while chunk := source.read(UPLOAD_CHUNK_SIZE):
+                file_size += len(chunk)
+                if file_size > max_size:
+                    file_size = None
+                    break
+                buffer.write(chunk)
+    
+    if file_size is None:
+        file_path.unlink()
+    return file_size
+
+
 async def save_uploaded_file(uploaded_file, user_id: UUID) -> Dict[str, Any]:
     """Save uploaded file to disk."""
     if not RagService.validate_file_type(uploaded_file.filename):
@@ -67,21 +202,24 @@ async def save_uploaded_file(uploaded_file, user_id: UUID) -> Dict[str, Any]:
             f"File type not allowed. Allowed: {settings.allowed_file_types}"
         )
     
-    upload_dir = RagService.get_user_upload_dir(user_id)
+    # Content-Length says it is too big: reject before touching the disk
+    declared_size = getattr(uploaded_file, "size", None)
+    if declared_size is not None and not RagService.validate_file_size(declared_size):
+        raise DocumentProcessingError(
+            f"File too large. Max: {settings.max_file_size_mb}MB"
+        )
+    
+    upload_dir = await asyncio.to_thread(RagService.get_user_upload_dir, user_id)
     
-    file_extension = Path(uploaded_file.filename).suffix
+    file_extension = _file_suffix(uploaded_file.filename)
     unique_filename = f"{uuid4()}{file_extension}"
     file_path = upload_dir / unique_filename
     
     try:
-        with open(file_path, "wb") as buffer:
-            while chunk := await uploaded_file.read(8192):
-                buffer.write(chunk)
+        # One thread hop for the whole copy; stops as soon as the limit is crossed
+        file_size = await asyncio.to_thread(_copy_upload, uploaded_file.file, file_path)
         
-        file_size = file_path.stat().st_size
-        
-        if not RagService.validate_file_size(file_size):
-            file_path.unlink()
+        if file_size is None:
             raise DocumentProcessingError(
                 f"File too large. Max: {settings.max_file_size_mb}MB"
             )
@@ -116,14 +254,15 @@ async def process_document_pipeline(
         await document_crud.update_document_status(db, document_id, status="processing")
         
         logger.info(f"Processing document {document_id}: {file_path}")
-        chunks = process_document(file_path)
+        # CPU/network-bound steps run in threads so workers don't block the loop
+        chunks = await asyncio.to_thread(process_document, file_path)
         
         if not chunks:
             raise DocumentProcessingError("No chunks created")
         
         logger.info(f"Created {len(chunks)} chunks")
         
-        embedded_chunks = embed_document_chunks(chunks)
+        embedded_chunks = await asyncio.to_thread(embed_document_chunks, chunks)
         
         successful_embeddings = sum(
             1 for chunk in embedded_chunks 
@@ -150,11 +289,16 @@ async def process_document_pipeline(
         # Store in Pinecone with namespace
         namespace = str(user_id) if settings.pinecone_use_namespaces else None
         logger.info(f"Storing in Pinecone with namespace: {namespace}")  
-        success = store_embedded_documents(embedded_chunks, namespace=namespace)
+        success = await asyncio.to_thread(
+            store_embedded_documents, embedded_chunks, namespace=namespace
+        )
         
         if not success:
             raise DocumentProcessingError("Failed to store in Pinecone")
         
+        # Cached searches predate this document
+        invalidate_search_cache(*_search_scope(user_id))
+        
         # Save chunks to database
         chunk_data = [
             {
@@ -167,7 +311,8 @@ async def process_document_pipeline(
             for chunk in embedded_chunks
         ]
         
-        await document_crud.create_chunks(db, document_id, chunk_data)
+        # Chunks and the "completed" status are committed together
+        await document_crud.create_chunks(db, document_id, chunk_data, commit=False)
         
         total_tokens = sum(len(chunk['text'].split()) for chunk in embedded_chunks)
         
@@ -185,6 +330,8 @@ async def process_document_pipeline(
     except Exception as e:
         logger.error(f"Document processing failed: {e}")
         
+        # Discard uncommitted chunks so they are not committed with "failed"
+        await db.rollback()
         await document_crud.update_document_status(
             db, document_id, status="failed", error=str(e)
         )
@@ -195,10 +342,14 @@ async def process_document_pipeline(
 async def upload_and_process_document(
     db: AsyncSession,
     user_id: UUID,
-    uploaded_file,
-    background_tasks
+    uploaded_file
 ) -> Document:
-    """Main entry point for document upload."""
+    """
+    Main entry point for document upload.
+    
+    Saves the file and creates the document row (status="pending"), then
+    hands processing to the document worker queue and returns right away.
+    """
     file_info = await save_uploaded_file(uploaded_file, user_id)
     
     document = await document_crud.create_document(
@@ -211,15 +362,7 @@ async def upload_and_process_document(
         file_type=file_info["file_type"]
     )
     
-    background_tasks.add_task(
-        process_document_pipeline,
-        db,
-        document.id,
-        file_info["file_path"],
-        user_id
-    )
-    
-    logger.info(f"Document {document.id} queued for processing")
+    get_document_queue().enqueue(document.id, file_info["file_path"], user_id)
     return document
 
 
@@ -241,12 +384,9 @@ async def query_documents(
     
     try:
         # FIXED: Pass user namespace and filter to search
-        namespace = str(user_id) if settings.pinecone_use_namespaces else None
-        user_id_str = None if settings.pinecone_use_namespaces else str(user_id)
+        namespace, user_id_str = _search_scope(user_id)
         
         # Search with user filtering
-        from rag.vectorstore import search_documents_by_text
-        
         search_results = search_documents_by_text(
             query,
             top_k=top_k,
@@ -258,19 +398,14 @@ async def query_documents(
         
         # If no documents found, return friendly message
         if not search_results:
-            await document_crud.create_chat_message(
-                db, user_id=user_id, session_id=session_id,
-                role="user", content=query
-            )
-            
             no_docs_message = (
                 "I couldn't find any relevant documents to answer your question. "
                 "Please make sure you've uploaded documents and they've finished processing."
             )
             
-            await document_crud.create_chat_message(
+            await document_crud.create_chat_exchange(
                 db, user_id=user_id, session_id=session_id,
-                role="assistant", content=no_docs_message,
+                question=query, answer=no_docs_message,
                 retrieved_chunks=0, model_used=settings.gemini_model
             )
             
@@ -283,66 +418,29 @@ async def query_documents(
                 "model_used": settings.gemini_model
             }
         
-        # Build context from search results
-        context_parts = []
-        for i, result in enumerate(search_results):
-            metadata = result.get('metadata', {})
-            text = metadata.get('text', '')
-            source = metadata.get('file_name', 'Unknown')
-            
-            context_parts.append(f"[Document {i+1}: {source}]\n{text}\n")
-        
-        context = "\n".join(context_parts)
+        # Build prompt and sources from search results
+        prompt, formatted_sources = _format_results(search_results, query)
         
         # Call Gemini LLM
-        from rag.llm_integration import generate_answer_with_gemini
-        
-        prompt = f"""Based on the following documents, answer the question.
-
-Documents:
-{context}
-
-Question: {query}
-
-Answer:"""
         # Commenting out previous one to test how updated will work out  how llm_service.py works 
         #answer = generate_answer_with_gemini(prompt)
-        from rag.services.llm_service import generate_answer
-
-        answer = generate_answer(
+        answer = await generate_answer_async(
             prompt,
             max_tokens=settings.gemini_max_tokens,
             temperature=settings.gemini_temperature
         )
 
-        # Save user message
-        await document_crud.create_chat_message(
-            db, user_id=user_id, session_id=session_id,
-            role="user", content=query
-        )
-        from rag.services.llm_service import get_llm_service
         llm_service = get_llm_service()
         model_used = f"{llm_service.last_successful_provider.value}" if llm_service.        last_successful_provider else "unknown"
 
-        # Save assistant response
-        await document_crud.create_chat_message(
+        # Save user message and assistant response in one round trip
+        await document_crud.create_chat_exchange(
             db, user_id=user_id, session_id=session_id,
-            role="assistant", content=answer,
+            question=query, answer=answer,
             retrieved_chunks=len(search_results),
             model_used=model_used
         )
         
-        # Format sources
-        formatted_sources = [
-            {
-                "document": result.get('metadata', {}).get('file_name', 'Unknown'),
-                "chunk_index": result.get('metadata', {}).get('chunk_index', 0),
-                "relevance_score": result.get('score', 0.0),
-                "preview": result.get('metadata', {}).get('text', '')[:200]
-            }
-            for result in search_results
-        ]
-        
         return {
             "session_id": session_id,
             "message": answer,
@@ -384,13 +482,29 @@ async def delete_user_document(
     success = await document_crud.soft_delete_document(db, document_id, user_id)
     
     if success:
+        # The database row is authoritative; vector cleanup runs after the
+        # response (delete_document logs its own failures)
         namespace = str(user_id) if settings.pinecone_use_namespaces else None
-        delete_document(str(document_id), namespace=namespace)
+        task = asyncio.create_task(
+            asyncio.to_thread(delete_document, str(document_id), namespace=namespace)
+        )
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+        # Drop cached searches now and again once the vectors are gone
+        scope = _search_scope(user_id)
+        invalidate_search_cache(*scope)
+        task.add_done_callback(lambda _: invalidate_search_cache(*scope))
         logger.info(f"Document {document_id} deleted")
     
     return success
 
 
+async def wait_for_pending_cleanups() -> None:
+    """Let in-flight vector cleanups finish (called on shutdown)."""
+    if _background_tasks:
+        await asyncio.gather(*_background_tasks, return_exceptions=True)
+
+
 async def get_chat_sessions(
     db: AsyncSession,
     user_id: UUID
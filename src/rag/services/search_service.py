@@ -1,17 +1,101 @@
 """
 Hybrid search service combining BM25 and semantic search.
 File: src/rag/services/search_service.py
+
+The BM25 index is stored as a CSR term-document matrix (per-document term
+ids and frequencies) with precomputed IDF. Scoring runs in a Numba-compiled
+kernel when numba is installed, and falls back to NumPy otherwise.
 """
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 from dataclasses import dataclass
 
 from rank_bm25 import BM25Okapi
 import numpy as np
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    njit = None
+    prange = range
+    NUMBA_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first.
+
+    Uses argpartition (O(n)) and only sorts the k winners. Ties keep
+    input order, same as a stable descending sort.
+    """
+    n = len(scores)
+    if k >= n:
+        return np.argsort(-scores, kind="stable")
+
+    threshold = scores[np.argpartition(-scores, k - 1)[k - 1]]
+    above = np.flatnonzero(scores > threshold)
+    tied = np.flatnonzero(scores == threshold)[:k - len(above)]
+    idx = np.concatenate([above, tied])
+    idx.sort()
+    return idx[np.argsort(-scores[idx], kind="stable")]
+
+
+@lru_cache(maxsize=4096)
+def _query_tokens(query: str) -> Tuple[str, ...]:
+    """Tokens of a search query, memoized."""
+    return tuple(SearchService._tokenize(query))
+
+
+def _bm25_scores_numpy(query_term_ids, idf, indptr, term_ids, term_freqs, doc_lens, avgdl, k1, b, rows, out):
+    """BM25 scores of rows into out, vectorized over the CSR entries."""
+    out[:] = 0.0
+    if len(query_term_ids) == 0 or len(rows) == 0:
+        return
+    starts = indptr[rows]
+    lens = indptr[rows + 1] - starts
+    owner = np.repeat(np.arange(len(rows)), lens)
+    entries = np.arange(lens.sum()) - np.repeat(np.cumsum(lens) - lens, lens) + np.repeat(starts, lens)
+
+    # Repeated query terms count once per occurrence, as in rank_bm25
+    terms, counts = np.unique(query_term_ids, return_counts=True)
+    entry_terms = term_ids[entries]
+    slot = np.minimum(np.searchsorted(terms, entry_terms), len(terms) - 1)
+    hit = terms[slot] == entry_terms
+
+    owner, entry_terms, slot = owner[hit], entry_terms[hit], slot[hit]
+    freq = term_freqs[entries[hit]].astype(np.float64)
+    norm = k1 * (1 - b + b * doc_lens[rows[owner]] / avgdl)
+    weights = idf[entry_terms] * counts[slot] * (freq * (k1 + 1) / (freq + norm))
+    out += np.bincount(owner, weights=weights, minlength=len(rows))
+
+
+def _bm25_scores_kernel(query_term_ids, idf, indptr, term_ids, term_freqs, doc_lens, avgdl, k1, b, rows, out):
+    """BM25 scores of rows into out (compiled by numba)."""
+    for i in prange(rows.shape[0]):
+        row = rows[i]
+        start = indptr[row]
+        end = indptr[row + 1]
+        norm = k1 * (1 - b + b * doc_lens[row] / avgdl)
+        acc = 0.0
+        for q in range(query_term_ids.shape[0]):
+            term = query_term_ids[q]
+            freq = 0.0
+            for j in range(start, end):
+                freq += term_freqs[j] * (term_ids[j] == term)
+            acc += idf[term] * (freq * (k1 + 1) / (freq + norm))
+        out[i] = acc
+
+
+if NUMBA_AVAILABLE:
+    bm25_scores = njit(parallel=True, cache=True)(_bm25_scores_kernel)
+else:
+    bm25_scores = _bm25_scores_numpy
+
+
 @dataclass
 class SearchResult:
     """A search result with scores from both methods."""
@@ -53,6 +137,15 @@ class SearchService:
         self.top_k = top_k
         self._bm25_index: Optional[BM25Okapi] = None
         self._indexed_chunks: List[Dict[str, Any]] = []
+        # Chunk id -> row in the index
+        self._positions: Dict[str, int] = {}
+        # CSR term-document matrix: row i's entries are indptr[i]:indptr[i+1]
+        self._vocab: Dict[str, int] = {}
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._term_ids = np.zeros(0, dtype=np.int32)
+        self._term_freqs = np.zeros(0, dtype=np.int32)
+        self._doc_lens = np.zeros(0, dtype=np.float32)
+        self._idf = np.zeros(0, dtype=np.float32)
 
     def build_bm25_index(self, chunks: List[Dict[str, Any]]) -> None:
         """
@@ -65,6 +158,8 @@ class SearchService:
             logger.warning("No chunks provided for BM25 indexing")
             self._bm25_index = None
             self._indexed_chunks = []
+            self._positions = {}
+            self._vocab = {}
             return
 
         self._indexed_chunks = chunks
@@ -74,9 +169,53 @@ class SearchService:
             for chunk in chunks
         ]
         self._bm25_index = BM25Okapi(tokenized_corpus)
+        self._positions = {
+            chunk["id"]: i for i, chunk in enumerate(chunks) if "id" in chunk
+        }
+        self._build_csr(self._bm25_index)
         logger.info(f"Built BM25 index with {len(chunks)} documents")
 
-    def _tokenize(self, text: str) -> List[str]:
+    def _build_csr(self, index: BM25Okapi) -> None:
+        """Encode the index's term frequencies and IDF for the scoring kernel."""
+        vocab: Dict[str, int] = {}
+        indptr = np.zeros(len(index.doc_freqs) + 1, dtype=np.int64)
+        term_ids: List[int] = []
+        term_freqs: List[int] = []
+        for i, freqs in enumerate(index.doc_freqs):
+            for term, freq in freqs.items():
+                term_ids.append(vocab.setdefault(term, len(vocab)))
+                term_freqs.append(freq)
+            indptr[i + 1] = len(term_ids)
+
+        idf = np.zeros(len(vocab), dtype=np.float32)
+        for term, term_id in vocab.items():
+            idf[term_id] = index.idf.get(term, 0.0)
+
+        self._vocab = vocab
+        self._indptr = indptr
+        self._term_ids = np.asarray(term_ids, dtype=np.int32)
+        self._term_freqs = np.asarray(term_freqs, dtype=np.int32)
+        self._doc_lens = np.asarray(index.doc_len, dtype=np.float32)
+        self._idf = idf
+
+    def _score_rows(self, tokenized_query: Sequence[str], rows: np.ndarray) -> np.ndarray:
+        """BM25 scores of the query against the given index rows."""
+        index = self._bm25_index
+        # Terms outside the vocabulary score 0 everywhere
+        query_term_ids = np.asarray(
+            [self._vocab[t] for t in tokenized_query if t in self._vocab],
+            dtype=np.int32
+        )
+        out = np.zeros(len(rows))
+        bm25_scores(
+            query_term_ids, self._idf, self._indptr, self._term_ids, self._term_freqs,
+            self._doc_lens, float(index.avgdl), float(index.k1), float(index.b),
+            rows, out
+        )
+        return out
+
+    @staticmethod
+    def _tokenize(text: str) -> List[str]:
         """
         Tokenize text for BM25.
         Uses simple whitespace tokenization with lowercasing.
@@ -99,11 +238,21 @@ class SearchService:
         if self._bm25_index is None:
             return []
 
-        tokenized_query = self._tokenize(query)
+        tokenized_query = _query_tokens(query)
         if not tokenized_query:
             return [0.0] * len(self._indexed_chunks)
 
-        return self._bm25_index.get_scores(tokenized_query).tolist()
+        rows = np.arange(len(self._indexed_chunks), dtype=np.intp)
+        return self._score_rows(tokenized_query, rows).tolist()
+
+    def _candidate_positions(self, semantic_results: List[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """Index rows of the candidates, or None if any is not in the index."""
+        if self._bm25_index is None:
+            return None
+        positions = [self._positions.get(r.get("id")) for r in semantic_results]
+        if None in positions:
+            return None
+        return np.asarray(positions, dtype=np.intp)
 
     def normalize_scores(self, scores: List[float]) -> List[float]:
         """
@@ -115,18 +264,22 @@ class SearchService:
         Returns:
             Normalized scores in [0, 1] range
         """
-        if not scores:
+        if not len(scores):
             return []
 
-        scores_array = np.array(scores)
-        min_score = scores_array.min()
-        max_score = scores_array.max()
+        return self._normalize(np.asarray(scores, dtype=np.float64)).tolist()
+
+    @staticmethod
+    def _normalize(scores: np.ndarray) -> np.ndarray:
+        """Min-max scale an array; constant arrays map to 0.5."""
+        min_score = scores.min()
+        max_score = scores.max()
 
         if max_score == min_score:
             # All scores are the same
-            return [0.5] * len(scores)
+            return np.full(len(scores), 0.5)
 
-        return ((scores_array - min_score) / (max_score - min_score)).tolist()
+        return (scores - min_score) / (max_score - min_score)
 
     def hybrid_search(
         self,
@@ -144,6 +297,10 @@ class SearchService:
             chunks: Optional list of chunks for BM25 indexing
                 (if not already indexed)
 
+        When every candidate id is in the persistent index, BM25 scores are
+        gathered from it; otherwise a temporary index over the candidates
+        is built.
+
         Returns:
             List of SearchResult objects, sorted by combined score
         """
@@ -155,55 +312,53 @@ class SearchService:
         if chunks and len(chunks) != len(self._indexed_chunks):
             self.build_bm25_index(chunks)
 
-        # Get content from semantic results for BM25 scoring
-        contents = [r.get("content", "") for r in semantic_results]
-
-        # Build temporary BM25 index for the candidate set
-        if contents:
+        positions = self._candidate_positions(semantic_results)
+        if positions is not None:
+            # Candidates are indexed: gather their scores from the corpus index
+            bm25_scores = self._score_rows(_query_tokens(query), positions)
+        else:
+            # Build temporary BM25 index for the candidate set
+            contents = [r.get("content", "") for r in semantic_results]
             tokenized = [self._tokenize(c) for c in contents]
             temp_bm25 = BM25Okapi(tokenized) if any(tokenized) else None
-        else:
-            temp_bm25 = None
 
-        # Get BM25 scores for query against candidates
-        if temp_bm25:
-            tokenized_query = self._tokenize(query)
-            bm25_scores = temp_bm25.get_scores(tokenized_query).tolist()
-        else:
-            bm25_scores = [0.0] * len(semantic_results)
-
-        # Normalize scores
-        normalized_bm25 = self.normalize_scores(bm25_scores)
-        semantic_scores = [r.get("score", 0.0) for r in semantic_results]
+            # Get BM25 scores for query against candidates
+            if temp_bm25:
+                tokenized_query = _query_tokens(query)
+                bm25_scores = np.asarray(temp_bm25.get_scores(tokenized_query), dtype=np.float64)
+            else:
+                bm25_scores = np.zeros(len(semantic_results))
+
+        # Normalize scores (parallel arrays, one slot per candidate)
+        normalized_bm25 = self._normalize(bm25_scores)
+        semantic_scores = np.fromiter(
+            (r.get("score", 0.0) for r in semantic_results),
+            dtype=np.float64,
+            count=len(semantic_results)
+        )
         # Semantic scores from cosine similarity are already in [0, 1]
         # but normalize anyway to handle edge cases
-        normalized_semantic = self.normalize_scores(semantic_scores)
+        normalized_semantic = self._normalize(semantic_scores)
 
-        # Combine scores
-        results = []
-        for i, result in enumerate(semantic_results):
-            bm25_norm = normalized_bm25[i] if i < len(normalized_bm25) else 0.0
-            semantic_norm = normalized_semantic[i] if i < len(normalized_semantic) else 0.0
-
-            combined = (
-                self.bm25_weight * bm25_norm +
-                self.semantic_weight * semantic_norm
-            )
+        combined = (
+            self.bm25_weight * normalized_bm25 +
+            self.semantic_weight * normalized_semantic
+        )
 
+        # Only the top_k winners become SearchResult objects
+        results = []
+        for i in top_k_indices(combined, self.top_k):
+            result = semantic_results[i]
             results.append(SearchResult(
                 chunk_id=result.get("id", f"chunk_{i}"),
                 content=result.get("content", ""),
                 metadata=result.get("metadata", {}),
-                bm25_score=bm25_norm,
-                semantic_score=semantic_norm,
-                combined_score=combined
+                bm25_score=float(normalized_bm25[i]),
+                semantic_score=float(normalized_semantic[i]),
+                combined_score=float(combined[i])
             ))
 
-        # Sort by combined score descending
-        results.sort(key=lambda x: x.combined_score, reverse=True)
-
-        # Return top_k results
-        return results[:self.top_k]
+        return results
 
     def search_with_fallback(
         self,
@@ -232,19 +387,23 @@ class SearchService:
 
         # Fallback to semantic-only
         if semantic_results:
+            scores = np.fromiter(
+                (r.get("score", 0.0) for r in semantic_results),
+                dtype=np.float64,
+                count=len(semantic_results)
+            )
             results = [
                 SearchResult(
-                    chunk_id=r.get("id", f"chunk_{i}"),
-                    content=r.get("content", ""),
-                    metadata=r.get("metadata", {}),
+                    chunk_id=semantic_results[i].get("id", f"chunk_{i}"),
+                    content=semantic_results[i].get("content", ""),
+                    metadata=semantic_results[i].get("metadata", {}),
                     bm25_score=0.0,
-                    semantic_score=r.get("score", 0.0),
-                    combined_score=r.get("score", 0.0)
+                    semantic_score=float(scores[i]),
+                    combined_score=float(scores[i])
                 )
-                for i, r in enumerate(semantic_results)
+                for i in top_k_indices(scores, self.top_k)
             ]
-            results.sort(key=lambda x: x.combined_score, reverse=True)
-            return results[:self.top_k], "semantic"
+            return results, "semantic"
 
         return [], "none"
 
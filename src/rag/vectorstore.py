@@ -3,9 +3,12 @@ Simple Pinecone vector database integration with user isolation.
 Clean, focused, gets the job done.
 """
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+from typing import List, Dict, Any, Optional, Tuple, Union
 import time
 
+import numpy as np
+
 try:
     from pinecone import Pinecone, ServerlessSpec
     PINECONE_AVAILABLE = True
@@ -14,12 +17,94 @@ except ImportError:
     ServerlessSpec = None
     PINECONE_AVAILABLE = False
 
+# gRPC transport (pip install "pinecone[grpc]"): same client API, but vectors
+# are sent as protobuf floats instead of JSON text, which is much cheaper to
+# encode for large upserts
+try:
+    from pinecone.grpc import PineconeGRPC
+    PINECONE_GRPC_AVAILABLE = True
+except ImportError:
+    PineconeGRPC = None
+    PINECONE_GRPC_AVAILABLE = False
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    njit = None
+    prange = range
+    NUMBA_AVAILABLE = False
+
 from rag.core.config import get_settings
 from rag.embeddings import EmbeddingGenerator
+from rag.semantic_cache import ProximityCacheGroup
 
 logger = logging.getLogger(__name__)
 
 
+def to_query_vector(query_embedding: Union[np.ndarray, List[float]]) -> List[float]:
+    """Convert an embedding to the float list the Pinecone REST client sends."""
+    if isinstance(query_embedding, np.ndarray):
+        # Round through float32 so the JSON payload carries 4-byte precision
+        return np.asarray(query_embedding, dtype=np.float32).ravel().tolist()
+    return list(query_embedding)
+
+
+def _quantize_int8_numpy(emb: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Row-wise symmetric int8 quantization with NumPy array ops."""
+    scale = np.abs(emb).max(axis=1) / np.float32(127.0)
+    scale[scale == 0] = 1.0
+    q = np.clip(np.rint(emb / scale[:, np.newaxis]), -127, 127).astype(np.int8)
+    return q, scale
+
+
+def _quantize_int8_kernel(emb, q, scale):
+    """Fused per-row max/scale/round, one pass per row (compiled by numba)."""
+    n, dim = emb.shape
+    for i in prange(n):
+        peak = np.float32(0.0)
+        for j in range(dim):
+            v = abs(emb[i, j])
+            if v > peak:
+                peak = v
+        s = peak / np.float32(127.0) if peak > 0 else np.float32(1.0)
+        scale[i] = s
+        for j in range(dim):
+            x = np.rint(emb[i, j] / s)
+            q[i, j] = min(max(x, -127.0), 127.0)
+
+
+if NUMBA_AVAILABLE:
+    _quantize_int8_jit = njit(parallel=True, cache=True)(_quantize_int8_kernel)
+
+    def _quantize_int8_rows(emb: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Row-wise symmetric int8 quantization in one compiled pass."""
+        q = np.empty(emb.shape, dtype=np.int8)
+        scale = np.empty(emb.shape[0], dtype=np.float32)
+        _quantize_int8_jit(emb, q, scale)
+        return q, scale
+else:
+    _quantize_int8_rows = _quantize_int8_numpy
+
+
+def quantize_int8(embeddings: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Symmetric per-vector int8 quantization.
+    
+    Each row is scaled so its largest component maps to 127. Cosine
+    similarity ignores per-vector scale, so the int8 vectors rank like the
+    originals (up to rounding error). Runs in a Numba kernel when numba
+    is installed, and falls back to NumPy otherwise.
+    
+    Returns:
+        (int8 array, float32 scale per row) with embeddings ≈ q * scale
+    """
+    emb = np.ascontiguousarray(embeddings, dtype=np.float32)
+    if emb.ndim == 1:
+        emb = emb[np.newaxis]
+    return _quantize_int8_rows(emb)
+
+
 class SimplePineconeStore:
     """Simple Pinecone vector database client with user isolation."""
 
@@ -36,13 +121,18 @@ class SimplePineconeStore:
         if not settings.pinecone_index_name:
             raise ValueError("❌ PINECONE_INDEX_NAME not set in .env file")
 
-        # Configure Pinecone
-        self.pc = Pinecone(api_key=settings.pinecone_api_key)
+        # Configure Pinecone (gRPC when installed, REST otherwise)
+        client_cls = PineconeGRPC if PINECONE_GRPC_AVAILABLE else Pinecone
+        self.pc = client_cls(api_key=settings.pinecone_api_key)
         self.index_name = settings.pinecone_index_name
         self.use_namespaces = settings.pinecone_use_namespaces
+        self.quantize_int8 = settings.pinecone_quantize_int8
         self.index = None
 
-        logger.info(f"🌲 Initialized Pinecone client for index: {self.index_name}")
+        logger.info(
+            f"🌲 Initialized Pinecone {'gRPC' if PINECONE_GRPC_AVAILABLE else 'REST'} "
+            f"client for index: {self.index_name}"
+        )
         logger.info(f"🔐 User namespaces: {'enabled' if self.use_namespaces else 'disabled'}")
 
     def connect_to_index(self) -> bool:
@@ -122,10 +212,12 @@ class SimplePineconeStore:
                     continue
 
                 metadata = doc.get('metadata', {})
+                text = doc.get('text', '')
                 
                 # Ensure critical fields are in metadata
                 metadata.update({
-                    'text': doc.get('text', '')[:1000],  # Pinecone metadata limit
+                    'text': text[:1000],  # Pinecone metadata limit
+                    'text_preview': f"{text[:200]}...",  # Precomputed for query sources
                     'source': doc.get('source', ''),
                     'file_name': doc.get('file_name', ''),
                     'chunk_index': doc.get('chunk_index', 0),
@@ -143,6 +235,13 @@ class SimplePineconeStore:
                 logger.error("❌ No valid vectors to upsert")
                 return False
 
+            if self.quantize_int8:
+                # One matrix op for the whole batch; ints serialize compactly
+                q, scale = quantize_int8(np.stack([v['values'] for v in vectors]))
+                for vector, values, vector_scale in zip(vectors, q.tolist(), scale.tolist()):
+                    vector['values'] = values
+                    vector['metadata']['embedding_scale'] = vector_scale
+
             self.index.upsert(
                 vectors=vectors,
                 namespace=effective_namespace or ""
@@ -157,7 +256,7 @@ class SimplePineconeStore:
 
     def search_similar(
         self, 
-        query_embedding: List[float], 
+        query_embedding: Union[np.ndarray, List[float]], 
         top_k: int = 5,
         namespace: Optional[str] = None,
         filter_dict: Optional[Dict[str, Any]] = None,
@@ -177,7 +276,7 @@ class SimplePineconeStore:
             )
 
             query_params = {
-                "vector": query_embedding,
+                "vector": to_query_vector(query_embedding),
                 "top_k": top_k,
                 "include_metadata": include_metadata,
                 "namespace": effective_namespace or ""
@@ -230,6 +329,21 @@ class SimplePineconeStore:
             return False
 
 
+# Singleton instance, shared so the HTTPS pool and index host lookup are reused
+_pinecone_store: Optional[SimplePineconeStore] = None
+_pinecone_store_lock = threading.Lock()
+
+
+def get_pinecone_store() -> SimplePineconeStore:
+    """Get or create the Pinecone store singleton (safe to call from threads)."""
+    global _pinecone_store
+    if _pinecone_store is None:
+        with _pinecone_store_lock:
+            if _pinecone_store is None:
+                _pinecone_store = SimplePineconeStore()
+    return _pinecone_store
+
+
 # === Updated convenience functions ===
 
 def store_embedded_documents(
@@ -237,9 +351,10 @@ def store_embedded_documents(
     namespace: Optional[str] = None
 ) -> bool:
     """Store embedded documents with optional namespace."""
-    store = SimplePineconeStore()
+    store = get_pinecone_store()
 
-    if embedded_docs and embedded_docs[0].get('embedding'):
+    # Only the first upload in a process checks for (or creates) the index
+    if store.index is None and embedded_docs and embedded_docs[0].get('embedding'):
         dimension = len(embedded_docs[0]['embedding'])
         if not store.create_index_if_not_exists(dimension):
             return False
@@ -248,13 +363,13 @@ def store_embedded_documents(
 
 
 def search_documents(
-    query_embedding: List[float],
+    query_embedding: Union[np.ndarray, List[float]],
     top_k: int = 5,
     namespace: Optional[str] = None,
     user_id: Optional[str] = None
 ) -> List[Dict[str, Any]]:
     """Search documents with optional user filtering."""
-    store = SimplePineconeStore()
+    store = get_pinecone_store()
     
     filter_dict = None
     if user_id and not store.use_namespaces:
@@ -268,22 +383,77 @@ def search_documents(
     )
 
 
+# Search results for similar queries, one cache per (namespace, user_id) scope
+_search_cache: Optional[ProximityCacheGroup] = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> Optional[ProximityCacheGroup]:
+    """Get or create the search result cache singleton (None when disabled)."""
+    global _search_cache
+    settings = get_settings()
+    if not settings.semantic_cache_enabled:
+        return None
+    if _search_cache is None:
+        with _search_cache_lock:
+            if _search_cache is None:
+                _search_cache = ProximityCacheGroup(
+                    dim=settings.embedding_dimension,
+                    capacity=settings.search_cache_per_user,
+                    threshold=settings.semantic_cache_threshold,
+                    max_scopes=settings.search_cache_users
+                )
+    return _search_cache
+
+
+def invalidate_search_cache(namespace: Optional[str] = None, user_id: Optional[str] = None) -> None:
+    """Forget cached results of a scope after its vectors changed."""
+    cache = get_search_cache()
+    if cache is not None:
+        cache.invalidate((namespace, user_id))
+        # Unscoped searches (RAGWithGemini) can see every scope's vectors
+        cache.invalidate((None, None))
+
+
 def search_documents_by_text(
     query: str,
     top_k: int = 5,
     namespace: Optional[str] = None,
-    user_id: Optional[str] = None
+    user_id: Optional[str] = None,
+    query_embedding: Optional[np.ndarray] = None
 ) -> List[Dict[str, Any]]:
-    """Convert query text → embedding → search."""
-    embedder = EmbeddingGenerator()
-    query_embedding = embedder.embed_single_text(query)
+    """
+    Convert query text → embedding → search.
+
+    Results are cached per scope: a later query whose embedding is within
+    semantic_cache_threshold cosine similarity skips Pinecone. Pass
+    query_embedding when the query was already embedded.
+    """
+    if query_embedding is None:
+        embedder = EmbeddingGenerator()
+        query_embedding = embedder.embed_single_text(query)
+    
+    cache = get_search_cache() if query_embedding is not None else None
+    scope = (namespace, user_id)
+    if cache is not None:
+        cached = cache.lookup(scope, query_embedding)
+        if cached is not None:
+            cached_top_k, cached_results = cached
+            if cached_top_k >= top_k:
+                logger.info("📋 Search cache hit")
+                return cached_results[:top_k]
     
-    return search_documents(
-        query_embedding.tolist(),
+    results = search_documents(
+        query_embedding,
         top_k=top_k,
         namespace=namespace,
         user_id=user_id
     )
+    
+    if results and cache is not None:
+        cache.insert(scope, query_embedding, (top_k, results))
+    
+    return results
 
 
 def delete_document(
@@ -291,7 +461,7 @@ def delete_document(
     namespace: Optional[str] = None
 ) -> bool:
     """Delete all chunks of a document."""
-    store = SimplePineconeStore()
+    store = get_pinecone_store()
     return store.delete_by_filter(
         filter_dict={"document_id": document_id},
         namespace=namespace
@@ -8,9 +8,10 @@ Tests:
 - Logging filters sensitive data
 - Forgot-password endpoint works with rate limiting
 """
+import httpx
 import pytest
 from httpx import AsyncClient
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, AsyncMock, MagicMock
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from rag.models.user import User
@@ -21,33 +22,38 @@ from rag.core.logging import filter_sensitive_data, LoggingMiddleware
 class TestEmailService:
     """Test email service functionality."""
 
+    @staticmethod
+    def mock_client(email_id: str) -> AsyncMock:
+        """Mock httpx.AsyncClient whose POST returns a Resend response."""
+        response = MagicMock()
+        response.json.return_value = {"id": email_id}
+        client = AsyncMock()
+        client.post.return_value = response
+        return client
+
     @pytest.mark.asyncio
     async def test_send_password_reset_email_with_mock(self):
         """Test password reset email is constructed correctly."""
-        with patch('rag.services.email_service.Resend') as mock_resend:
-            # Mock the Resend client
-            mock_client = MagicMock()
-            mock_client.emails.send.return_value = {"id": "test-email-id"}
-            mock_resend.return_value = mock_client
-
-            service = EmailService()
-            service.client = mock_client
-
-            # Call the method
-            result = service.send_password_reset_email(
-                email="user@example.com",
-                reset_link="http://localhost:3000/reset?token=abc123",
-                username="testuser"
-            )
+        mock_client = self.mock_client("test-email-id")
 
-            # Verify
-            assert result is True
-            assert mock_client.emails.send.called
-            call_args = mock_client.emails.send.call_args[0][0]
-            assert call_args["to"] == "user@example.com"
-            assert "Reset Your Password" in call_args["subject"]
-            assert "abc123" in call_args["html"]
-            assert "testuser" in call_args["html"]
+        service = EmailService()
+        service.client = mock_client
+
+        # Call the method
+        result = await service.send_password_reset_email(
+            email="user@example.com",
+            reset_link="http://localhost:3000/reset?token=abc123",
+            username="testuser"
+        )
+
+        # Verify
+        assert result is True
+        assert mock_client.post.await_args.args == ("/emails",)
+        call_args = mock_client.post.await_args.kwargs["json"]
+        assert call_args["to"] == "user@example.com"
+        assert "Reset Your Password" in call_args["subject"]
+        assert "abc123" in call_args["html"]
+        assert "testuser" in call_args["html"]
 
     @pytest.mark.asyncio
     async def test_send_password_reset_email_no_client(self):
@@ -55,7 +61,7 @@ class TestEmailService:
         service = EmailService()
         service.client = None  # Simulate missing API key
 
-        result = service.send_password_reset_email(
+        result = await service.send_password_reset_email(
             email="user@example.com",
             reset_link="http://localhost:3000/reset",
             username="testuser"
@@ -63,27 +69,70 @@ class TestEmailService:
 
         assert result is False
 
+    @pytest.mark.asyncio
+    async def test_send_password_reset_email_http_error(self):
+        """Test a Resend error response is reported as a failed send."""
+        mock_client = self.mock_client("unused")
+        mock_client.post.return_value.raise_for_status.side_effect = Exception("422")
+
+        service = EmailService()
+        service.client = mock_client
+
+        result = await service.send_password_reset_email(
+            email="user@example.com",
+            reset_link="http://localhost:3000/reset"
+        )
+
+        assert result is False
+
+    @pytest.mark.asyncio
+    async def test_transient_error_is_retried(self):
+        """Test a network error is retried with backoff before giving up."""
+        mock_client = self.mock_client("retried-id")
+        ok = mock_client.post.return_value
+        mock_client.post.side_effect = [httpx.ConnectError("reset"), ok]
+
+        service = EmailService()
+        service.client = mock_client
+
+        with patch('rag.services.email_service.EMAIL_RETRY_BASE_DELAY', 0):
+            result = await service.send_welcome_email("user@example.com", "testuser")
+
+        assert result is True
+        assert mock_client.post.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_client_error_is_not_retried(self):
+        """Test a 4xx response fails without further attempts."""
+        mock_client = self.mock_client("unused")
+        request = httpx.Request("POST", "https://api.resend.com/emails")
+        mock_client.post.return_value.raise_for_status.side_effect = httpx.HTTPStatusError(
+            "422", request=request, response=httpx.Response(422, request=request)
+        )
+
+        service = EmailService()
+        service.client = mock_client
+
+        assert await service.send_welcome_email("user@example.com", "testuser") is False
+        assert mock_client.post.await_count == 1
+
     @pytest.mark.asyncio
     async def test_send_welcome_email_with_mock(self):
         """Test welcome email is sent correctly."""
-        with patch('rag.services.email_service.Resend') as mock_resend:
-            mock_client = MagicMock()
-            mock_client.emails.send.return_value = {"id": "welcome-email-id"}
-            mock_resend.return_value = mock_client
+        mock_client = self.mock_client("welcome-email-id")
 
-            service = EmailService()
-            service.client = mock_client
+        service = EmailService()
+        service.client = mock_client
 
-            result = service.send_welcome_email(
-                email="user@example.com",
-                username="testuser"
-            )
+        result = await service.send_welcome_email(
+            email="user@example.com",
+            username="testuser"
+        )
 
-            assert result is True
-            assert mock_client.emails.send.called
-            call_args = mock_client.emails.send.call_args[0][0]
-            assert call_args["to"] == "user@example.com"
-            assert "Welcome" in call_args["subject"]
+        assert result is True
+        call_args = mock_client.post.await_args.kwargs["json"]
+        assert call_args["to"] == "user@example.com"
+        assert "Welcome" in call_args["subject"]
 
 
 class TestSensitiveDataFiltering:
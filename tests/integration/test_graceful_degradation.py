@@ -8,9 +8,13 @@ Tests:
 - Fallback order: Grok → Gemini → Claude → OpenAI → Ollama
 - All providers fail graceful error handling
 """
+import asyncio
+
 import pytest
-from unittest.mock import patch, MagicMock, call
-from rag.services.llm_service import LLMService, LLMProvider
+from unittest.mock import patch, MagicMock, AsyncMock, call
+from rag.services.llm_service import (
+    CircuitBreaker, CircuitState, LLMService, LLMProvider, generate_answer_batch_sync
+)
 
 
 class TestLLMServiceInitialization:
@@ -72,11 +76,12 @@ class TestLLMServiceFallback:
             mock_settings.anthropic_api_key = None
             mock_settings.openai_api_key = None
             mock_settings.use_ollama = False
+            mock_settings.llm_hedge_delay_ms = 800
 
             service = LLMService()
 
-            with patch.object(service, '_call_grok') as mock_grok, \
-                 patch.object(service, '_call_gemini') as mock_gemini:
+            with patch.object(service, '_call_grok', new_callable=AsyncMock) as mock_grok, \
+                 patch.object(service, '_call_gemini', new_callable=AsyncMock) as mock_gemini:
 
                 # Grok fails, Gemini succeeds
                 mock_grok.side_effect = Exception("Grok API error")
@@ -88,7 +93,7 @@ class TestLLMServiceFallback:
                     "error": None
                 }
 
-                result = service.generate_answer("What is AI?")
+                result = await service.generate_answer("What is AI?")
 
                 # Verify Grok was tried first
                 assert mock_grok.called
@@ -109,17 +114,19 @@ class TestLLMServiceFallback:
             mock_settings.anthropic_api_key = None
             mock_settings.openai_api_key = None
             mock_settings.use_ollama = False
+            mock_settings.llm_hedge_delay_ms = 800
 
             service = LLMService()
 
-            with patch.object(service, '_call_grok') as mock_grok, \
-                 patch.object(service, '_call_gemini') as mock_gemini:
+            with patch.object(service, '_call_grok', new_callable=AsyncMock) as mock_grok, \
+                 patch.object(service, '_call_gemini', new_callable=AsyncMock) as mock_gemini, \
+                 patch('asyncio.sleep', new_callable=AsyncMock):  # Skip backoff waits
 
                 # Both fail
                 mock_grok.side_effect = Exception("Grok API error")
                 mock_gemini.side_effect = Exception("Gemini API error")
 
-                result = service.generate_answer("What is AI?")
+                result = await service.generate_answer("What is AI?")
 
                 # Verify failure
                 assert not result["success"]
@@ -139,8 +146,8 @@ class TestLLMServiceFallback:
 
             service = LLMService()
 
-            with patch.object(service, '_call_grok') as mock_grok, \
-                 patch('time.sleep'):  # Mock sleep to speed up test
+            with patch.object(service, '_call_grok', new_callable=AsyncMock) as mock_grok, \
+                 patch('asyncio.sleep', new_callable=AsyncMock):  # Mock sleep to speed up test
 
                 # First call fails, second succeeds
                 mock_grok.side_effect = [
@@ -160,7 +167,7 @@ class TestLLMServiceFallback:
                     }
                 ]
 
-                result = service.generate_answer("What is AI?")
+                result = await service.generate_answer("What is AI?")
 
                 # Verify retry was attempted (called twice)
                 assert mock_grok.call_count == 2
@@ -177,11 +184,12 @@ class TestLLMServiceFallback:
             mock_settings.anthropic_api_key = None
             mock_settings.openai_api_key = None
             mock_settings.use_ollama = False
+            mock_settings.llm_hedge_delay_ms = 800
 
             service = LLMService()
 
-            with patch.object(service, '_call_grok') as mock_grok, \
-                 patch.object(service, '_call_gemini') as mock_gemini:
+            with patch.object(service, '_call_grok', new_callable=AsyncMock) as mock_grok, \
+                 patch.object(service, '_call_gemini', new_callable=AsyncMock) as mock_gemini:
 
                 # First call: Grok fails, Gemini succeeds
                 mock_grok.side_effect = Exception("Grok error")
@@ -193,7 +201,7 @@ class TestLLMServiceFallback:
                     "error": None
                 }
 
-                result1 = service.generate_answer("First question?")
+                result1 = await service.generate_answer("First question?")
                 assert result1["provider"] == "gemini"
                 assert service.last_successful_provider == LLMProvider.GEMINI
 
@@ -210,7 +218,7 @@ class TestLLMServiceFallback:
                     "error": None
                 }
 
-                result2 = service.generate_answer("Second question?")
+                result2 = await service.generate_answer("Second question?")
 
                 # Verify Gemini was called (as last successful)
                 assert mock_gemini.called
@@ -218,6 +226,250 @@ class TestLLMServiceFallback:
                 assert not mock_grok.called
 
 
+class TestLLMServiceHedging:
+    """Test speculative execution across providers."""
+
+    def configure(self, mock_settings, hedge_delay_ms):
+        mock_settings.xai_api_key = "grok-key"
+        mock_settings.google_api_key = "gemini-key"
+        mock_settings.anthropic_api_key = None
+        mock_settings.openai_api_key = None
+        mock_settings.use_ollama = False
+        mock_settings.llm_hedge_delay_ms = hedge_delay_ms
+
+    def answer(self, provider):
+        return {
+            "answer": f"Answer from {provider}",
+            "provider": provider,
+            "model": provider,
+            "success": True,
+            "error": None
+        }
+
+    @pytest.mark.asyncio
+    async def test_slow_provider_is_hedged(self):
+        """Test a slow Grok call is overtaken by Gemini and then cancelled."""
+        cancelled = asyncio.Event()
+
+        async def slow_grok(*args):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return self.answer("grok")
+
+        with patch('rag.services.llm_service.settings') as mock_settings:
+            self.configure(mock_settings, hedge_delay_ms=20)
+            service = LLMService()
+
+            with patch.object(service, '_call_grok', side_effect=slow_grok), \
+                 patch.object(service, '_call_gemini', new_callable=AsyncMock) as mock_gemini:
+                mock_gemini.return_value = self.answer("gemini")
+
+                result = await asyncio.wait_for(service.generate_answer("What is AI?"), timeout=1)
+                await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+        assert result["provider"] == "gemini"
+        assert service.last_successful_provider == LLMProvider.GEMINI
+
+    @pytest.mark.asyncio
+    async def test_fast_provider_is_not_hedged(self):
+        """Test no second provider is started when the first answers in time."""
+        with patch('rag.services.llm_service.settings') as mock_settings:
+            self.configure(mock_settings, hedge_delay_ms=500)
+            service = LLMService()
+
+            with patch.object(service, '_call_grok', new_callable=AsyncMock) as mock_grok, \
+                 patch.object(service, '_call_gemini', new_callable=AsyncMock) as mock_gemini:
+                mock_grok.return_value = self.answer("grok")
+
+                result = await service.generate_answer("What is AI?")
+
+        assert result["provider"] == "grok"
+        assert not mock_gemini.called
+
+    @pytest.mark.asyncio
+    async def test_zero_delay_is_sequential(self):
+        """Test hedging is off when llm_hedge_delay_ms is 0."""
+        async def slow_grok(*args):
+            await asyncio.sleep(0.05)
+            return self.answer("grok")
+
+        with patch('rag.services.llm_service.settings') as mock_settings:
+            self.configure(mock_settings, hedge_delay_ms=0)
+            service = LLMService()
+
+            with patch.object(service, '_call_grok', side_effect=slow_grok), \
+                 patch.object(service, '_call_gemini', new_callable=AsyncMock) as mock_gemini:
+                result = await service.generate_answer("What is AI?")
+
+        assert result["provider"] == "grok"
+        assert not mock_gemini.called
+
+
+class TestLLMServiceStreaming:
+    """Test token streaming."""
+
+    @pytest.mark.asyncio
+    async def test_ollama_stream_yields_tokens(self):
+        """Test Ollama's line-delimited JSON is forwarded token by token."""
+        import json
+        import httpx
+
+        body = "\n".join(json.dumps(part) for part in [
+            {"response": "Hel", "done": False},
+            {"response": "lo", "done": False},
+            {"response": "", "done": True},
+        ])
+
+        with patch('rag.services.llm_service.settings') as mock_settings:
+            mock_settings.xai_api_key = None
+            mock_settings.google_api_key = None
+            mock_settings.anthropic_api_key = None
+            mock_settings.openai_api_key = None
+            mock_settings.use_ollama = True
+            mock_settings.ollama_model = "llama3"
+
+            service = LLMService()
+            service._ollama_client = httpx.AsyncClient(
+                base_url="http://ollama.test",
+                transport=httpx.MockTransport(lambda request: httpx.Response(200, text=body))
+            )
+            tokens = [t async for t in service.stream_answer("Hi?")]
+            await service.close()
+
+        assert tokens == ["Hel", "lo"]
+
+    @pytest.mark.asyncio
+    async def test_stream_falls_back_before_first_token(self):
+        """Test a provider failing before its first token hands over to the next."""
+        async def broken(*args):
+            raise Exception("Grok stream refused")
+            yield  # pragma: no cover
+
+        async def gemini(*args):
+            for token in ("Answer ", "from ", "Gemini"):
+                yield token
+
+        with patch('rag.services.llm_service.settings') as mock_settings:
+            mock_settings.xai_api_key = "grok-key"
+            mock_settings.google_api_key = "gemini-key"
+            mock_settings.anthropic_api_key = None
+            mock_settings.openai_api_key = None
+            mock_settings.use_ollama = False
+
+            service = LLMService()
+            with patch.object(service, '_stream_grok', broken), \
+                 patch.object(service, '_stream_gemini', gemini):
+                answer = "".join([t async for t in service.stream_answer("What is AI?")])
+
+        assert answer == "Answer from Gemini"
+        assert service.last_successful_provider == LLMProvider.GEMINI
+        assert service._breakers[LLMProvider.GROK].failure_count == 1
+
+    @pytest.mark.asyncio
+    async def test_stream_all_providers_fail(self):
+        """Test the graceful error message is streamed when nothing starts."""
+        async def broken(*args):
+            raise Exception("down")
+            yield  # pragma: no cover
+
+        with patch('rag.services.llm_service.settings') as mock_settings:
+            mock_settings.xai_api_key = "grok-key"
+            mock_settings.google_api_key = None
+            mock_settings.anthropic_api_key = None
+            mock_settings.openai_api_key = None
+            mock_settings.use_ollama = False
+
+            service = LLMService()
+            with patch.object(service, '_stream_grok', broken):
+                tokens = [t async for t in service.stream_answer("What is AI?")]
+
+        assert tokens == [LLMService.UNAVAILABLE_ANSWER]
+
+
+class TestLLMServiceBackoff:
+    """Test the retry delay."""
+
+    def test_backoff_doubles_with_jitter_and_cap(self):
+        """Test the delay doubles per attempt within ±50% and never exceeds the cap."""
+        with patch('rag.services.llm_service.settings') as mock_settings:
+            mock_settings.xai_api_key = None
+            mock_settings.google_api_key = None
+            mock_settings.anthropic_api_key = None
+            mock_settings.openai_api_key = None
+            mock_settings.use_ollama = False
+            service = LLMService()
+
+        with patch('rag.services.llm_service.random.uniform', return_value=1.0):
+            assert [service._backoff(a) for a in range(5)] == [1, 2, 4, 8, 8]
+
+        for attempt in range(3):
+            base = service.RETRY_DELAY_SECONDS * 2 ** attempt
+            delays = [service._backoff(attempt) for _ in range(50)]
+            assert all(0.5 * base <= d <= 1.5 * base for d in delays)
+            assert len(set(delays)) > 1
+
+
+class TestLLMServiceRetryableErrors:
+    """Test that only transient errors are retried."""
+
+    def status_error(self, code):
+        import httpx
+        request = httpx.Request("POST", "http://provider.test")
+        return httpx.HTTPStatusError(
+            f"HTTP {code}", request=request, response=httpx.Response(code, request=request)
+        )
+
+    @pytest.mark.parametrize("code, retryable", [
+        (400, False), (401, False), (404, False),
+        (408, True), (429, True), (500, True), (503, True),
+    ])
+    def test_status_codes(self, code, retryable):
+        """Test 4xx fail fast except 408/429; 5xx are retried."""
+        from rag.services.llm_service import _is_retryable
+        assert _is_retryable(self.status_error(code)) is retryable
+
+    def test_errors_without_status(self):
+        """Test timeouts and unknown errors retry, a missing SDK does not."""
+        import httpx
+        from rag.services.llm_service import _is_retryable
+        assert _is_retryable(httpx.ReadTimeout("slow"))
+        assert _is_retryable(Exception("unknown"))
+        assert not _is_retryable(ImportError("openai not installed"))
+
+    @pytest.mark.asyncio
+    async def test_auth_error_falls_back_immediately(self):
+        """Test a 401 is tried once, then the next provider is used without waiting."""
+        with patch('rag.services.llm_service.settings') as mock_settings:
+            mock_settings.xai_api_key = "bad-key"
+            mock_settings.google_api_key = "gemini-key"
+            mock_settings.anthropic_api_key = None
+            mock_settings.openai_api_key = None
+            mock_settings.use_ollama = False
+            mock_settings.llm_hedge_delay_ms = 800
+            service = LLMService()
+
+            with patch.object(service, '_call_grok', new_callable=AsyncMock) as mock_grok, \
+                 patch.object(service, '_call_gemini', new_callable=AsyncMock) as mock_gemini, \
+                 patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+                mock_grok.side_effect = self.status_error(401)
+                mock_gemini.return_value = {
+                    "answer": "Answer from Gemini",
+                    "provider": "gemini",
+                    "model": "gemini-2.0-flash",
+                    "success": True,
+                    "error": None
+                }
+
+                result = await service.generate_answer("What is AI?")
+
+        assert result["provider"] == "gemini"
+        assert mock_grok.call_count == 1
+        mock_sleep.assert_not_awaited()
+
+
 class TestLLMServiceErrorHandling:
     """Test error handling and error messages."""
 
@@ -233,11 +485,11 @@ class TestLLMServiceErrorHandling:
 
             service = LLMService()
 
-            with patch.object(service, '_call_grok') as mock_grok:
+            with patch.object(service, '_call_grok', new_callable=AsyncMock) as mock_grok:
                 # All retries fail
                 mock_grok.side_effect = Exception("API Rate Limited")
 
-                result = service.generate_answer("Test?")
+                result = await service.generate_answer("Test?")
 
                 # Verify error includes attempt info
                 assert not result["success"]
@@ -259,8 +511,275 @@ class TestLLMServiceErrorHandling:
             # Should have no providers
             assert len(service.providers) == 0
 
-            result = service.generate_answer("Test?")
+            result = await service.generate_answer("Test?")
 
             # Should gracefully return error
             assert not result["success"]
             assert result["provider"] == "none"
+
+
+class TestLLMServiceAsyncClients:
+    """Test the shared async provider clients."""
+
+    @pytest.mark.asyncio
+    async def test_ollama_reuses_async_client(self):
+        """Test Ollama calls go through one shared httpx.AsyncClient."""
+        import httpx
+
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={"response": "Hi from Ollama"})
+
+        with patch('rag.services.llm_service.settings') as mock_settings:
+            mock_settings.xai_api_key = None
+            mock_settings.google_api_key = None
+            mock_settings.anthropic_api_key = None
+            mock_settings.openai_api_key = None
+            mock_settings.use_ollama = True
+            mock_settings.ollama_model = "llama3"
+
+            service = LLMService()
+            service._ollama_client = httpx.AsyncClient(
+                base_url="http://ollama.test",
+                transport=httpx.MockTransport(handler)
+            )
+            client = service._ollama_client
+
+            first = await service.generate_answer("Hello?")
+            second = await service.generate_answer("Again?")
+            await service.close()
+
+        assert first["answer"] == second["answer"] == "Hi from Ollama"
+        assert len(requests) == 2
+        assert requests[0].url.path == "/api/generate"
+        assert client.is_closed
+        assert service._ollama_client is None
+
+    @pytest.mark.asyncio
+    async def test_missing_sdk_is_a_provider_failure(self):
+        """Test a provider whose SDK is not installed fails over cleanly."""
+        with patch('rag.services.llm_service.settings') as mock_settings, \
+             patch('rag.services.llm_service.OPENAI_AVAILABLE', False), \
+             patch('asyncio.sleep', new_callable=AsyncMock):
+            mock_settings.xai_api_key = "grok-key"
+            mock_settings.google_api_key = None
+            mock_settings.anthropic_api_key = None
+            mock_settings.openai_api_key = None
+            mock_settings.use_ollama = False
+
+            service = LLMService()
+            result = await service._try_provider(LLMProvider.GROK, "Hello?", 64, 0.0)
+
+        assert not result["success"]
+        assert "openai not installed" in result["error"]
+
+
+class TestLLMServiceCircuitBreaker:
+    """Test per-provider circuit breakers."""
+
+    def make_service(self, mock_settings):
+        mock_settings.xai_api_key = "grok-key"
+        mock_settings.google_api_key = "gemini-key"
+        mock_settings.anthropic_api_key = None
+        mock_settings.openai_api_key = None
+        mock_settings.use_ollama = False
+        mock_settings.llm_hedge_delay_ms = 800
+        return LLMService()
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_provider(self):
+        """Test a provider that keeps failing is not called again until recovery."""
+        with patch('rag.services.llm_service.settings') as mock_settings:
+            service = self.make_service(mock_settings)
+
+            with patch.object(service, '_call_grok', new_callable=AsyncMock) as mock_grok, \
+                 patch.object(service, '_call_gemini', new_callable=AsyncMock) as mock_gemini, \
+                 patch('asyncio.sleep', new_callable=AsyncMock):
+                mock_grok.side_effect = Exception("Grok outage")
+                mock_gemini.return_value = {
+                    "answer": "Answer from Gemini",
+                    "provider": "gemini",
+                    "model": "gemini-2.0-flash",
+                    "success": True,
+                    "error": None
+                }
+
+                await service.generate_answer("First?")
+                assert mock_grok.call_count == service.BREAKER_FAILURE_THRESHOLD
+                assert service._breakers[LLMProvider.GROK].state == CircuitState.OPEN
+
+                # Even when Grok is preferred again, the open circuit skips it
+                service.last_successful_provider = LLMProvider.GROK
+                result = await service.generate_answer("Second?")
+
+        assert result["provider"] == "gemini"
+        assert mock_grok.call_count == service.BREAKER_FAILURE_THRESHOLD
+
+    def test_half_open_probe_decides(self):
+        """Test one probe after the recovery timeout closes or reopens the circuit."""
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=30)
+        with patch('rag.services.llm_service.time.monotonic', return_value=100.0):
+            breaker.record_failure()
+            assert breaker.allow()
+            breaker.record_failure()
+            assert breaker.state == CircuitState.OPEN
+            assert not breaker.allow()
+
+        with patch('rag.services.llm_service.time.monotonic', return_value=130.0):
+            assert breaker.allow()
+            assert breaker.state == CircuitState.HALF_OPEN
+            assert not breaker.allow()  # Probe still in flight
+            breaker.record_failure()
+            assert breaker.state == CircuitState.OPEN
+
+        with patch('rag.services.llm_service.time.monotonic', return_value=160.0):
+            assert breaker.allow()
+            breaker.record_success()
+            assert breaker.state == CircuitState.CLOSED
+            assert breaker.failure_count == 0
+
+
+class TestLLMServiceRateLimiting:
+    """Test per-provider concurrency limits and Retry-After handling."""
+
+    def make_service(self, mock_settings):
+        mock_settings.xai_api_key = None
+        mock_settings.google_api_key = None
+        mock_settings.anthropic_api_key = None
+        mock_settings.openai_api_key = None
+        mock_settings.use_ollama = True
+        mock_settings.ollama_model = "llama3"
+        return LLMService()
+
+    @pytest.mark.asyncio
+    async def test_inflight_calls_are_capped(self):
+        """Test concurrent requests never exceed MAX_INFLIGHT calls to one provider."""
+        running = 0
+        peak = 0
+
+        async def slow_ollama(*args):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {"answer": "ok", "provider": "ollama", "model": "llama3", "success": True, "error": None}
+
+        with patch('rag.services.llm_service.settings') as mock_settings:
+            service = self.make_service(mock_settings)
+            with patch.object(service, '_call_ollama', side_effect=slow_ollama):
+                results = await asyncio.gather(*[service.generate_answer(f"Q{i}?") for i in range(6)])
+
+        assert all(r["success"] for r in results)
+        assert peak == service.MAX_INFLIGHT[LLMProvider.OLLAMA]
+
+    @pytest.mark.asyncio
+    async def test_batch_runs_prompts_concurrently(self):
+        """Test a batch overlaps its calls and keeps the prompt order."""
+        running = 0
+        peak = 0
+
+        async def slow_ollama(prompt, *args):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {"answer": prompt.upper(), "provider": "ollama", "model": "llama3", "success": True, "error": None}
+
+        with patch('rag.services.llm_service.settings') as mock_settings:
+            service = self.make_service(mock_settings)
+            with patch.object(service, '_call_ollama', side_effect=slow_ollama):
+                results = await service.generate_answer_batch(["a", "b", "c"])
+
+        assert [r["answer"] for r in results] == ["A", "B", "C"]
+        assert peak == 2
+
+    def test_sync_batch_can_run_repeatedly(self):
+        """Test each asyncio.run gets a service bound to its own loop."""
+        async def slow_ollama(prompt, *args):
+            await asyncio.sleep(0.01)
+            return {"answer": prompt, "provider": "ollama", "model": "llama3", "success": True, "error": None}
+
+        with patch('rag.services.llm_service.settings') as mock_settings, \
+                patch.object(LLMService, '_call_ollama', side_effect=slow_ollama):
+            self.make_service(mock_settings)
+            # Six prompts against a limit of two contend for the semaphore in both runs
+            for _ in range(2):
+                results = generate_answer_batch_sync([f"Q{i}?" for i in range(6)])
+                assert all(r["success"] for r in results)
+
+    @pytest.mark.asyncio
+    async def test_identical_concurrent_prompts_share_one_call(self):
+        """Test concurrent identical requests are served by a single provider call."""
+        async def slow_ollama(prompt, *args):
+            await asyncio.sleep(0.01)
+            return {"answer": "shared", "provider": "ollama", "model": "llama3", "success": True, "error": None}
+
+        with patch('rag.services.llm_service.settings') as mock_settings:
+            service = self.make_service(mock_settings)
+            with patch.object(service, '_call_ollama', side_effect=slow_ollama) as mock_ollama:
+                results = await asyncio.gather(
+                    *[service.generate_answer("Same FAQ?") for _ in range(5)],
+                    service.generate_answer("Other question?")
+                )
+
+        assert [r["answer"] for r in results] == ["shared"] * 6
+        assert mock_ollama.call_count == 2
+        assert results[0] is not results[1]
+        assert not service._inflight
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_waits_for_retry_after(self):
+        """Test a 429 is retried after Retry-After and does not trip the breaker."""
+        import httpx
+
+        responses = [
+            httpx.Response(429, headers={"Retry-After": "3"}),
+            httpx.Response(200, json={"response": "Hi from Ollama"}),
+        ]
+
+        with patch('rag.services.llm_service.settings') as mock_settings:
+            service = self.make_service(mock_settings)
+            service._ollama_client = httpx.AsyncClient(
+                base_url="http://ollama.test",
+                transport=httpx.MockTransport(lambda request: responses.pop(0))
+            )
+            with patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+                result = await service.generate_answer("Hello?")
+            await service.close()
+
+        assert result["answer"] == "Hi from Ollama"
+        mock_sleep.assert_awaited_once_with(3.0)
+        assert service._breakers[LLMProvider.OLLAMA].failure_count == 0
+
+    @pytest.mark.asyncio
+    async def test_gemini_model_is_built_once(self):
+        """Test the GenerativeModel is reused and sampling params are passed per call."""
+        genai = MagicMock()
+        model = genai.GenerativeModel.return_value
+        model.generate_content_async = AsyncMock(return_value=MagicMock(text="Hi from Gemini"))
+
+        with patch('rag.services.llm_service.settings') as mock_settings, \
+             patch('rag.services.llm_service.genai', genai), \
+             patch('rag.services.llm_service.GEMINI_AVAILABLE', True):
+            mock_settings.xai_api_key = None
+            mock_settings.google_api_key = "gemini-key"
+            mock_settings.anthropic_api_key = None
+            mock_settings.openai_api_key = None
+            mock_settings.use_ollama = False
+            mock_settings.gemini_model = "gemini-2.5-flash"
+
+            service = LLMService()
+            await service.generate_answer("One?", max_tokens=64, temperature=0.1)
+            result = await service.generate_answer("Two?", max_tokens=128, temperature=0.2)
+
+        assert result["answer"] == "Hi from Gemini"
+        genai.configure.assert_called_once_with(api_key="gemini-key")
+        genai.GenerativeModel.assert_called_once_with("gemini-2.5-flash")
+        assert model.generate_content_async.await_args.kwargs["generation_config"] == {
+            "temperature": 0.2,
+            "max_output_tokens": 128,
+        }
@@ -268,7 +268,7 @@ class TestUploadPipeline:
         user = await self.create_test_user(db_session)
 
         with patch('rag.services.rag_service.search_documents_by_text') as mock_search:
-            with patch('rag.services.rag_service.generate_answer') as mock_generate:
+            with patch('rag.services.rag_service.generate_answer_async', new_callable=AsyncMock) as mock_generate:
                 # Mock search results
                 mock_search.return_value = [
                     {
@@ -313,23 +313,23 @@ class TestUploadPipeline:
             mock_settings.allowed_file_types = {'.txt', '.pdf', '.docx'}
             mock_settings.max_file_size_mb = 10
 
-            # Create background tasks mock
-            background_tasks = MagicMock()
+            # Create document queue mock
+            document_queue = MagicMock()
             test_file = self.create_test_file(test_content)
 
             # Upload (but don't actually process in background for this test)
-            with patch('rag.services.rag_service.process_document'):
+            with patch('rag.services.rag_service.process_document'), \
+                    patch('rag.services.rag_service.get_document_queue', return_value=document_queue):
                 document = await upload_and_process_document(
                     db_session,
                     user.id,
-                    test_file,
-                    background_tasks
+                    test_file
                 )
 
                 assert document.id is not None
                 assert document.status == "pending"
                 assert document.user_id == user.id
-                assert background_tasks.add_task.called
+                document_queue.enqueue.assert_called_once()
 
         # Step 3: Simulate processing
         with patch('rag.services.rag_service.process_document') as mock_process:
@@ -370,7 +370,7 @@ class TestUploadPipeline:
 
         # Step 4: Query the processed document
         with patch('rag.services.rag_service.search_documents_by_text') as mock_search:
-            with patch('rag.services.rag_service.generate_answer') as mock_generate:
+            with patch('rag.services.rag_service.generate_answer_async', new_callable=AsyncMock) as mock_generate:
                 mock_search.return_value = [
                     {
                         'metadata': {
@@ -443,8 +443,13 @@ class TestDocumentChunking:
             }
         ]
 
-        await document_crud.create_chunks(db_session, doc.id, chunk_data)
+        inserted = await document_crud.create_chunks(db_session, doc.id, chunk_data)
+        assert inserted == 2
 
         # Verify chunks were saved
         document = await document_crud.get_document_by_id(db_session, doc.id, user.id)
         assert document.num_chunks is None or document.num_chunks >= 0
+
+        chunks = await document_crud.get_document_chunks(db_session, doc.id)
+        assert [c.chunk_index for c in chunks] == [0, 1]
+        assert chunks[1].content == "Second chunk content"
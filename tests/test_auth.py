@@ -54,7 +54,14 @@ class TestRegistration:
         assert data["username"] == test_user_data["username"]
         assert "id" in data
         assert "hashed_password" not in data  # Should not expose password
-    
+
+    async def test_register_frontend_payload(self, client: AsyncClient, test_user_data):
+        """Test the body sent by RegisterForm, including confirmPassword."""
+        payload = {**test_user_data, "confirmPassword": test_user_data["password"]}
+        response = await client.post("/api/v1/auth/register", json=payload)
+        assert response.status_code == 201
+        assert response.json()["email"] == test_user_data["email"]
+
     async def test_register_duplicate_email(self, client: AsyncClient, test_user_data):
         """Test registration with duplicate email."""
         # Register first time
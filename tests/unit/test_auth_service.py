@@ -0,0 +1,205 @@
+"""
+Unit tests for the auth service.
+File: tests/unit/test_auth_service.py
+"""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from rag.core.security import create_refresh_token
+from rag.schemas.user import UserCreate
+from rag.services import auth_service
+
+
+def user_data() -> UserCreate:
+    """Registration payload used across tests."""
+    return UserCreate(
+        email="new@example.com",
+        username="newuser",
+        password="SecurePass123"
+    )
+
+
+class TestRegisterDuplicates:
+    """Tests for duplicate email/username detection."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("existing, message", [
+        ([("new@example.com", "other")], "Email already registered"),
+        ([("other@example.com", "newuser")], "Username already taken"),
+        ([
+            ("other@example.com", "newuser"),
+            ("new@example.com", "other"),
+        ], "Email already registered"),
+    ])
+    async def test_conflict_raises(self, existing, message):
+        """Test the matching field decides the error from one lookup."""
+        lookup = AsyncMock(return_value=existing)
+        with patch.object(auth_service.user_crud, "get_email_username_matches", lookup), \
+                patch.object(auth_service.user_crud, "create_user", AsyncMock()) as create:
+            with pytest.raises(ValueError, match=message):
+                await auth_service.register_new_user(None, user_data())
+
+        lookup.assert_awaited_once_with(None, "new@example.com", "newuser")
+        create.assert_not_called()
+
+
+class TestEmailUsernameMatches:
+    """Tests for the combined uniqueness query."""
+
+    @pytest.mark.asyncio
+    async def test_selects_only_unique_columns(self):
+        """Test one OR query fetches just email and username."""
+        from rag.crud.user import get_email_username_matches
+
+        db = AsyncMock()
+        db.execute.return_value.all = lambda: [("a@b.c", "abc")]
+
+        assert await get_email_username_matches(db, "a@b.c", "abc") == [("a@b.c", "abc")]
+        sql = str(db.execute.await_args.args[0])
+        assert sql.startswith("SELECT users.email, users.username")
+        assert "users.email = :email_1 OR users.username = :username_1" in sql
+
+
+class TestRefreshUserTokens:
+    """Tests for the refresh path and its per-user cache."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        """Isolate tests from each other's cached users."""
+        auth_service._refresh_user_cache.clear()
+        yield
+        auth_service._refresh_user_cache.clear()
+
+    def patch_lookups(self):
+        """Patch the token and user lookups with a valid session."""
+        user = SimpleNamespace(id=uuid4(), username="alice", is_active=True)
+        db_token = SimpleNamespace(is_valid=True)
+        return (
+            user,
+            patch.object(auth_service.token_crud, "get_refresh_token", AsyncMock(return_value=db_token)),
+            patch.object(auth_service.user_crud, "get_user_by_id", AsyncMock(return_value=user)),
+        )
+
+    @pytest.mark.asyncio
+    async def test_user_lookup_cached_token_row_not(self):
+        """Test repeat refreshes skip the user lookup but still read the token row."""
+        user, token_patch, user_patch = self.patch_lookups()
+        refresh = create_refresh_token({"sub": str(user.id)})
+
+        with token_patch as get_token, user_patch as get_user:
+            first = await auth_service.refresh_user_tokens(None, refresh)
+            second = await auth_service.refresh_user_tokens(None, refresh)
+
+        assert first and second
+        assert get_token.await_count == 2
+        assert get_user.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_revoked_or_missing_row_rejected(self):
+        """Test a cached user does not let a revoked or missing token through."""
+        user, token_patch, user_patch = self.patch_lookups()
+        refresh = create_refresh_token({"sub": str(user.id)})
+
+        with token_patch as get_token, user_patch:
+            assert await auth_service.refresh_user_tokens(None, refresh)
+            get_token.return_value = SimpleNamespace(is_valid=False)
+            assert await auth_service.refresh_user_tokens(None, refresh) is None
+            get_token.return_value = None
+            assert await auth_service.refresh_user_tokens(None, refresh) is None
+
+    @pytest.mark.asyncio
+    async def test_logout_drops_cached_user(self):
+        """Test logout revokes the token and forgets its user."""
+        user, token_patch, user_patch = self.patch_lookups()
+        refresh = create_refresh_token({"sub": str(user.id)})
+
+        with token_patch, user_patch, \
+                patch.object(auth_service.token_crud, "revoke_token", AsyncMock(return_value=True)) as revoke:
+            await auth_service.refresh_user_tokens(None, refresh)
+            await auth_service.logout_user(None, refresh)
+
+        revoke.assert_awaited_once_with(None, refresh)
+        assert user.id not in auth_service._refresh_user_cache
+
+    @pytest.mark.asyncio
+    async def test_logout_all_sessions_drops_cached_user(self):
+        """Test logging out everywhere forgets the user."""
+        user, token_patch, user_patch = self.patch_lookups()
+        refresh = create_refresh_token({"sub": str(user.id)})
+
+        with token_patch, user_patch, \
+                patch.object(auth_service.token_crud, "revoke_all_user_tokens", AsyncMock(return_value=1)):
+            await auth_service.refresh_user_tokens(None, refresh)
+            await auth_service.logout_all_sessions(None, user.id)
+
+        assert user.id not in auth_service._refresh_user_cache
+
+    @pytest.mark.asyncio
+    async def test_deactivated_user_cannot_refresh(self):
+        """Test deactivation revokes tokens and the next refresh looks the user up again."""
+        user, token_patch, user_patch = self.patch_lookups()
+        refresh = create_refresh_token({"sub": str(user.id)})
+
+        with token_patch, user_patch as get_user, \
+                patch.object(auth_service.token_crud, "revoke_all_user_tokens", AsyncMock(return_value=1)) as revoke, \
+                patch.object(auth_service.user_crud, "deactivate_user", AsyncMock(return_value=user)):
+            await auth_service.refresh_user_tokens(None, refresh)
+            await auth_service.deactivate_account(None, user.id)
+            user.is_active = False
+            assert await auth_service.refresh_user_tokens(None, refresh) is None
+
+        revoke.assert_awaited_once_with(None, user.id)
+        assert get_user.await_count == 2
+
+
+class TestCreateUserTokens:
+    """Tests for login token issuance."""
+
+    @pytest.mark.asyncio
+    async def test_token_stored_before_return(self):
+        """Test the refresh token row is written in the request path."""
+        user = SimpleNamespace(id=uuid4(), username="alice")
+        db = SimpleNamespace(bind=None)
+
+        with patch.object(auth_service.token_crud, "create_refresh_token", AsyncMock()) as store, \
+                patch.object(auth_service.user_crud, "update_last_login", AsyncMock()):
+            tokens = await auth_service.create_user_tokens(db, user)
+            store.assert_awaited_once()
+            await auth_service.wait_for_pending_logins()
+
+        assert store.await_args.kwargs["token"] == tokens.refresh_token
+        assert store.await_args.kwargs["user_id"] == user.id
+
+    @pytest.mark.asyncio
+    async def test_token_write_failure_propagates(self):
+        """Test a failed token insert fails the login instead of issuing an untracked token."""
+        user = SimpleNamespace(id=uuid4(), username="alice")
+        db = SimpleNamespace(bind=None)
+
+        with patch.object(auth_service.token_crud, "create_refresh_token", AsyncMock(side_effect=RuntimeError("down"))):
+            with pytest.raises(RuntimeError):
+                await auth_service.create_user_tokens(db, user)
+
+    @pytest.mark.asyncio
+    async def test_last_login_recorded_in_background(self):
+        """Test last_login is stamped after returning, and its failure is only logged."""
+        user = SimpleNamespace(id=uuid4(), username="alice")
+        db = SimpleNamespace(bind=None)
+        recorded = asyncio.Event()
+
+        async def update_last_login(session, user_id):
+            recorded.set()
+            raise RuntimeError("down")
+
+        with patch.object(auth_service.token_crud, "create_refresh_token", AsyncMock()), \
+                patch.object(auth_service.user_crud, "update_last_login", side_effect=update_last_login) as update:
+            assert await auth_service.create_user_tokens(db, user)
+            assert not recorded.is_set()
+            await auth_service.wait_for_pending_logins()
+
+        assert recorded.is_set()
+        assert update.await_args.args[1] == user.id
@@ -0,0 +1,73 @@
+"""
+Unit tests for database helpers.
+File: tests/unit/test_database.py
+"""
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from rag.core.database import bulk_load_mode, secondary_indexes
+from rag.models.user import User  # noqa: F401  (registers users table for FKs)
+from rag.models.request_log import RequestLog
+
+
+class RecordingBind:
+    """Fake engine that records compiled DDL instead of executing it."""
+
+    def __init__(self):
+        self.statements = []
+
+    def begin(self):
+        bind = self
+
+        class Conn:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            async def execute(self, statement):
+                bind.statements.append(
+                    str(statement.compile(dialect=postgresql.dialect())).strip()
+                )
+
+        return Conn()
+
+
+class TestBulkLoadMode:
+    """Tests for dropping and rebuilding secondary indexes."""
+
+    def test_secondary_indexes_skip_unique(self):
+        """Test only non-unique indexes are selected."""
+        assert secondary_indexes(User.__table__) == []  # email/username are unique
+        assert [ix.name for ix in secondary_indexes(RequestLog.__table__)] == [
+            "idx_request_log_status_code",
+            "ix_request_logs_created_at",
+            "ix_request_logs_request_id",
+            "ix_request_logs_user_created",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_drops_then_rebuilds(self):
+        """Test indexes are dropped before the load and recreated after."""
+        bind = RecordingBind()
+        names = [ix.name for ix in secondary_indexes(RequestLog.__table__)]
+
+        async with bulk_load_mode(RequestLog.__table__, bind=bind):
+            assert len(bind.statements) == len(names)
+
+        drops, creates = bind.statements[:len(names)], bind.statements[len(names):]
+        assert drops == [f"DROP INDEX IF EXISTS {n}" for n in names]
+        assert all(c.startswith("CREATE INDEX IF NOT EXISTS") for c in creates)
+
+    @pytest.mark.asyncio
+    async def test_rebuilds_on_error(self):
+        """Test indexes are rebuilt even when the load raises."""
+        bind = RecordingBind()
+        n = len(secondary_indexes(RequestLog.__table__))
+
+        with pytest.raises(RuntimeError):
+            async with bulk_load_mode(RequestLog.__table__, bind=bind):
+                raise RuntimeError("load failed")
+
+        assert len(bind.statements) == 2 * n
@@ -0,0 +1,129 @@
+"""
+Unit tests for the document processing worker queue.
+File: tests/unit/test_document_queue.py
+"""
+import asyncio
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from rag.services.document_queue import DocumentQueue
+
+
+class FakeSession:
+    """Stands in for an AsyncSession; counts how many were opened."""
+
+    opened = 0
+
+    async def __aenter__(self):
+        FakeSession.opened += 1
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class TestDocumentQueue:
+    """Tests for DocumentQueue."""
+
+    @pytest.fixture(autouse=True)
+    def reset_sessions(self):
+        FakeSession.opened = 0
+
+    @pytest.mark.asyncio
+    async def test_workers_process_documents_concurrently(self):
+        """Test two workers run two documents at the same time, each in its own session."""
+        running = 0
+        peak = 0
+        done = []
+
+        async def pipeline(session, document_id, file_path, user_id):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+            done.append(document_id)
+            return True
+
+        queue = DocumentQueue(session_factory=FakeSession, workers=2)
+        ids = [uuid4() for _ in range(4)]
+        with patch("rag.services.rag_service.process_document_pipeline", pipeline):
+            queue.start()
+            for doc_id in ids:
+                queue.enqueue(doc_id, f"/tmp/{doc_id}.txt", uuid4())
+            await asyncio.wait_for(queue._queue.join(), timeout=2)
+            await queue.stop()
+
+        assert sorted(done) == sorted(ids)
+        assert peak == 2
+        assert FakeSession.opened == 4
+
+    @pytest.mark.asyncio
+    async def test_failure_does_not_stop_worker(self):
+        """Test a crashing document is logged and the next one still runs."""
+        calls = []
+
+        async def pipeline(session, document_id, file_path, user_id):
+            calls.append(document_id)
+            if len(calls) == 1:
+                raise RuntimeError("embedding API down")
+            return True
+
+        queue = DocumentQueue(session_factory=FakeSession, workers=1)
+        with patch("rag.services.rag_service.process_document_pipeline", pipeline):
+            queue.start()
+            queue.enqueue(uuid4(), "a.txt", uuid4())
+            queue.enqueue(uuid4(), "b.txt", uuid4())
+            await asyncio.wait_for(queue._queue.join(), timeout=2)
+            await queue.stop()
+
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_stop_finishes_current_document(self):
+        """Test shutdown waits for the document being processed."""
+        started = asyncio.Event()
+        finished = []
+
+        async def pipeline(session, document_id, file_path, user_id):
+            started.set()
+            await asyncio.sleep(0.05)
+            finished.append(document_id)
+            return True
+
+        queue = DocumentQueue(session_factory=FakeSession, workers=1)
+        doc_id = uuid4()
+        with patch("rag.services.rag_service.process_document_pipeline", pipeline):
+            queue.start()
+            queue.enqueue(doc_id, "a.txt", uuid4())
+            queue.enqueue(uuid4(), "b.txt", uuid4())
+            await started.wait()
+            await queue.stop()
+
+        assert finished == [doc_id]
+        assert queue.pending() == 1
+
+    @pytest.mark.asyncio
+    async def test_recover_requeues_unfinished_documents(self):
+        """Test startup queues pending and interrupted documents again."""
+        jobs = [(uuid4(), "a.txt", uuid4()), (uuid4(), "b.txt", uuid4())]
+        done = []
+
+        async def reset(session):
+            return jobs
+
+        async def pipeline(session, document_id, file_path, user_id):
+            done.append((document_id, file_path, user_id))
+            return True
+
+        queue = DocumentQueue(session_factory=FakeSession, workers=1)
+        with patch("rag.crud.document.reset_unfinished_documents", reset), \
+                patch("rag.services.rag_service.process_document_pipeline", pipeline):
+            queue.start()
+            assert await queue.recover() == 2
+            await asyncio.wait_for(queue._queue.join(), timeout=2)
+            await queue.stop()
+
+        assert done == jobs
@@ -2,6 +2,8 @@
 Unit tests for embeddings module.
 File: tests/unit/test_embeddings.py
 """
+import sqlite3
+
 import pytest
 import numpy as np
 from pathlib import Path
@@ -90,26 +92,85 @@ class TestSimpleEmbeddingCache:
             assert result is None
 
     def test_cache_handles_read_errors_gracefully(self, tmp_path):
-        """Test cache handles read errors gracefully."""
+        """Test a failing cache query reads as a miss."""
         with patch('rag.embeddings.get_settings') as mock_settings:
             mock_settings.return_value.data_dir = tmp_path
             cache = SimpleEmbeddingCache()
+            cache._conn = MagicMock()
+            cache._conn.execute.side_effect = sqlite3.OperationalError("database is locked")
 
-            # Mock corrupted cache file
-            with patch('numpy.load', side_effect=Exception("Corrupted file")):
-                result = cache.get("text", "model")
-                assert result is None
+            assert cache.get("text", "model") is None
+            assert cache.get_many(["a", "b"], "model") == [None, None]
 
     def test_cache_handles_write_errors_gracefully(self, tmp_path):
-        """Test cache handles write errors gracefully."""
+        """Test a cache database that cannot be opened does not raise on save."""
+        with patch('rag.embeddings.get_settings') as mock_settings, \
+                patch('rag.embeddings.sqlite3.connect', side_effect=sqlite3.OperationalError("unable to open database file")):
+            mock_settings.return_value.data_dir = tmp_path
+            cache = SimpleEmbeddingCache()
+
+            # Should not raise
+            cache.set("text", "model", np.array([0.1, 0.2]))
+
+    @patch('rag.embeddings.SentenceTransformer')
+    def test_embedding_works_without_cache_database(self, mock_transformer, tmp_path):
+        """Test embeddings are still generated when every cache call fails."""
+        mock_model = MagicMock()
+        mock_model.encode.side_effect = lambda texts, batch_size=32: np.ones((len(texts), 3))
+        mock_transformer.return_value = mock_model
+
+        with patch('rag.embeddings.get_settings') as mock_settings, \
+                patch('rag.embeddings.sqlite3.connect', side_effect=sqlite3.Error("disk I/O error")):
+            mock_settings.return_value.data_dir = tmp_path
+            mock_settings.return_value.embedding_batch_size = 32
+            generator = EmbeddingGenerator(use_cache=True)
+
+            single = generator.embed_single_text("hello world")
+            batch = generator.embed_texts(["first", "second"])
+
+        np.testing.assert_array_equal(single, np.ones(3))
+        assert all(e is not None for e in batch)
+
+    def test_get_many_mixes_hits_and_misses(self, tmp_path):
+        """Test a batch lookup returns cached vectors in order and None for misses."""
         with patch('rag.embeddings.get_settings') as mock_settings:
             mock_settings.return_value.data_dir = tmp_path
             cache = SimpleEmbeddingCache()
+            cache.set_many(["a", "c"], "model", [np.array([1.0, 2.0]), np.array([3.0, 4.0])])
+
+            results = cache.get_many(["a", "b", "c"], "model")
+
+            np.testing.assert_array_equal(results[0], [1.0, 2.0])
+            assert results[1] is None
+            np.testing.assert_array_equal(results[2], [3.0, 4.0])
+            assert cache.get_many(["a"], "other-model") == [None]
+
+    def test_cache_persists_across_instances(self, tmp_path):
+        """Test a new cache instance reads vectors written by another."""
+        with patch('rag.embeddings.get_settings') as mock_settings:
+            mock_settings.return_value.data_dir = tmp_path
+            SimpleEmbeddingCache().set("text", "model", np.array([0.5, 0.25]))
+
+            retrieved = SimpleEmbeddingCache().get("text", "model")
+
+            np.testing.assert_array_equal(retrieved, [0.5, 0.25])
+
+    @patch('rag.embeddings.SentenceTransformer')
+    def test_duplicate_chunks_are_not_re_embedded(self, mock_transformer, tmp_path):
+        """Test only cache misses reach the model."""
+        mock_model = MagicMock()
+        mock_model.encode.side_effect = lambda texts, batch_size: np.ones((len(texts), 3))
+        mock_transformer.return_value = mock_model
+
+        with patch('rag.embeddings.get_settings') as mock_settings:
+            mock_settings.return_value.data_dir = tmp_path
+            mock_settings.return_value.embedding_batch_size = 32
+            generator = EmbeddingGenerator(use_cache=True)
+            generator.embed_texts(["first", "second"])
+            results = generator.embed_texts(["second", "third", "first"])
 
-            # Mock write error
-            with patch('numpy.save', side_effect=Exception("Write error")):
-                # Should not raise
-                cache.set("text", "model", np.array([0.1, 0.2]))
+        assert all(r is not None for r in results)
+        assert [c.args[0] for c in mock_model.encode.call_args_list] == [["first", "second"], ["third"]]
 
 
 class TestEmbeddingGenerator:
@@ -297,6 +358,46 @@ class TestEmbeddingGenerator:
             # First doc should have None embedding due to missing text
             assert results[0]['embedding'] is None
 
+    @patch('rag.embeddings.SentenceTransformer')
+    def test_embed_documents_return_mask(self, mock_transformer):
+        """Test return_mask marks which documents were embedded."""
+        mock_model = MagicMock()
+        mock_model.encode.return_value = np.array([[0.1, 0.2, 0.3]])
+        mock_transformer.return_value = mock_model
+
+        with patch('rag.embeddings.get_settings'):
+            generator = EmbeddingGenerator(use_cache=False)
+
+            documents = [
+                {'id': 'doc1'},  # Missing 'text'
+                {'id': 'doc2', 'text': 'Has text'}
+            ]
+
+            results, mask = generator.embed_documents(documents, return_mask=True)
+
+            assert len(results) == 2
+            assert mask.dtype == bool
+            assert mask.tolist() == [False, True]
+            assert int(mask.sum()) == 1
+
+
+    @patch('rag.embeddings.SentenceTransformer')
+    def test_embed_documents_uses_configured_batch_size(self, mock_transformer):
+        """Test chunks are encoded in batches of settings.embedding_batch_size."""
+        mock_model = MagicMock()
+        mock_model.encode.side_effect = lambda texts, batch_size: np.ones((len(texts), 3))
+        mock_transformer.return_value = mock_model
+
+        with patch('rag.embeddings.get_settings') as mock_settings:
+            mock_settings.return_value.embedding_batch_size = 4
+            generator = EmbeddingGenerator(use_cache=False)
+            documents = [{'id': f'doc{i}', 'text': f'Chunk {i}'} for i in range(10)]
+
+            results = generator.embed_documents(documents)
+
+        assert all(doc['embedding'] is not None for doc in results)
+        assert [len(c.args[0]) for c in mock_model.encode.call_args_list] == [4, 4, 2]
+
 
 class TestEmbeddingProcessing:
     """Test document embedding processing."""
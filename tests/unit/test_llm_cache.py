@@ -0,0 +1,167 @@
+"""
+Unit tests for the LLM answer cache.
+File: tests/unit/test_llm_cache.py
+"""
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+
+from rag.services.llm_cache import ResponseCache, SemanticResponseCache
+from rag.services.llm_service import LLMService
+
+
+def answer(text: str, success: bool = True) -> dict:
+    """Provider result dict."""
+    return {
+        "answer": text,
+        "provider": "grok",
+        "model": "grok-3",
+        "success": success,
+        "error": None if success else "boom"
+    }
+
+
+class TestResponseCache:
+    """Tests for ResponseCache."""
+
+    def test_key_depends_on_every_parameter(self):
+        """Test changing any parameter changes the key."""
+        base = ResponseCache.key("grok", "What is AI?", 0.0, 256)
+        assert base == ResponseCache.key("grok", "What is AI?", 0.0, 256)
+        assert base != ResponseCache.key("gemini", "What is AI?", 0.0, 256)
+        assert base != ResponseCache.key("grok", "What is ML?", 0.0, 256)
+        assert base != ResponseCache.key("grok", "What is AI?", 0.1, 256)
+        assert base != ResponseCache.key("grok", "What is AI?", 0.0, 512)
+
+    def test_only_deterministic_calls_are_cacheable(self):
+        """Test the temperature threshold and the size switch."""
+        cache = ResponseCache(temperature_threshold=0.0)
+        assert cache.cacheable(0.0)
+        assert not cache.cacheable(0.7)
+        assert not ResponseCache(max_size=0).cacheable(0.0)
+
+    def test_evicts_least_recently_used(self):
+        """Test a read refreshes an entry and the oldest one is evicted."""
+        cache = ResponseCache(max_size=2)
+        cache.put("a", answer("A"))
+        cache.put("b", answer("B"))
+        assert cache.get("a")["answer"] == "A"
+        cache.put("c", answer("C"))
+
+        assert cache.get("b") is None
+        assert cache.get("a") and cache.get("c")
+        assert len(cache) == 2
+
+    def test_expired_entries_are_dropped(self):
+        """Test entries past their TTL are not returned."""
+        cache = ResponseCache(ttl_seconds=10)
+        with patch("rag.services.llm_cache.time.monotonic", return_value=100.0):
+            cache.put("a", answer("A"))
+        with patch("rag.services.llm_cache.time.monotonic", return_value=109.0):
+            assert cache.get("a")
+        with patch("rag.services.llm_cache.time.monotonic", return_value=110.0):
+            assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_failures_are_not_cached(self):
+        """Test success=False results are skipped."""
+        cache = ResponseCache()
+        cache.put("a", answer("", success=False))
+        assert cache.get("a") is None
+
+
+class TestGenerateAnswerCache:
+    """Tests for the cache in front of the provider loop."""
+
+    @pytest.fixture
+    def service(self):
+        """Service with only Grok configured and a fresh cache."""
+        cache = ResponseCache()
+        with patch("rag.services.llm_service.settings") as mock_settings, \
+                patch("rag.services.llm_service.get_llm_response_cache", return_value=cache):
+            mock_settings.xai_api_key = "grok-key"
+            mock_settings.google_api_key = None
+            mock_settings.anthropic_api_key = None
+            mock_settings.openai_api_key = None
+            mock_settings.use_ollama = False
+            yield LLMService()
+
+    @pytest.mark.asyncio
+    async def test_repeat_deterministic_call_skips_provider(self, service):
+        """Test an identical temperature=0 call is served from the cache."""
+        with patch.object(service, "_call_grok", AsyncMock(return_value=answer("cached"))) as grok:
+            first = await service.generate_answer("What is AI?", temperature=0.0)
+            second = await service.generate_answer("What is AI?", temperature=0.0)
+
+        assert first == second
+        assert grok.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_sampled_call_is_not_cached(self, service):
+        """Test calls above the temperature threshold always reach the provider."""
+        with patch.object(service, "_call_grok", AsyncMock(return_value=answer("fresh"))) as grok:
+            await service.generate_answer("What is AI?", temperature=0.7)
+            await service.generate_answer("What is AI?", temperature=0.7)
+
+        assert grok.await_count == 2
+
+
+class FakeEmbedder:
+    """Maps prompts to fixed vectors."""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def embed_single_text(self, text):
+        return self.vectors.get(text)
+
+
+class TestSemanticResponseCache:
+    """Tests for SemanticResponseCache."""
+
+    @pytest.fixture
+    def semantic(self):
+        """Cache where the two summary prompts are near-duplicates."""
+        rng = np.random.default_rng(0)
+        base = rng.standard_normal(384).astype(np.float32)
+        embedder = FakeEmbedder({
+            "Summarize this doc": base,
+            "Give me a summary of this doc": base + 0.05 * rng.standard_normal(384).astype(np.float32),
+            "What is the capital of France?": rng.standard_normal(384).astype(np.float32),
+        })
+        return SemanticResponseCache(embedder=embedder, dim=384, capacity=16, threshold=0.92)
+
+    @pytest.mark.asyncio
+    async def test_paraphrase_hits(self, semantic):
+        """Test a similar prompt with the same params reuses the answer."""
+        params = ("grok", 0.0, 256)
+        semantic.put(await semantic.embed("Summarize this doc"), params, answer("summary"))
+
+        paraphrase = await semantic.embed("Give me a summary of this doc")
+        assert semantic.get(paraphrase, params)["answer"] == "summary"
+        assert semantic.get(paraphrase, ("grok", 0.0, 512)) is None
+
+        unrelated = await semantic.embed("What is the capital of France?")
+        assert semantic.get(unrelated, params) is None
+
+    @pytest.mark.asyncio
+    async def test_generate_answer_uses_semantic_cache(self, semantic):
+        """Test a paraphrased deterministic call skips the provider."""
+        with patch("rag.services.llm_service.settings") as mock_settings, \
+                patch("rag.services.llm_service.get_llm_response_cache", return_value=ResponseCache()), \
+                patch("rag.services.llm_service.get_llm_semantic_cache", return_value=semantic):
+            mock_settings.xai_api_key = "grok-key"
+            mock_settings.google_api_key = None
+            mock_settings.anthropic_api_key = None
+            mock_settings.openai_api_key = None
+            mock_settings.use_ollama = False
+            service = LLMService()
+
+            with patch.object(service, "_call_grok", AsyncMock(return_value=answer("summary"))) as grok:
+                await service.generate_answer("Summarize this doc", temperature=0.0)
+                result = await service.generate_answer("Give me a summary of this doc", temperature=0.0)
+
+        assert result["answer"] == "summary"
+        assert grok.await_count == 1
+        assert len(semantic) == 1
@@ -0,0 +1,36 @@
+"""
+Unit tests for the Gemini RAG helpers.
+File: tests/unit/test_llm_integration.py
+"""
+from unittest.mock import MagicMock, patch
+
+from rag.llm_integration import batch_ask
+
+
+class TestBatchAsk:
+    """Tests for batch question answering."""
+
+    def test_duplicates_answered_once(self):
+        """Test repeated questions run the pipeline once and fan out."""
+        rag = MagicMock()
+        rag.embedder.embed_texts.side_effect = lambda texts: [None] * len(texts)
+        rag.query.side_effect = lambda q, top_k, query_embedding=None: {
+            'answer': f"answer to {q}"
+        }
+
+        with patch("rag.llm_integration.get_rag", return_value=rag):
+            answers = batch_ask(["a", "b", "a", "c", "b"])
+
+        assert answers == [
+            "answer to a", "answer to b", "answer to a",
+            "answer to c", "answer to b",
+        ]
+        assert rag.query.call_count == 3
+        rag.embedder.embed_texts.assert_called_once_with(["a", "b", "c"])
+
+    def test_empty_batch(self):
+        """Test an empty batch returns no answers."""
+        rag = MagicMock()
+        with patch("rag.llm_integration.get_rag", return_value=rag):
+            assert batch_ask([]) == []
+        rag.query.assert_not_called()
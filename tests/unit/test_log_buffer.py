@@ -0,0 +1,169 @@
+"""
+Unit tests for the batched log writer.
+File: tests/unit/test_log_buffer.py
+"""
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from rag.models.request_log import RequestLog
+from rag.models.system_metric import SystemMetric
+from rag.services.log_buffer import BatchInsertBuffer
+
+
+class FakeSession:
+    """Records executed statements instead of talking to a database."""
+
+    def __init__(self, calls):
+        self.calls = calls
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, rows):
+        self.calls.append((statement, list(rows)))
+
+    async def commit(self):
+        pass
+
+
+def make_buffer(calls, **kwargs):
+    return BatchInsertBuffer(
+        RequestLog,
+        session_factory=lambda: FakeSession(calls),
+        timestamp_column="created_at",
+        **kwargs
+    )
+
+
+def log_row(i: int) -> dict:
+    return {
+        "request_id": f"req-{i}",
+        "endpoint": "/health",
+        "method": "GET",
+        "status_code": 200,
+        "duration_ms": 1.0,
+    }
+
+
+class TestBatchInsertBuffer:
+    """Tests for BatchInsertBuffer."""
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_one_batch(self):
+        """Test queued rows go out in a single INSERT."""
+        calls = []
+        buffer = make_buffer(calls)
+        for i in range(3):
+            buffer.add(log_row(i))
+
+        assert await buffer.flush() == 3
+        assert len(calls) == 1
+        statement, rows = calls[0]
+        assert statement.table.name == "request_logs"
+        assert [r["request_id"] for r in rows] == ["req-0", "req-1", "req-2"]
+
+    @pytest.mark.asyncio
+    async def test_rows_get_id_and_timestamp(self):
+        """Test primary key and timestamp are filled before insert."""
+        calls = []
+        buffer = make_buffer(calls)
+        buffer.add(log_row(0))
+        await buffer.flush()
+
+        row = calls[0][1][0]
+        assert row["id"].version == 7
+        assert row["created_at"] is not None
+        assert row["created_at"].tzinfo is None  # partition key is naive
+
+    @pytest.mark.asyncio
+    async def test_timestamptz_column_stamped_aware(self):
+        """Test timestamptz columns get timezone-aware UTC stamps."""
+        calls = []
+        buffer = BatchInsertBuffer(
+            SystemMetric,
+            session_factory=lambda: FakeSession(calls),
+            timestamp_column="recorded_at"
+        )
+        buffer.add({"metric_name": "m", "metric_type": "gauge", "value": 1.0})
+        await buffer.flush()
+
+        assert calls[0][1][0]["recorded_at"].utcoffset() == timedelta(0)
+
+    @pytest.mark.asyncio
+    async def test_batches_capped_at_max_batch(self):
+        """Test stop() drains everything in max_batch sized inserts."""
+        calls = []
+        buffer = make_buffer(calls, max_batch=2)
+        for i in range(5):
+            buffer.add(log_row(i))
+
+        await buffer.stop()
+        assert [len(rows) for _, rows in calls] == [2, 2, 1]
+
+    @pytest.mark.asyncio
+    async def test_background_task_flushes(self):
+        """Test the background task writes rows after flush_interval."""
+        calls = []
+        buffer = make_buffer(calls, flush_interval=0.05)
+        buffer.start()
+        buffer.add(log_row(0))
+        buffer.add(log_row(1))
+
+        await asyncio.sleep(0.2)
+        await buffer.stop()
+        assert sum(len(rows) for _, rows in calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_rows(self):
+        """Test rows beyond max_queue are dropped, not blocked on."""
+        calls = []
+        buffer = make_buffer(calls, max_queue=2)
+        for i in range(4):
+            buffer.add(log_row(i))
+
+        assert await buffer.flush() == 2
+
+    @pytest.mark.asyncio
+    async def test_stop_keeps_row_held_by_background_task(self):
+        """Test a row taken off the queue but not yet written survives stop()."""
+        calls = []
+        buffer = make_buffer(calls, flush_interval=10)
+        buffer.start()
+        buffer.add(log_row(0))
+        await asyncio.sleep(0.01)  # the task now holds the row while the batch fills
+
+        await asyncio.wait_for(buffer.stop(), timeout=1)
+        assert [r["request_id"] for _, rows in calls for r in rows] == ["req-0"]
+
+    @pytest.mark.asyncio
+    async def test_stop_mid_write_keeps_batch(self):
+        """Test stop() lets an in-progress INSERT finish and drains the rest."""
+        calls = []
+        writing = asyncio.Event()
+
+        class SlowSession(FakeSession):
+            async def execute(self, statement, rows):
+                writing.set()
+                await asyncio.sleep(0.05)
+                await super().execute(statement, rows)
+
+        buffer = BatchInsertBuffer(
+            RequestLog,
+            session_factory=lambda: SlowSession(calls),
+            max_batch=2,
+            flush_interval=0,
+            timestamp_column="created_at"
+        )
+        buffer.start()
+        for i in range(5):
+            buffer.add(log_row(i))
+        await writing.wait()
+
+        await buffer.stop()
+        written = sorted(r["request_id"] for _, rows in calls for r in rows)
+        assert written == [f"req-{i}" for i in range(5)]
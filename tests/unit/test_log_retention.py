@@ -0,0 +1,146 @@
+"""
+Unit tests for request_logs partition maintenance.
+File: tests/unit/test_log_retention.py
+"""
+from datetime import date
+
+import pytest
+
+from rag.services.log_retention import (
+    add_months,
+    create_partition,
+    expired_partitions,
+    maintain_partitions,
+    partition_name,
+    partitions_to_create,
+)
+
+
+class TestPartitionNaming:
+    """Tests for month arithmetic and names."""
+
+    def test_partition_name(self):
+        """Test names are zero-padded year and month."""
+        assert partition_name(date(2026, 3, 1)) == "request_logs_2026_03"
+
+    def test_add_months_wraps_year(self):
+        """Test month arithmetic crosses year boundaries."""
+        assert add_months(date(2026, 12, 1), 1) == date(2027, 1, 1)
+        assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+    def test_partitions_to_create(self):
+        """Test current month plus months_ahead are created."""
+        parts = partitions_to_create(date(2026, 12, 15), months_ahead=1)
+        assert parts == [
+            ("request_logs_2026_12", date(2026, 12, 1), date(2027, 1, 1)),
+            ("request_logs_2027_01", date(2027, 1, 1), date(2027, 2, 1)),
+        ]
+
+
+class TestExpiredPartitions:
+    """Tests for retention selection."""
+
+    def test_only_fully_expired_months_dropped(self):
+        """Test a month is dropped only once all its rows are past retention."""
+        names = [
+            "request_logs_2026_08",
+            "request_logs_2026_09",
+            "request_logs_2026_10",
+            "request_logs_default",
+        ]
+        # Cutoff 2026-09-15: August ended before it, September has not
+        expired = expired_partitions(names, date(2026, 10, 15), retention_days=30)
+        assert expired == ["request_logs_2026_08"]
+
+    def test_default_partition_kept(self):
+        """Test non-monthly partitions are never selected."""
+        assert expired_partitions(["request_logs_default"], date(2030, 1, 1), 30) == []
+
+
+class FakeResult:
+    """Query result with scalar(), rowcount and row iteration."""
+
+    def __init__(self, value=None, rows=()):
+        self.value = value
+        self.rows = list(rows)
+        self.rowcount = len(self.rows)
+
+    def scalar(self):
+        return self.value
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+class FakeSavepoint:
+    """Async stand-in for a savepoint."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeConnection:
+    """Records SQL; answers to_regclass/EXISTS lookups from fixed state."""
+
+    def __init__(self, tables, stranded=False, fail_on=None, partitions=()):
+        self.tables = set(tables)
+        self.stranded = stranded
+        self.fail_on = fail_on
+        self.partitions = list(partitions)
+        self.statements = []
+
+    def begin_nested(self):
+        return FakeSavepoint()
+
+    async def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append(sql)
+        if self.fail_on and self.fail_on in sql:
+            raise RuntimeError("partition error")
+        if "to_regclass" in sql:
+            return FakeResult(params["name"] if params["name"] in self.tables else None)
+        if sql.startswith("SELECT EXISTS"):
+            return FakeResult(self.stranded)
+        if "pg_inherits" in sql:
+            return FakeResult(rows=[(name,) for name in self.partitions])
+        return FakeResult()
+
+
+class TestMaintainPartitions:
+    """Tests for partition creation around the default partition."""
+
+    @pytest.mark.asyncio
+    async def test_stranded_rows_moved_out_of_default(self):
+        """Test rows in the default partition are moved before the month is created."""
+        conn = FakeConnection({"request_logs_default"}, stranded=True)
+        await create_partition(conn, "request_logs_2026_10", date(2026, 10, 1), date(2026, 11, 1))
+
+        ddl = [s for s in conn.statements if not s.startswith("SELECT")]
+        assert ddl[0] == "ALTER TABLE request_logs DETACH PARTITION request_logs_default"
+        assert ddl[1].startswith("CREATE TABLE request_logs_2026_10 PARTITION OF request_logs")
+        assert "DELETE FROM request_logs_default" in ddl[2]
+        assert "INSERT INTO request_logs_2026_10" in ddl[2]
+        assert ddl[3] == "ALTER TABLE request_logs ATTACH PARTITION request_logs_default DEFAULT"
+
+    @pytest.mark.asyncio
+    async def test_existing_partition_left_alone(self):
+        """Test nothing is created when the partition already exists."""
+        conn = FakeConnection({"request_logs_2026_10", "request_logs_default"})
+        await create_partition(conn, "request_logs_2026_10", date(2026, 10, 1), date(2026, 11, 1))
+        assert len(conn.statements) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_create_still_drops_expired(self):
+        """Test one failing partition does not abort the rest of the run."""
+        conn = FakeConnection(
+            {"request_logs_default"},
+            fail_on="CREATE TABLE request_logs_2026_10",
+            partitions=["request_logs_2026_08", "request_logs_default"]
+        )
+        await maintain_partitions(conn, today=date(2026, 10, 15), retention_days=30)
+
+        assert any(s.startswith("CREATE TABLE request_logs_2026_11") for s in conn.statements)
+        assert "DROP TABLE request_logs_2026_08" in conn.statements
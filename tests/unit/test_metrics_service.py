@@ -0,0 +1,87 @@
+"""
+Unit tests for counter metrics.
+File: tests/unit/test_metrics_service.py
+"""
+from sqlalchemy.dialects import postgresql
+
+from rag.services.metrics_service import build_counter_upsert, record_counter
+
+
+def compile_pg(stmt):
+    return stmt.compile(dialect=postgresql.dialect())
+
+
+class FakeSession:
+    """Records executed statements and commits."""
+
+    def __init__(self, calls, fail=False):
+        self.calls = calls
+        self.fail = fail
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        if self.fail:
+            raise RuntimeError("database down")
+        self.calls.append(statement)
+
+    async def commit(self):
+        self.calls.append("commit")
+
+
+class TestCounterUpsert:
+    """Tests for the counter INSERT ... ON CONFLICT statement."""
+
+    def test_conflict_target_is_partial_counter_index(self):
+        """Test the conflict target matches uq_system_metrics_counter."""
+        sql = str(compile_pg(build_counter_upsert("chat_queries_total")))
+        assert "ON CONFLICT (metric_name, labels_hash) WHERE metric_type = 'counter'" in sql
+
+    def test_conflict_adds_to_existing_value(self):
+        """Test a conflicting insert increments instead of replacing."""
+        sql = str(compile_pg(build_counter_upsert("chat_queries_total")))
+        assert "DO UPDATE SET value = (system_metrics.value + excluded.value)" in sql
+
+    def test_parameters(self):
+        """Test name, amount, labels and type are bound."""
+        params = compile_pg(
+            build_counter_upsert("upload_failed_total", 3, {"reason": "size"})
+        ).params
+        assert params["metric_name"] == "upload_failed_total"
+        assert params["value"] == 3
+        assert params["labels"] == {"reason": "size"}
+        assert params["metric_type"].value == "counter"
+
+    def test_timestamp_set_by_server(self):
+        """Test recorded_at comes from now() rather than a bound value."""
+        compiled = compile_pg(build_counter_upsert("chat_queries_total"))
+        assert "recorded_at" not in compiled.params
+        assert "recorded_at = now()" in str(compiled)
+
+
+class TestRecordCounter:
+    """Tests for bumping a counter in its own session."""
+
+    async def test_upsert_committed(self):
+        """Test the counter upsert runs and is committed."""
+        calls = []
+        await record_counter(
+            "rate_limit_exceeded_total", session_factory=lambda: FakeSession(calls)
+        )
+
+        statement, commit = calls
+        assert statement.table.name == "system_metrics"
+        assert commit == "commit"
+
+    async def test_failure_not_raised(self):
+        """Test a database error never reaches the caller."""
+        calls = []
+        await record_counter(
+            "rate_limit_exceeded_total",
+            session_factory=lambda: FakeSession(calls, fail=True)
+        )
+        assert calls == []
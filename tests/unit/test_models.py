@@ -0,0 +1,70 @@
+"""
+Unit tests for model helpers.
+File: tests/unit/test_models.py
+"""
+import re
+import sqlite3
+import time
+
+from sqlalchemy import select
+from sqlalchemy.schema import CreateIndex
+from sqlalchemy.dialects import postgresql, sqlite
+
+from rag.models.base import random_namespace, uuid7
+from rag.models.token import RefreshToken
+
+
+class TestUUID7:
+    """Tests for time-ordered primary keys."""
+
+    def test_version_and_variant(self):
+        """Test generated ids are RFC 9562 version 7."""
+        value = uuid7()
+        assert value.version == 7
+        assert value.variant == "specified in RFC 4122"
+
+    def test_timestamp_prefix(self):
+        """Test the leading 48 bits hold the current Unix time in ms."""
+        now_ms = time.time_ns() // 1_000_000
+        ts = uuid7().int >> 80
+        assert abs(ts - now_ms) < 1000
+
+    def test_ordered_across_milliseconds(self):
+        """Test ids generated in later milliseconds sort after earlier ones."""
+        first = uuid7()
+        time.sleep(0.002)
+        second = uuid7()
+        assert first < second
+
+    def test_unique(self):
+        """Test ids are unique within the same millisecond."""
+        assert len({uuid7() for _ in range(1000)}) == 1000
+
+
+class TestRandomNamespace:
+    """Tests for the server-side namespace default."""
+
+    def test_postgres_uses_gen_random_uuid(self):
+        """Test the Postgres expression is built on gen_random_uuid()."""
+        sql = str(random_namespace().compile(dialect=postgresql.dialect()))
+        assert "gen_random_uuid()" in sql
+        assert sql.startswith("(") and sql.endswith(")")
+
+    def test_sqlite_expression_generates_namespace(self):
+        """Test the fallback expression yields user_ + 12 hex chars."""
+        sql = str(select(random_namespace()).compile(dialect=sqlite.dialect()))
+        value = sqlite3.connect(":memory:").execute(sql).fetchone()[0]
+        assert re.fullmatch(r"user_[0-9a-f]{12}", value)
+
+
+class TestRefreshTokenIndexes:
+    """Tests for refresh token indexes."""
+
+    def test_live_token_index_is_partial(self):
+        """Test the per-user index only covers unrevoked tokens."""
+        index = next(
+            ix for ix in RefreshToken.__table__.indexes
+            if ix.name == "ix_refresh_tokens_user_active"
+        )
+        sql = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+        assert sql.endswith("WHERE is_revoked = false")
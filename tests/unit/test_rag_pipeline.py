@@ -0,0 +1,64 @@
+"""
+Unit tests for the ingestion pipeline.
+File: tests/unit/test_rag_pipeline.py
+"""
+import asyncio
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from rag.rag_pipeline import ingest_pipeline
+
+
+def fake_embed(batch, return_mask=False):
+    """Embed every chunk except those marked bad."""
+    docs = [
+        {**doc, 'embedding': None if doc.get('bad') else [0.1, 0.2]}
+        for doc in batch
+    ]
+    mask = np.array([d['embedding'] is not None for d in docs], dtype=bool)
+    return docs, mask
+
+
+class TestIngestPipeline:
+    """Tests for the chunk -> embed -> upsert pipeline."""
+
+    def run(self, chunks, upsert_ok=True, batch_size=2):
+        """Run the pipeline with mocked stages."""
+        generator = MagicMock()
+        generator.embed_documents.side_effect = fake_embed
+        store = MagicMock()
+        store.create_index_if_not_exists.return_value = True
+        store.upsert_documents.return_value = upsert_ok
+
+        with patch("rag.rag_pipeline.process_document", return_value=chunks), \
+                patch("rag.rag_pipeline.EmbeddingGenerator", return_value=generator), \
+                patch("rag.rag_pipeline.SimplePineconeStore", return_value=store):
+            result = asyncio.run(ingest_pipeline(Path("doc.txt"), batch_size=batch_size))
+        return result, generator, store
+
+    def test_batches_flow_through_all_stages(self):
+        """Test every batch is embedded and upserted once."""
+        chunks = [{'id': i, 'text': str(i)} for i in range(5)]
+        chunks[3]['bad'] = True
+
+        result, generator, store = self.run(chunks)
+
+        assert result == (5, 4, 0)
+        assert generator.embed_documents.call_count == 3
+        assert store.upsert_documents.call_count == 3
+        store.create_index_if_not_exists.assert_called_once_with(2)
+
+    def test_failed_upserts_counted(self):
+        """Test failed batches are reported."""
+        chunks = [{'id': i, 'text': str(i)} for i in range(4)]
+        result, _, _ = self.run(chunks, upsert_ok=False)
+        assert result == (4, 4, 2)
+
+    def test_no_chunks(self):
+        """Test an empty document skips embedding and upload."""
+        result, generator, store = self.run([])
+        assert result == (0, 0, 0)
+        generator.embed_documents.assert_not_called()
+        store.upsert_documents.assert_not_called()
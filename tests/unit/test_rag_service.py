@@ -0,0 +1,266 @@
+"""
+Unit tests for the RAG service.
+File: tests/unit/test_rag_service.py
+"""
+import asyncio
+import os
+import tempfile
+import threading
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+from fastapi import UploadFile
+
+from rag.services import rag_service
+
+
+class TestDeleteUserDocument:
+    """Tests for document deletion."""
+
+    @pytest.mark.asyncio
+    async def test_vector_cleanup_runs_after_return(self):
+        """Test the soft delete returns without waiting for Pinecone."""
+        release = threading.Event()
+        deleted = []
+
+        def delete_vectors(document_id, namespace=None):
+            release.wait(timeout=2)
+            deleted.append(document_id)
+            return True
+
+        doc_id = uuid4()
+        with patch.object(rag_service.document_crud, "soft_delete_document", AsyncMock(return_value=True)), \
+                patch.object(rag_service, "delete_document", side_effect=delete_vectors):
+            assert await rag_service.delete_user_document(None, uuid4(), doc_id) is True
+            assert deleted == []
+
+            release.set()
+            await rag_service.wait_for_pending_cleanups()
+
+        assert deleted == [str(doc_id)]
+
+    @pytest.mark.asyncio
+    async def test_missing_document_skips_cleanup(self):
+        """Test nothing is removed from Pinecone when no row was deleted."""
+        with patch.object(rag_service.document_crud, "soft_delete_document", AsyncMock(return_value=False)), \
+                patch.object(rag_service, "delete_document") as delete_vectors:
+            assert await rag_service.delete_user_document(None, uuid4(), uuid4()) is False
+
+        delete_vectors.assert_not_called()
+        assert not rag_service._background_tasks
+
+
+class TestSaveUploadedFile:
+    """Tests for streaming uploads to disk."""
+
+    @pytest.fixture
+    def settings(self, tmp_path):
+        with patch.object(rag_service, "settings") as mock_settings:
+            mock_settings.upload_dir = tmp_path
+            mock_settings.allowed_file_types = {".txt"}
+            mock_settings.max_file_size_mb = 1
+            yield mock_settings
+
+    @pytest.mark.asyncio
+    async def test_copies_in_chunks(self, settings, tmp_path):
+        """Test a file spanning several chunks is written intact."""
+        content = b"abc" * 1000
+        upload = UploadFile(filename="notes.txt", file=BytesIO(content))
+
+        with patch.object(rag_service, "UPLOAD_CHUNK_SIZE", 256):
+            result = await rag_service.save_uploaded_file(upload, uuid4())
+
+        assert result["file_size"] == len(content)
+        with open(result["file_path"], "rb") as f:
+            assert f.read() == content
+
+    @pytest.mark.asyncio
+    async def test_declared_size_rejected_before_writing(self, settings, tmp_path):
+        """Test an oversize Content-Length is refused without creating the upload directory."""
+        upload = UploadFile(filename="big.txt", file=BytesIO(b"x"), size=2 * 1024 * 1024)
+
+        with pytest.raises(rag_service.DocumentProcessingError, match="too large"):
+            await rag_service.save_uploaded_file(upload, uuid4())
+
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_oversize_stream_removes_partial_file(self, settings, tmp_path):
+        """Test a body over the limit (size not declared) leaves no file behind."""
+        user_id = uuid4()
+        upload = UploadFile(filename="big.txt", file=BytesIO(b"x" * (1024 * 1024 + 1)))
+
+        with pytest.raises(rag_service.DocumentProcessingError, match="too large"):
+            await rag_service.save_uploaded_file(upload, user_id)
+
+        assert list((tmp_path / str(user_id)).iterdir()) == []
+
+
+class TestCopyUpload:
+    """Tests for the in-kernel copy of spooled uploads."""
+
+    @pytest.fixture(autouse=True)
+    def settings(self):
+        with patch.object(rag_service, "settings") as mock_settings:
+            mock_settings.max_file_size_mb = 1
+            yield mock_settings
+
+    def spooled(self, content: bytes, rolled: bool):
+        source = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+        source.write(content)
+        if rolled:
+            source.rollover()
+        source.seek(0)
+        return source
+
+    @pytest.mark.skipif(not hasattr(os, "sendfile"), reason="os.sendfile unavailable")
+    def test_rolled_spool_uses_sendfile(self, tmp_path):
+        """Test an on-disk spool is copied with sendfile."""
+        content = b"0123456789" * 1000
+        target = tmp_path / "out.txt"
+
+        with self.spooled(content, rolled=True) as source, \
+                patch.object(rag_service.os, "sendfile", wraps=os.sendfile) as sendfile:
+            assert rag_service._copy_upload(source, target) == len(content)
+
+        assert sendfile.called
+        assert target.read_bytes() == content
+
+    def test_in_memory_spool_is_not_rolled_over(self, tmp_path):
+        """Test a small in-memory upload is read, not forced onto disk."""
+        target = tmp_path / "out.txt"
+
+        with self.spooled(b"small", rolled=False) as source:
+            assert rag_service._copy_upload(source, target) == 5
+            assert source._rolled is False
+
+        assert target.read_bytes() == b"small"
+
+    def test_spool_rolled_attribute(self):
+        """Test SpooledTemporaryFile still exposes the private _rolled flag _upload_fd reads."""
+        with self.spooled(b"x", rolled=False) as memory, self.spooled(b"x", rolled=True) as disk:
+            assert memory._rolled is False
+            assert disk._rolled is True
+
+    def test_sendfile_failure_falls_back_to_read(self, tmp_path):
+        """Test a platform whose sendfile rejects regular files still copies the upload."""
+        content = b"0123456789" * 1000
+        target = tmp_path / "out.txt"
+
+        def no_file_sendfile(*args):
+            raise OSError(38, "Socket operation on non-socket")
+
+        with self.spooled(content, rolled=True) as source, \
+                patch.object(rag_service.os, "sendfile", no_file_sendfile, create=True):
+            assert rag_service._copy_upload(source, target) == len(content)
+
+        assert target.read_bytes() == content
+
+    @pytest.mark.skipif(not hasattr(os, "sendfile"), reason="os.sendfile unavailable")
+    def test_sendfile_stops_past_limit(self, tmp_path):
+        """Test an oversize on-disk spool is cut off and the partial file removed."""
+        target = tmp_path / "out.txt"
+
+        with self.spooled(b"x" * (1024 * 1024 + 10), rolled=True) as source:
+            assert rag_service._copy_upload(source, target) is None
+
+        assert not target.exists()
+
+
+class TestFileSuffix:
+    """Tests for upload extension parsing."""
+
+    @pytest.mark.parametrize("filename", [
+        "report.pdf", "REPORT.PDF", "archive.tar.gz", "noext", ".bashrc",
+        "trailing.", "dir/file.txt", "dir.d/file", "..pdf", "",
+    ])
+    def test_matches_pathlib(self, filename):
+        """Test the suffix equals Path(filename).suffix."""
+        assert rag_service._file_suffix(filename) == Path(filename).suffix
+
+    def test_validate_is_case_insensitive(self):
+        """Test an upper-case extension is accepted."""
+        with patch.object(rag_service, "settings") as mock_settings:
+            mock_settings.allowed_file_types = [".pdf"]
+            assert rag_service.RagService.validate_file_type("SCAN.PDF")
+            assert not rag_service.RagService.validate_file_type("pdf")
+
+
+class TestFormatResults:
+    """Tests for prompt and source assembly."""
+
+    def test_layout(self):
+        """Test blocks are numbered, labelled and separated by a blank line."""
+        results = [
+            {"metadata": {"file_name": "a.pdf", "text": "alpha"}},
+            {"metadata": {"text": "beta"}},
+            {},
+        ]
+        prompt, _ = rag_service._format_results(results, "why?")
+        context = (
+            "[Document 1: a.pdf]\nalpha\n\n"
+            "[Document 2: Unknown]\nbeta\n\n"
+            "[Document 3: Unknown]\n\n"
+        )
+        assert prompt == f"""Based on the following documents, answer the question.
+
+Documents:
+{context}
+
+Question: why?
+
+Answer:"""
+
+    def test_sources(self):
+        """Test each result yields its source entry with a 200-char preview."""
+        results = [
+            {"score": 0.8, "metadata": {"file_name": "a.pdf", "chunk_index": 4, "text": "x" * 300}},
+            {"metadata": None},
+        ]
+        _, sources = rag_service._format_results(results, "q")
+        assert sources == [
+            {"document": "a.pdf", "chunk_index": 4, "relevance_score": 0.8, "preview": "x" * 200},
+            {"document": "Unknown", "chunk_index": 0, "relevance_score": 0.0, "preview": ""},
+        ]
+
+
+class TestChatExchange:
+    """Tests for saving a question and answer together."""
+
+    @pytest.mark.asyncio
+    async def test_one_insert_one_commit(self):
+        """Test both messages go out in a single statement, question first."""
+        from rag.crud.document import create_chat_exchange
+
+        db = AsyncMock()
+        user_id = uuid4()
+        await create_chat_exchange(db, user_id, "s1", "why?", "because", 3, "gemini")
+
+        db.execute.assert_awaited_once()
+        statement, rows = db.execute.await_args.args
+        assert str(statement).startswith("INSERT INTO chat_messages")
+        assert [r["role"] for r in rows] == ["user", "assistant"]
+        assert rows[0]["created_at"] < rows[1]["created_at"]
+        assert (rows[1]["retrieved_chunks"], rows[1]["model_used"]) == (3, "gemini")
+        db.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_query_saves_exchange_once(self):
+        """Test query_documents records the exchange with one CRUD call."""
+        results = [{"score": 0.9, "metadata": {"file_name": "a.pdf", "text": "alpha"}}]
+        llm = AsyncMock()
+        llm.last_successful_provider = None
+
+        with patch.object(rag_service, "search_documents_by_text", return_value=results), \
+                patch.object(rag_service, "generate_answer_async", AsyncMock(return_value="answer")), \
+                patch.object(rag_service, "get_llm_service", return_value=llm), \
+                patch.object(rag_service.document_crud, "create_chat_exchange", AsyncMock()) as save:
+            response = await rag_service.query_documents(None, uuid4(), "question", session_id="s1")
+
+        assert response["message"] == "answer"
+        save.assert_awaited_once()
+        assert save.await_args.kwargs["question"] == "question"
+        assert save.await_args.kwargs["answer"] == "answer"
@@ -0,0 +1,54 @@
+"""
+Unit tests for request schemas.
+File: tests/unit/test_schemas.py
+"""
+import pytest
+from pydantic import ValidationError
+
+from rag.schemas.auth import LoginRequest
+from rag.schemas.document import ChatRequest, ChatResponse, SourceRef
+
+
+class TestRequestSchemas:
+    """Tests for strict, immutable request models."""
+
+    def test_unknown_fields_rejected(self):
+        """Test extra keys in a request body are rejected."""
+        with pytest.raises(ValidationError):
+            LoginRequest(email="user@example.com", password="pw", remember=True)
+
+    def test_frozen(self):
+        """Test request models cannot be mutated after validation."""
+        request = ChatRequest(message="hello")
+        with pytest.raises(ValidationError):
+            request.message = "changed"
+
+    def test_message_whitespace_stripped(self):
+        """Test chat messages are stripped before length checks."""
+        assert ChatRequest(message="  hello  ").message == "hello"
+        with pytest.raises(ValidationError):
+            ChatRequest(message="   ")
+
+    def test_login_password_not_stripped(self):
+        """Test passwords keep surrounding whitespace."""
+        assert LoginRequest(email="a@b.c", password=" pw ").password == " pw "
+
+    def test_chat_response_ignores_extra(self):
+        """Test service-only keys are dropped from chat responses."""
+        response = ChatResponse(
+            session_id="s", message="m", retrieved_chunks=0,
+            sources=[], model_used="gemini"
+        )
+        assert "model_used" not in response.model_dump()
+
+    def test_chat_response_sources_typed(self):
+        """Test source dicts from the service validate into SourceRef."""
+        response = ChatResponse(
+            session_id="s", message="m", retrieved_chunks=1,
+            sources=[{
+                "document": "report.pdf", "chunk_index": 2,
+                "relevance_score": 0.9, "preview": "..."
+            }]
+        )
+        assert isinstance(response.sources[0], SourceRef)
+        assert response.model_dump()["sources"][0]["chunk_index"] == 2
@@ -2,8 +2,12 @@
 Unit tests for BM25 and hybrid search.
 File: tests/unit/test_search.py
 """
+from unittest.mock import patch
+
+import numpy as np
 import pytest
-from rag.services.search_service import SearchService, create_search_service, SearchResult
+from rag.services import search_service
+from rag.services.search_service import SearchService, create_search_service, SearchResult, top_k_indices
 
 
 class TestBM25Scoring:
@@ -223,3 +227,136 @@ class TestSearchServiceFactory:
         """Test that invalid weights raise an error."""
         with pytest.raises(ValueError):
             SearchService(bm25_weight=0.5, semantic_weight=0.3)  # Sum != 1.0
+
+
+class TestTopKIndices:
+    """Tests for partition-based top-k selection."""
+
+    def test_matches_stable_sort(self):
+        """Test result equals a stable descending sort truncated to k."""
+        scores = np.random.default_rng(0).integers(0, 5, size=100).astype(float)
+        for k in (1, 5, 20, 100, 150):
+            expected = sorted(range(len(scores)), key=lambda i: -scores[i])[:k]
+            assert top_k_indices(scores, k).tolist() == expected
+
+    def test_all_tied(self):
+        """Test ties resolve to the earliest candidates."""
+        assert top_k_indices(np.full(10, 0.5), 3).tolist() == [0, 1, 2]
+
+
+class TestPersistentIndexScoring:
+    """Tests for scoring candidates against the corpus index."""
+
+    CHUNKS = [
+        {"id": f"c{i}", "content": text}
+        for i, text in enumerate([
+            "machine learning models learn from data",
+            "deep neural networks",
+            "natural language processing",
+            "learning rate schedules for machine learning",
+            "databases and indexing",
+        ])
+    ]
+
+    def test_subset_scores_match_full_index(self):
+        """Test gathered scores equal the corpus-wide BM25 scores."""
+        service = SearchService()
+        service.build_bm25_index(self.CHUNKS)
+        query = service._tokenize("machine learning")
+
+        positions = np.array([3, 0, 4])
+        expected = service._bm25_index.get_scores(query)[positions]
+        np.testing.assert_allclose(service._score_rows(query, positions), expected, rtol=1e-5)
+
+    def test_indexed_candidates_skip_temporary_index(self):
+        """Test hybrid search does not build a BM25Okapi per query when candidates are indexed."""
+        service = SearchService(top_k=2)
+        service.build_bm25_index(self.CHUNKS)
+        semantic_results = [
+            {"id": "c1", "content": self.CHUNKS[1]["content"], "score": 0.9, "metadata": {}},
+            {"id": "c3", "content": self.CHUNKS[3]["content"], "score": 0.9, "metadata": {}},
+        ]
+
+        with patch("rag.services.search_service.BM25Okapi") as bm25:
+            results = service.hybrid_search("machine learning", semantic_results)
+
+        bm25.assert_not_called()
+        assert results[0].chunk_id == "c3"
+
+    def test_query_tokens_memoized(self):
+        """Test repeating a query reuses its tokenization."""
+        service = SearchService()
+        service.build_bm25_index(self.CHUNKS)
+        search_service._query_tokens.cache_clear()
+
+        service.get_bm25_scores("Machine Learning")
+        service.get_bm25_scores("Machine Learning")
+
+        info = search_service._query_tokens.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+        assert search_service._query_tokens("Machine Learning") == ("machine", "learning")
+
+    def test_unknown_candidate_falls_back(self):
+        """Test a candidate missing from the index uses the temporary index."""
+        service = SearchService()
+        service.build_bm25_index(self.CHUNKS)
+        semantic_results = [
+            {"id": "new", "content": "machine learning", "score": 0.9, "metadata": {}},
+        ]
+        assert service._candidate_positions(semantic_results) is None
+        assert service.hybrid_search("machine learning", semantic_results)
+
+
+class TestBM25Kernel:
+    """Tests for the CSR BM25 scoring kernel."""
+
+    CORPUS = [
+        {"id": f"c{i}", "content": text}
+        for i, text in enumerate([
+            "the cat sat on the mat",
+            "the dog chased the cat",
+            "a bird sang in the tree",
+            "cats and dogs and birds",
+            "the the the",
+        ])
+    ]
+
+    def indexed_service(self) -> SearchService:
+        service = SearchService()
+        service.build_bm25_index(self.CORPUS)
+        return service
+
+    @pytest.mark.parametrize("query", [
+        "cat",
+        "the cat",
+        "cat cat dog",
+        "unknown words only",
+        "bird unknown",
+    ])
+    def test_matches_rank_bm25(self, query):
+        """Test full-corpus scores equal rank_bm25's, including repeated and unknown terms."""
+        service = self.indexed_service()
+        expected = service._bm25_index.get_scores(service._tokenize(query))
+        np.testing.assert_allclose(service.get_bm25_scores(query), expected, rtol=1e-5, atol=1e-6)
+
+    @pytest.mark.parametrize("query", ["cat", "the cat cat", "unknown", ""])
+    def test_numpy_fallback_matches_kernel(self, query):
+        """Test the NumPy fallback and the kernel agree on a row subset."""
+        pytest.importorskip("numba")
+        service = self.indexed_service()
+        rows = np.array([4, 1, 3], dtype=np.intp)
+        kernel = service._score_rows(service._tokenize(query), rows)
+
+        with patch.object(search_service, "bm25_scores", search_service._bm25_scores_numpy):
+            fallback = service._score_rows(service._tokenize(query), rows)
+
+        np.testing.assert_allclose(fallback, kernel, rtol=1e-6, atol=1e-9)
+
+    def test_csr_layout(self):
+        """Test each row holds its distinct terms and their counts."""
+        service = self.indexed_service()
+        start, end = service._indptr[4], service._indptr[5]
+        assert end - start == 1
+        assert service._term_ids[start] == service._vocab["the"]
+        assert service._term_freqs[start] == 3
+        assert service._doc_lens[4] == 3
@@ -0,0 +1,100 @@
+"""
+Unit tests for JWT helpers and token expiry.
+File: tests/unit/test_security.py
+"""
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from rag.core import security
+from rag.core.security import (
+    create_access_token, create_refresh_token, decode_access_token, hash_refresh_token
+)
+from rag.models.token import RefreshToken
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    security._access_token_cache.clear()
+    yield
+    security._access_token_cache.clear()
+
+
+class TestAccessTokenCache:
+    """Tests for the verified access token cache."""
+
+    def test_second_decode_skips_jwt_verification(self):
+        """Test a verified token is served from cache."""
+        token = create_access_token({"sub": "user-1"})
+        first = decode_access_token(token)
+
+        with patch("rag.core.security.jwt.decode") as mock_decode:
+            second = decode_access_token(token)
+
+        mock_decode.assert_not_called()
+        assert second == first
+        assert second["sub"] == "user-1"
+
+    def test_cached_payload_is_a_copy(self):
+        """Test callers cannot mutate the cached payload."""
+        token = create_access_token({"sub": "user-1"})
+        decode_access_token(token)["sub"] = "tampered"
+        assert decode_access_token(token)["sub"] == "user-1"
+
+    def test_expired_token_rejected(self):
+        """Test expired tokens are not accepted or cached."""
+        token = create_access_token({"sub": "user-1"}, timedelta(seconds=-1))
+        assert decode_access_token(token) is None
+        assert len(security._access_token_cache) == 0
+
+    def test_refresh_token_rejected(self):
+        """Test refresh tokens are not accepted as access tokens."""
+        token = create_refresh_token({"sub": "user-1"})
+        assert decode_access_token(token) is None
+
+    def test_cache_is_bounded(self):
+        """Test the oldest entries are evicted past the size limit."""
+        with patch.object(security, "ACCESS_TOKEN_CACHE_SIZE", 2):
+            for i in range(3):
+                decode_access_token(create_access_token({"sub": f"user-{i}"}))
+        assert len(security._access_token_cache) == 2
+
+
+class TestRefreshTokenExpiry:
+    """Tests for RefreshToken.is_expired."""
+
+    def test_new_token_uses_wall_clock(self):
+        """Test unsaved tokens compare expires_at directly."""
+        token = RefreshToken(expires_at=datetime.utcnow() - timedelta(seconds=1))
+        assert token.is_expired
+
+    def test_loaded_token_uses_monotonic_deadline(self):
+        """Test loaded tokens compare against the monotonic deadline."""
+        token = RefreshToken(
+            expires_at=datetime.utcnow() + timedelta(hours=1),
+            is_revoked=False
+        )
+        token._init_on_load()
+        assert not token.is_expired
+        assert token.is_valid
+
+        token._expires_at_monotonic -= 7200
+        assert token.is_expired
+
+
+class TestRefreshTokenHash:
+    """Tests for refresh token storage digests."""
+
+    def test_digest_is_fixed_size_and_stable(self):
+        """Test tokens hash to a deterministic 32-byte digest."""
+        token = create_refresh_token({"sub": "user"})
+        assert len(hash_refresh_token(token)) == 32
+        assert hash_refresh_token(token) == hash_refresh_token(token)
+        assert hash_refresh_token(token) != hash_refresh_token(token + "x")
+
+    def test_model_stores_hash_only(self):
+        """Test the model has no raw token column."""
+        columns = RefreshToken.__table__.c
+        assert "token" not in columns
+        assert columns.token_hash.unique
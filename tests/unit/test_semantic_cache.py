@@ -0,0 +1,175 @@
+"""
+Unit tests for the semantic proximity cache.
+File: tests/unit/test_semantic_cache.py
+"""
+import numpy as np
+import pytest
+
+from rag.semantic_cache import ProximityCache, ProximityCacheGroup, quantize
+
+
+DIM = 32
+
+
+def random_vector(seed: int) -> np.ndarray:
+    """Deterministic random embedding."""
+    return np.random.default_rng(seed).standard_normal(DIM).astype(np.float32)
+
+
+class TestProximityCacheLookup:
+    """Tests for cache hits and misses."""
+
+    def test_empty_cache_misses(self):
+        """Test lookup on an empty cache."""
+        cache = ProximityCache(dim=DIM)
+        assert cache.lookup(random_vector(1)) is None
+
+    def test_exact_vector_hits(self):
+        """Test the same vector returns its value."""
+        cache = ProximityCache(dim=DIM)
+        vec = random_vector(1)
+        cache.insert(vec, "answer")
+        assert cache.lookup(vec) == "answer"
+
+    def test_scaled_vector_hits(self):
+        """Test lookup is by cosine similarity, not magnitude."""
+        cache = ProximityCache(dim=DIM)
+        vec = random_vector(1)
+        cache.insert(vec, "answer")
+        assert cache.lookup(vec * 3.0) == "answer"
+
+    def test_near_vector_hits(self):
+        """Test a slightly perturbed vector still hits."""
+        cache = ProximityCache(dim=DIM, threshold=0.95)
+        vec = random_vector(1)
+        cache.insert(vec, "answer")
+        noisy = vec + 0.01 * random_vector(2)
+        assert cache.lookup(noisy) == "answer"
+
+    def test_unrelated_vector_misses(self):
+        """Test an unrelated vector does not hit."""
+        cache = ProximityCache(dim=DIM, threshold=0.95)
+        cache.insert(random_vector(1), "answer")
+        assert cache.lookup(random_vector(2)) is None
+
+    def test_zero_vector_ignored(self):
+        """Test zero vectors are neither stored nor matched."""
+        cache = ProximityCache(dim=DIM)
+        cache.insert(np.zeros(DIM), "answer")
+        assert len(cache) == 0
+        assert cache.lookup(np.zeros(DIM)) is None
+
+    def test_best_match_returned(self):
+        """Test the closest of several entries wins."""
+        cache = ProximityCache(dim=DIM, threshold=0.5)
+        vec = random_vector(1)
+        cache.insert(vec + 0.3 * random_vector(2), "far")
+        cache.insert(vec + 0.01 * random_vector(3), "near")
+        assert cache.lookup(vec) == "near"
+
+
+class TestProximityCacheEviction:
+    """Tests for capacity handling."""
+
+    def test_oldest_entry_overwritten(self):
+        """Test inserting past capacity evicts the oldest entry."""
+        cache = ProximityCache(dim=DIM, capacity=2)
+        vectors = [random_vector(i) for i in range(3)]
+        for i, vec in enumerate(vectors):
+            cache.insert(vec, i)
+
+        assert len(cache) == 2
+        assert cache.lookup(vectors[0]) is None
+        assert cache.lookup(vectors[1]) == 1
+        assert cache.lookup(vectors[2]) == 2
+
+    def test_clear(self):
+        """Test clear drops all entries."""
+        cache = ProximityCache(dim=DIM)
+        vec = random_vector(1)
+        cache.insert(vec, "answer")
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.lookup(vec) is None
+
+
+class TestBestMatch:
+    """Tests for the similarity kernel."""
+
+    def test_matches_numpy_reference(self):
+        """Test best_match agrees with the NumPy implementation."""
+        from rag.semantic_cache import best_match, _best_match_numpy
+
+        quantized = [quantize(random_vector(i)) for i in range(10)]
+        vectors = np.stack([q for q, _ in quantized])
+        scales = np.array([s for _, s in quantized], dtype=np.float32)
+        slots = np.array([2, 5, 7, 9], dtype=np.intp)
+        query, query_scale = quantize(random_vector(5))
+
+        best, score = best_match(vectors, scales, slots, query, query_scale)
+        ref_best, ref_score = _best_match_numpy(
+            vectors, scales, slots, query, query_scale
+        )
+
+        assert best == ref_best == 1
+        assert score == pytest.approx(ref_score, rel=1e-4)
+
+
+class TestQuantize:
+    """Tests for int8 quantization."""
+
+    def test_round_trip_close(self):
+        """Test dequantized vector stays close to the original."""
+        vec = random_vector(1)
+        q, scale = quantize(vec)
+        assert q.dtype == np.int8
+        assert np.max(np.abs(q)) == 127
+        np.testing.assert_allclose(q * scale, vec, atol=scale)
+
+    def test_zero_vector(self):
+        """Test zero vector quantizes to zero scale."""
+        q, scale = quantize(np.zeros(DIM, dtype=np.float32))
+        assert scale == 0.0
+        assert not q.any()
+
+    def test_cache_stores_int8(self):
+        """Test the cache keeps int8 rows."""
+        cache = ProximityCache(dim=DIM)
+        assert cache._vectors.dtype == np.int8
+
+
+class TestProximityCacheGroup:
+    """Tests for per-scope caches."""
+
+    def test_scopes_are_isolated(self):
+        """Test a value cached for one scope is not returned for another."""
+        group = ProximityCacheGroup(dim=DIM)
+        vec = random_vector(1)
+        group.insert("alice", vec, "alice's results")
+
+        assert group.lookup("alice", vec) == "alice's results"
+        assert group.lookup("bob", vec) is None
+
+    def test_invalidate_drops_scope(self):
+        """Test invalidating a scope forgets only its entries."""
+        group = ProximityCacheGroup(dim=DIM)
+        vec = random_vector(1)
+        group.insert("alice", vec, "a")
+        group.insert("bob", vec, "b")
+        group.invalidate("alice")
+
+        assert group.lookup("alice", vec) is None
+        assert group.lookup("bob", vec) == "b"
+
+    def test_least_recently_used_scope_evicted(self):
+        """Test the scope count is bounded and recently used scopes survive."""
+        group = ProximityCacheGroup(dim=DIM, max_scopes=2)
+        vec = random_vector(1)
+        group.insert("a", vec, 1)
+        group.insert("b", vec, 2)
+        group.lookup("a", vec)
+        group.insert("c", vec, 3)
+
+        assert len(group) == 2
+        assert group.lookup("b", vec) is None
+        assert group.lookup("a", vec) == 1
@@ -0,0 +1,153 @@
+"""
+Unit tests for vector store helpers.
+File: tests/unit/test_vectorstore.py
+"""
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from rag import vectorstore
+from rag.vectorstore import quantize_int8, to_query_vector
+
+
+class TestToQueryVector:
+    """Tests for query embedding conversion."""
+
+    def test_ndarray_converted_via_float32(self):
+        """Test float64 arrays are narrowed to float32 values."""
+        vec = np.array([0.1, 0.2, 0.3], dtype=np.float64)
+        result = to_query_vector(vec)
+        assert isinstance(result, list)
+        assert result == np.float32(vec).tolist()
+
+    def test_list_passed_through(self):
+        """Test plain lists are accepted unchanged."""
+        assert to_query_vector([1.0, 2.0]) == [1.0, 2.0]
+
+
+class TestGetPineconeStore:
+    """Tests for the shared Pinecone store."""
+
+    def test_store_created_once(self):
+        """Test every caller gets the same client instead of a new one per call."""
+        with patch.object(vectorstore, "_pinecone_store", None), \
+                patch.object(vectorstore, "SimplePineconeStore") as store_cls:
+            first = vectorstore.get_pinecone_store()
+            second = vectorstore.get_pinecone_store()
+
+        assert first is second
+        store_cls.assert_called_once_with()
+
+    def test_index_checked_only_on_first_upload(self):
+        """Test list_indexes/describe_index run only until the index is connected."""
+        store = MagicMock(index=None)
+
+        def connect(dimension):
+            store.index = MagicMock()
+            return True
+
+        store.create_index_if_not_exists.side_effect = connect
+        docs = [{"embedding": [0.1, 0.2]}]
+        with patch.object(vectorstore, "_pinecone_store", store):
+            vectorstore.store_embedded_documents(docs)
+            vectorstore.store_embedded_documents(docs)
+
+        store.create_index_if_not_exists.assert_called_once_with(2)
+        assert store.upsert_documents.call_count == 2
+
+
+class TestQuantizeInt8:
+    """Tests for int8 embedding quantization."""
+
+    def test_round_trip_within_one_step(self):
+        """Test dequantized values are within half a quantization step."""
+        rng = np.random.default_rng(0)
+        emb = rng.standard_normal((8, 384)).astype(np.float32)
+
+        q, scale = quantize_int8(emb)
+
+        assert q.dtype == np.int8
+        assert np.abs(q).max() == 127
+        assert np.all(np.abs(q * scale[:, None] - emb) <= scale[:, None] / 2 + 1e-6)
+
+    def test_cosine_ranking_preserved(self):
+        """Test cosine scores against a query barely move."""
+        rng = np.random.default_rng(1)
+        emb = rng.standard_normal((50, 384)).astype(np.float32)
+        query = rng.standard_normal(384).astype(np.float32)
+
+        def cosine(m):
+            m = m.astype(np.float32)
+            return m @ query / (np.linalg.norm(m, axis=1) * np.linalg.norm(query))
+
+        q, _ = quantize_int8(emb)
+        assert np.max(np.abs(cosine(q) - cosine(emb))) < 0.01
+
+    def test_zero_vector(self):
+        """Test an all-zero row does not divide by zero."""
+        q, scale = quantize_int8(np.zeros((1, 4)))
+        assert q.tolist() == [[0, 0, 0, 0]]
+        assert scale.tolist() == [1.0]
+
+    def test_compiled_kernel_matches_numpy(self):
+        """Test the numba kernel and the NumPy fallback agree."""
+        pytest.importorskip("numba")
+        rng = np.random.default_rng(2)
+        emb = rng.standard_normal((16, 64)).astype(np.float32)
+        emb[3] = 0.0
+
+        q, scale = quantize_int8(emb)
+        q_ref, scale_ref = vectorstore._quantize_int8_numpy(emb)
+
+        np.testing.assert_allclose(scale, scale_ref, rtol=1e-6)
+        assert np.abs(q.astype(np.int16) - q_ref).max() <= 1
+
+
+class TestSearchCache:
+    """Tests for the per-user search result cache."""
+
+    def test_similar_query_skips_pinecone(self):
+        """Test a near-identical query reuses results until the scope is invalidated."""
+        from rag.semantic_cache import ProximityCacheGroup
+
+        rng = np.random.default_rng(0)
+        query = rng.standard_normal(384).astype(np.float32)
+        paraphrase = query + 0.01 * rng.standard_normal(384).astype(np.float32)
+        results = [{"id": "doc_0", "score": 0.9, "metadata": {"text": "chunk"}}]
+        cache = ProximityCacheGroup(dim=384)
+
+        with patch.object(vectorstore, "get_search_cache", return_value=cache), \
+                patch.object(vectorstore, "search_documents", return_value=results) as search:
+            first = vectorstore.search_documents_by_text("q", top_k=5, user_id="u1", query_embedding=query)
+            second = vectorstore.search_documents_by_text("q2", top_k=3, user_id="u1", query_embedding=paraphrase)
+            other_user = vectorstore.search_documents_by_text("q", top_k=5, user_id="u2", query_embedding=query)
+            assert search.call_count == 2
+
+            # Asking for more results than were cached goes to Pinecone
+            vectorstore.search_documents_by_text("q", top_k=10, user_id="u1", query_embedding=query)
+            assert search.call_count == 3
+
+            vectorstore.invalidate_search_cache(user_id="u1")
+            vectorstore.search_documents_by_text("q", top_k=5, user_id="u1", query_embedding=query)
+            assert search.call_count == 4
+
+        assert first == second == other_user == results
+
+    def test_any_invalidation_drops_unscoped_results(self):
+        """Test an upload in one scope also clears cached unscoped searches."""
+        from rag.semantic_cache import ProximityCacheGroup
+
+        query = np.random.default_rng(1).standard_normal(384).astype(np.float32)
+        results = [{"id": "doc_0", "score": 0.9, "metadata": {"text": "chunk"}}]
+        cache = ProximityCacheGroup(dim=384)
+
+        with patch.object(vectorstore, "get_search_cache", return_value=cache), \
+                patch.object(vectorstore, "search_documents", return_value=results) as search:
+            vectorstore.search_documents_by_text("q", query_embedding=query)
+            vectorstore.search_documents_by_text("q", query_embedding=query)
+            assert search.call_count == 1
+
+            vectorstore.invalidate_search_cache(namespace="u1")
+            vectorstore.search_documents_by_text("q", query_embedding=query)
+            assert search.call_count == 2